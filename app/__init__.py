@@ -1,9 +1,21 @@
+import os
 import sqlite3
+from datetime import datetime, timedelta
 from flask import Flask, render_template
 import click
 
-from app import database
+from app import (async_services, database, http_cache, instrumentation,
+                 services)
 from app.blueprints import register_blueprints
+from app.importer import (DEFAULT_CHUNK_SIZE, IMPORT_SPECS, DataImportError,
+                          detect_format, import_rows, read_rows,
+                          reset_checkpoint)
+from app.purge import DEFAULT_CHUNK_SIZE as PURGE_CHUNK_SIZE
+from app.purge import purge_deleted
+from app.search import rebuild_search_index
+from app.stats import rebuild_stats
+from app.services import normalize_session_dates
+from app.views import url_with_args, url_with_cursor
 from config import Config
 
 def seed_database():
@@ -15,16 +27,92 @@ def seed_database():
     conn.close()
     click.echo('Baza zaseedowana!')
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__)
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
     register_blueprints(app)
+    app.add_template_global(url_with_args)
+    app.add_template_global(url_with_cursor)
     database.init_app(app)
+    instrumentation.init_app(app)
+    services.init_app(app)
+    async_services.init_app(app)
+    http_cache.init_app(app)
 
     @app.cli.command("seed")
     def seed_db():
         seed_database()
 
+    @app.cli.command("normalize-dates")
+    @click.option("--batch-size", default=5000, show_default=True)
+    def normalize_dates(batch_size):
+        stats = normalize_session_dates(
+            batch_size,
+            progress=lambda s: click.echo(
+                f"Sprawdzono {s['sprawdzone']}, poprawiono {s['poprawione']}"
+            ),
+        )
+        if stats["bledne"]:
+            click.echo(f"Nie rozpoznano dat w sesjach: {stats['bledne']}")
+        click.echo("Terminy sesji znormalizowane.")
+
+    @app.cli.command("import")
+    @click.argument("encja", type=click.Choice(sorted(IMPORT_SPECS)))
+    @click.argument("plik", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--chunk-size", default=DEFAULT_CHUNK_SIZE, show_default=True)
+    @click.option("--od-nowa", is_flag=True, help="Pomiń punkt kontrolny i importuj od początku.")
+    @click.option("--odloz-indeksy", is_flag=True,
+                  help="Usuń indeksy tabeli na czas importu i odbuduj je na końcu.")
+    def import_data(encja, plik, chunk_size, od_nowa, odloz_indeksy):
+        zrodlo = f"{encja}:{os.path.abspath(plik)}"
+        if od_nowa:
+            reset_checkpoint(zrodlo)
+        try:
+            with open(plik, encoding="utf-8", newline="") as f:
+                stats = import_rows(
+                    encja, read_rows(f, detect_format(plik)), chunk_size, checkpoint=zrodlo,
+                    progress=lambda s: click.echo(
+                        f"Wczytano {s.wczytane}, zaimportowano {s.zaimportowane}, "
+                        f"błędnych {s.bledne}"
+                    ),
+                    defer_indexes=odloz_indeksy,
+                )
+        except DataImportError as e:
+            raise click.ClickException(str(e)) from e
+
+        for nr_wiersza, komunikat in stats.bledy:
+            click.echo(f"Wiersz {nr_wiersza}: {komunikat}")
+        if stats.pominiete:
+            click.echo(f"Pominięto {stats.pominiete} wierszy zaimportowanych wcześniej.")
+        click.echo(f"Zaimportowano {stats.zaimportowane} wierszy do {encja}.")
+
+    @app.cli.command("purge")
+    @click.option("--starsze-niz", default=0, show_default=True,
+                  help="Usuń tylko rekordy oznaczone jako usunięte co najmniej tyle dni temu.")
+    @click.option("--chunk-size", default=PURGE_CHUNK_SIZE, show_default=True)
+    def purge(starsze_niz, chunk_size):
+        stats = purge_deleted(
+            datetime.now() - timedelta(days=starsze_niz), chunk_size,
+            progress=lambda s: click.echo(
+                f"Usunięto {sum(s.usuniete.values())} wierszy w {s.transakcje} transakcjach"
+            ),
+        )
+        for tabela, wiersze in sorted(stats.usuniete.items()):
+            click.echo(f"Usunięto z {tabela}: {wiersze} wierszy")
+        click.echo(f"Najdłuższa transakcja: {stats.najdluzsza * 1000:.0f} ms")
+
+    @app.cli.command("rebuild-search")
+    def rebuild_search():
+        for encja, wiersze in rebuild_search_index().items():
+            click.echo(f"Indeks wyszukiwania {encja}: {wiersze} rekordów")
+
+    @app.cli.command("rebuild-stats")
+    def rebuild_stats_command():
+        for tabela, wiersze in rebuild_stats().items():
+            click.echo(f"Statystyki {tabela}: {wiersze} wierszy")
+
     @app.route("/")
     def index():
         return render_template("index.html")
@@ -0,0 +1,120 @@
+"""Wejście ASGI: aplikacja Flask wykonywana w greenletach na pętli zdarzeń serwera.
+
+Każde żądanie HTTP wykonuje app.wsgi_app w greenlecie (greenlet_spawn z SQLAlchemy). Gdy widok
+czeka na korutynę (SERVICE_MODE=async, async_services.async_to_sync), greenlet oddaje pętlę
+innym żądaniom, więc zapytania aiosqlite wielu żądań przeplatają się na jednym wątku.
+
+Uruchomienie: python serve.py --server uvicorn
+albo: SERVICE_MODE=async uvicorn --factory app.asgi:create_asgi_app
+"""
+import io
+import sys
+
+from flask import Flask
+from sqlalchemy.util.concurrency import greenlet_spawn
+
+from app import create_app, database
+from app.serving import shutdown
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def wsgi_environ(scope, body: bytes):
+    # PEP 3333: ścieżka jako surowe bajty zdekodowane latin-1, nagłówki jako HTTP_*
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+        "CONTENT_LENGTH": str(len(body)),
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif name != "CONTENT_LENGTH":
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class AsgiApp:
+    def __init__(self, flask_app: Flask):
+        self.flask_app = flask_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"Nieobsługiwany typ połączenia ASGI: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await database.dispose_async_engine()
+                shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        environ = wsgi_environ(scope, await _read_body(receive))
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            started["status"], started["headers"] = status, headers
+
+        result = await greenlet_spawn(self.flask_app, environ, start_response)
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": int(started["status"].split(" ", 1)[0]),
+                "headers": [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                            for name, value in started["headers"]],
+            })
+            # Odpowiedzi strumieniowane (eksport) mogą czytać bazę przy każdym kawałku,
+            # więc kolejne kawałki też powstają w greenlecie
+            chunks = iter(result)
+            while (chunk := await greenlet_spawn(next, chunks, None)) is not None:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk,
+                                "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            if hasattr(result, "close"):
+                await greenlet_spawn(result.close)
+
+
+def create_asgi_app(config=None):
+    return AsgiApp(create_app(config))
@@ -0,0 +1,140 @@
+"""Asynchroniczne odpowiedniki serwisów sesji (SQLAlchemy asyncio + aiosqlite).
+
+Przy SERVICE_MODE=async widoki sesji wywołują je przez current_app.ensure_sync. Żądanie
+obsługuje wtedy app.asgi w greenlecie, więc czekanie na zapytanie oddaje pętlę zdarzeń innym
+żądaniom. Zapytania, kontrola konfliktów i zdarzenia sesji (podbicie wersje_tabel,
+unieważnianie cache) są wspólne z app/services.py.
+"""
+from contextlib import asynccontextmanager
+
+from flask import Flask, g, has_request_context
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from app import database
+from app.instrumentation import timed_commit
+from app.models import Sesje, SprzetySesje
+from app.scheduling import check_conflicts, validate_session_times
+from app.services import (DateRange, SessionData, apply_session_data,
+                          expect_version, paginate_keyset,
+                          session_details_statement,
+                          sessions_details_statement, sessions_statement,
+                          sync_links, version_conflict)
+
+SERVICE_MODES = ("sync", "async")
+
+
+def async_to_sync(func):
+    # Zastępuje Flask.async_to_sync (asgiref): zamiast nowej pętli w osobnym wątku korutyna
+    # czeka na pętli serwera ASGI, a greenlet żądania (app.asgi) w tym czasie oddaje sterowanie
+    def wrapper(*args, **kwargs):
+        if not in_greenlet():
+            raise RuntimeError(
+                "SERVICE_MODE=async wymaga serwera ASGI (app.asgi, serve.py --server uvicorn)")
+        return await_only(func(*args, **kwargs))
+
+    return wrapper
+
+def request_session():
+    # Odpowiednik services.request_session: jedna AsyncSession na żądanie, zatwierdzana
+    # w after_request i zamykana w teardown_request (init_app)
+    if "db_async_session" not in g:
+        g.db_async_session = database.get_async_session()
+    return g.db_async_session
+
+@asynccontextmanager
+async def get_db_session():
+    if has_request_context():
+        session = request_session()
+        try:
+            yield session
+            await session.flush()
+        except Exception:
+            await session.rollback()
+            raise
+        return
+
+    session = database.get_async_session()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+def init_app(app: Flask):
+    if app.config["SERVICE_MODE"] not in SERVICE_MODES:
+        raise ValueError(f"Nieznany tryb serwisów: {app.config['SERVICE_MODE']}")
+    if app.config["SERVICE_MODE"] == "async":
+        app.async_to_sync = async_to_sync
+
+    @app.after_request
+    def commit_request_async_session(response):
+        session = g.get("db_async_session")
+        if session is not None and response.status_code < 400:
+            with timed_commit():
+                app.ensure_sync(session.commit)()
+        return response
+
+    @app.teardown_request
+    def close_request_async_session(exc):
+        session = g.pop("db_async_session", None)
+        if session is not None:
+            if exc is not None:
+                app.ensure_sync(session.rollback)()
+            app.ensure_sync(session.close)()
+
+async def get_sessions_sorted(sortby: str = "IdSesji", order: str = "asc",
+                              cursor: str | None = None, per_page: int | None = None,
+                              termin: DateRange | None = None):
+    async with get_db_session() as session:
+        stmt, col = sessions_statement(sortby, termin)
+        if per_page is not None:
+            return await session.run_sync(paginate_keyset, stmt, col, Sesje.IdSesji,
+                                          order, cursor, per_page)
+
+        stmt = stmt.order_by(col.desc() if order == "desc" else col.asc())
+        return (await session.execute(stmt)).scalars().all()
+
+async def get_session_details(idsesji: int):
+    async with get_db_session() as session:
+        return (await session.execute(session_details_statement(idsesji))).scalars().first()
+
+async def get_sessions_details(ids):
+    async with get_db_session() as session:
+        result = await session.execute(sessions_details_statement(ids))
+        sesje = {s.IdSesji: s for s in result.scalars()}
+        return [sesje[idsesji] for idsesji in ids if idsesji in sesje]
+
+async def create_session_with_equipment(session_data: SessionData):
+    validate_session_times(session_data)
+    async with get_db_session() as session:
+        nowa = apply_session_data(Sesje(), session_data)
+        session.add(nowa)
+        await session.flush()
+        await session.run_sync(check_conflicts, session_data, nowa.IdSesji)
+
+        session.add_all(SprzetySesje(IdSprzetu=idsprzetu, IdSesji=nowa.IdSesji)
+                        for idsprzetu in session_data.sprzet_ids)
+        await session.flush()
+        return nowa
+
+async def update_session_with_equipment(idsesji: int, session_data: SessionData,
+                                        wersja: int | None = None):
+    validate_session_times(session_data)
+    with version_conflict():
+        async with get_db_session() as session:
+            sesja = await session.get(Sesje, idsesji)
+            if sesja is None:
+                return None
+
+            apply_session_data(sesja, session_data)
+            expect_version(sesja, wersja)
+            await session.flush()
+            await session.run_sync(check_conflicts, session_data, idsesji)
+
+            if await session.run_sync(sync_links, SprzetySesje.IdSesji, idsesji,
+                                      SprzetySesje.IdSprzetu, session_data.sprzet_ids):
+                session.expire(sesja, ["sprzety_sesje"])
+            return sesja
@@ -1,7 +1,12 @@
+from app.views.api import api_bp
 from app.views.artysci import artysci_bp
+from app.views.eksport import eksport_bp
+from app.views.importy import importy_bp
 from app.views.inzynierowie import inzynierowie_bp
 from app.views.sesje import sesje_bp
 from app.views.sprzet import sprzet_bp
+from app.views.statystyki import statystyki_bp
+from app.views.szukaj import szukaj_bp
 from app.views.utwory import utwory_bp
 
 
@@ -11,3 +16,8 @@ def register_blueprints(app):
     app.register_blueprint(sprzet_bp, url_prefix="/sprzet")
     app.register_blueprint(utwory_bp, url_prefix="/utwory")
     app.register_blueprint(sesje_bp, url_prefix="/sesje")
+    app.register_blueprint(eksport_bp, url_prefix="/export")
+    app.register_blueprint(importy_bp, url_prefix="/import")
+    app.register_blueprint(api_bp, url_prefix="/api/v1")
+    app.register_blueprint(szukaj_bp, url_prefix="/szukaj")
+    app.register_blueprint(statystyki_bp, url_prefix="/statystyki")
@@ -0,0 +1,230 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryBackend:
+    """LRU z TTL w pamięci procesu."""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class FileBackend:
+    """Pliki pickle w katalogu lokalnym, współdzielone przez procesy robocze."""
+
+    def __init__(self, directory=None, max_entries=128):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "studio_nagran_cache")
+        self.max_entries = max_entries
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".cache")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        now = time.time()
+        if expires < now:
+            self.delete(key)
+            return False, None
+        # Czas dostępu w mtime wyznacza kolejność usuwania (LRU)
+        os.utime(path, (now, now))
+        return True, value
+
+    def set(self, key, value, ttl):
+        path = self._path(key)
+        # Zapis do pliku tymczasowego i rename: inne procesy nie zobaczą połowy wpisu
+        now = time.time()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((now + ttl, value), f)
+        os.utime(tmp_path, (now, now))
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".cache")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            self._remove(entry.path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def delete(self, key):
+        self._remove(self._path(key))
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".cache"):
+                self._remove(entry.path)
+
+
+BACKENDS = {"memory": MemoryBackend, "file": FileBackend}
+
+
+class LookupCache:  # pylint: disable=too-many-instance-attributes
+    """Listy słownikowe (np. do formularzy) z unieważnianiem po zmienionych tabelach.
+
+    Z funkcją versions (tabele -> {tabela: (wersja, zmieniono)}) klucz wpisu zawiera
+    wersje tabel źródłowych, więc zapis w innym procesie też sprawia, że wpis chybia.
+    """
+
+    def __init__(self, backend=None, ttl=300, versions=None):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.versions = versions
+        self.hits = 0
+        self.misses = 0
+        self._lookups = {}
+        self._tables = frozenset()
+        self._keys = {}
+        self._generation = 0
+
+    def register(self, name, tables, loader):
+        self._lookups[name] = (frozenset(tables), loader)
+        self._tables = self._tables | frozenset(tables)
+
+    def _key(self, name):
+        if self.versions is None:
+            return name
+        # Wersje wszystkich tabel naraz: formularz z kilkoma listami czyta je raz
+        versions = self.versions(self._tables)
+        return "|".join((name, ",".join(
+            f"{table}={versions[table][0]}"
+            for table in sorted(self._lookups[name][0]) if table in versions)))
+
+    def get(self, name):
+        key = self._key(name)
+        found, value = self.backend.get(key)
+        if found:
+            self.hits += 1
+            return value
+        self.misses += 1
+        generation = self._generation
+        value = self._lookups[name][1]()
+        # Unieważnienie w trakcie wczytywania oznacza, że wynik może być już nieaktualny
+        if generation == self._generation:
+            self.backend.set(key, value, self.ttl)
+            self._keys[name] = key
+        return value
+
+    def warm(self):
+        for name in self._lookups:
+            self.get(name)
+        return len(self._lookups)
+
+    def invalidate_tables(self, tables):
+        self._generation += 1
+        for name, (depends_on, _loader) in self._lookups.items():
+            if depends_on & set(tables):
+                self.backend.delete(self._keys.pop(name, name))
+
+    def clear(self):
+        self._keys.clear()
+        self.backend.clear()
+
+    def stats(self):
+        return {"trafienia": self.hits, "chybienia": self.misses}
+
+
+class FragmentCache:  # pylint: disable=too-many-instance-attributes
+    """Wyrenderowane fragmenty HTML: LRU z limitem wpisów i bajtów, unieważnianie po tabelach."""
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+        self.size_bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            self.saved_bytes += entry[2]
+            return entry[0]
+
+    def set(self, key, html, tables):
+        size = len(html.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (html, frozenset(tables), size)
+            self.size_bytes += size
+            while len(self._data) > self.max_entries or self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._data)))
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[2]
+
+    def invalidate_tables(self, tables):
+        with self._lock:
+            for key in [k for k, entry in self._data.items() if entry[1] & set(tables)]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size_bytes = 0
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {"trafienia": self.hits, "chybienia": self.misses,
+                "skutecznosc": round(self.hits / requests, 3) if requests else 0.0,
+                "zaoszczedzone_bajty": self.saved_bytes, "wpisy": len(self._data),
+                "bajty": self.size_bytes}
@@ -1,17 +1,213 @@
+import os
+
 import click
 from flask import Flask
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateColumn
+
+from config import Config
+
+ENGINE_PROFILES = {
+    "dev": {
+        "echo": True,
+        "pragmas": {"foreign_keys": "ON"},
+    },
+    "test": {
+        "echo": False,
+        "pragmas": {"foreign_keys": "ON"},
+    },
+    "prod": {
+        "echo": False,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_recycle": 3600,
+        "pool_pre_ping": True,
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 268435456,
+            "cache_size": -64000,
+            "busy_timeout": 5000,
+            "foreign_keys": "ON",
+        },
+    },
+}
+
+
+def _register_pragmas(db_engine, pragmas):
+    @event.listens_for(db_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def _engine_options(uri: str, profile: str):
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Nieznany profil bazy danych: {profile}")
+
+    options = dict(ENGINE_PROFILES[profile])
+    pragmas = options.pop("pragmas")
+    url = make_url(uri)
+    is_sqlite = url.get_backend_name() == "sqlite"
 
-engine = create_engine("sqlite:///studio_nagran.db", echo=True, future=True)
+    kwargs = {"echo": options.pop("echo")}
+    if is_sqlite and url.database in (None, "", ":memory:"):
+        # Baza w pamięci istnieje tylko w obrębie jednego połączenia
+        kwargs["poolclass"] = StaticPool
+        kwargs["connect_args"] = {"check_same_thread": False}
+    else:
+        kwargs.update(options)
+        if is_sqlite:
+            kwargs["connect_args"] = {"check_same_thread": False}
+    return kwargs, pragmas if is_sqlite else None
+
+
+def create_db_engine(uri: str, profile: str = "dev"):
+    kwargs, pragmas = _engine_options(uri, profile)
+    db_engine = create_engine(uri, future=True, **kwargs)
+    if pragmas:
+        _register_pragmas(db_engine, pragmas)
+    return db_engine
+
+
+def create_async_db_engine(uri: str, profile: str = "dev"):
+    # Ta sama baza, profil i pragmy co create_db_engine, ale przez sterownik aiosqlite
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    kwargs, pragmas = _engine_options(uri, profile)
+    db_engine = create_async_engine(url, **kwargs)
+    if pragmas:
+        _register_pragmas(db_engine.sync_engine, pragmas)
+    return db_engine
+
+
+engine = create_db_engine(Config.SQLALCHEMY_DATABASE_URI, Config.DB_PROFILE)
 session = sessionmaker(bind=engine, expire_on_commit=False)
 base = declarative_base()
 
+_engine_key = (Config.SQLALCHEMY_DATABASE_URI, Config.DB_PROFILE)
+
+# Silnik aiosqlite dla SERVICE_MODE=async (app/async_services.py), tworzony przy pierwszym
+# użyciu na bazie i z profilem bieżącego silnika synchronicznego
+async_engine = None  # pylint: disable=invalid-name
+_async_session = None  # pylint: disable=invalid-name
+
+
+def _reset_pool_after_fork():
+    # Silnik powstaje przy imporcie, więc serwer z preload (gunicorn) dziedziczy pulę rodzica.
+    # Potomek zaczyna z pustą pulą; close=False nie zamyka połączeń, których używa rodzic
+    global async_engine, _async_session  # pylint: disable=global-statement
+    engine.dispose(close=False)
+    # Połączenia aiosqlite żyją w wątkach, których potomek nie dziedziczy
+    async_engine = _async_session = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+
+def configure_engine(uri: str, profile: str = "dev"):
+    global engine, session, _engine_key  # pylint: disable=global-statement
+    global async_engine, _async_session  # pylint: disable=global-statement
+
+    if (uri, profile) == _engine_key:
+        return engine
+
+    old_engine = engine
+    engine = create_db_engine(uri, profile)
+    session = sessionmaker(bind=engine, expire_on_commit=False)
+    _engine_key = (uri, profile)
+    old_engine.dispose()
+    # Silnik asynchroniczny powstanie od nowa dla nowej bazy; poprzedni zamyka się na pętli,
+    # na której działał (dispose_async_engine), więc tu jest tylko odpinany
+    async_engine = _async_session = None
+    return engine
+
+def get_async_session():
+    """AsyncSession na tej samej bazie co bieżący silnik synchroniczny."""
+    global async_engine, _async_session  # pylint: disable=global-statement
+    if async_engine is None:
+        async_engine = create_async_db_engine(engine.url.render_as_string(hide_password=False),
+                                              _engine_key[1])
+        _async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+    return _async_session()
+
+async def dispose_async_engine():
+    global async_engine, _async_session  # pylint: disable=global-statement
+    db_engine, async_engine, _async_session = async_engine, None, None
+    if db_engine is not None:
+        await db_engine.dispose()
+
 def init_db():
     base.metadata.create_all(bind=engine)
 
+def migrate_indexes():
+    inspector = inspect(engine)
+    created = []
+    for table in base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    if created:
+        # Świeże statystyki pozwalają plannerowi wybrać nowe indeksy przy złączeniach
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    return created
+
+def migrate_columns():
+    # Tylko nowe kolumny dopuszczające NULL (np. Usunieto) lub z wartością domyślną
+    # (Wersja): ALTER TABLE ADD COLUMN w SQLite nie przepisuje tabeli, więc działa od razu
+    # także na dużej bazie
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as conn:
+        for table in base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and (
+                        column.nullable or column.server_default is not None):
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ADD COLUMN "
+                        f"{CreateColumn(column).compile(dialect=engine.dialect)}"
+                    )
+                    added.append(f"{table.name}.{column.name}")
+    return added
+
 def init_app(app: Flask):
+    configure_engine(
+        app.config["SQLALCHEMY_DATABASE_URI"],
+        app.config.get("DB_PROFILE", "dev"),
+    )
+
     @app.cli.command("init-db")
     def init_db_command():
         init_db()
         click.echo("Initialized the database.")
+
+    @app.cli.command("migrate-columns")
+    def migrate_columns_command():
+        added = migrate_columns()
+        for name in added:
+            click.echo(f"Dodano kolumnę {name}")
+        click.echo(f"Dodano kolumn: {len(added)}")
+
+    @app.cli.command("migrate-indexes")
+    def migrate_indexes_command():
+        created = migrate_indexes()
+        for name in created:
+            click.echo(f"Utworzono indeks {name}")
+        click.echo(f"Dodano indeksów: {len(created)}")
@@ -0,0 +1,80 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import Flask, current_app, g, make_response, request, session
+
+from app.services import request_table_versions
+
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(path: str, versions: dict):
+    token = ";".join(f"{table}={wersja}" for table, (wersja, _) in sorted(versions.items()))
+    return hashlib.sha1(f"{path}|{token}".encode("utf-8")).hexdigest()[:20]
+
+
+def _last_modified(versions: dict):
+    zmieniono = max((czas for _, czas in versions.values()), default=0)
+    return datetime.fromtimestamp(zmieniono, timezone.utc) if zmieniono else None
+
+
+def _cacheable():
+    # Komunikaty flash i panel SQL zmieniają treść bez zmiany danych
+    return (request.method in ("GET", "HEAD") and "_flashes" not in session
+            and not current_app.config.get("SQL_DEBUG_PANEL"))
+
+
+def _not_modified(etag: str, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    return (last_modified is not None and request.if_modified_since is not None
+            and last_modified <= request.if_modified_since)
+
+
+def versioned(*tables):
+    """ETag i Last-Modified z wersji tabel, od których zależy odpowiedź.
+
+    Przy zgodnym If-None-Match (lub If-Modified-Since) zwraca 304 po jednym
+    zapytaniu o wersje, bez wywołania widoku i renderowania szablonu.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get("HTTP_CACHE", True) or not _cacheable():
+                return view(*args, **kwargs)
+
+            versions = request_table_versions(tables)
+            etag = make_etag(request.full_path, versions)
+            last_modified = _last_modified(versions)
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
+
+
+def init_app(app: Flask):
+    @app.before_request
+    def forget_table_versions():
+        # g należy do kontekstu aplikacji, który może obejmować kilka żądań (testy, CLI)
+        g.pop("wersje_tabel", None)
+
+    @app.after_request
+    def set_cache_control(response):
+        # Polityka z CACHE_CONTROL dla blueprintu; domyślna tylko dla odpowiedzi z ETag
+        if "Cache-Control" in response.headers or request.method not in ("GET", "HEAD"):
+            return response
+        policy = app.config.get("CACHE_CONTROL", {}).get(request.blueprint)
+        if policy is None and "ETag" in response.headers:
+            policy = app.config.get("CACHE_CONTROL_DEFAULT", DEFAULT_CACHE_CONTROL)
+        if policy:
+            response.headers["Cache-Control"] = policy
+        return response
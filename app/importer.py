@@ -0,0 +1,295 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from app import database
+from app.models import (TERMIN_STORAGE_FORMAT, Artysci, Importy, Inzynierowie,
+                        Sesje, Sprzet, SprzetySesje, Utwory)
+from app.scheduling import check_session_times
+from app.services import (bump_table_versions, fragment_cache, lookup_cache,
+                          parse_legacy_termin)
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Ile komunikatów o błędnych wierszach przechowywać w statystykach
+MAX_ERRORS = 100
+
+# Górna granica zbioru znanych kluczy obcych trzymanego między paczkami
+FK_CACHE_SIZE = 100000
+
+
+class DataImportError(ValueError):
+    pass
+
+
+def _tekst(value):
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def _liczba(value):
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+def _termin(value):
+    if value is None or value == "":
+        return None
+    termin = parse_legacy_termin(value)
+    if termin.tzinfo is not None:
+        # Terminy w bazie są czasem lokalnym studia bez strefy; przesunięcie zepsułoby
+        # tekstowe porównania zakresów w kanonicznym formacie
+        raise ValueError(f"Termin nie może zawierać strefy czasowej: {value}")
+    return termin
+
+
+def _termin_do_bazy(value):
+    # Ten sam tekst, który zapisałby typ Termin
+    if value is None:
+        return None
+    return TERMIN_STORAGE_FORMAT % {
+        "year": value.year, "month": value.month, "day": value.day,
+        "hour": value.hour, "minute": value.minute, "second": value.second,
+    }
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    model: type
+    pola: dict
+    wymagane: tuple = ()
+    klucze_obce: dict = field(default_factory=dict)
+
+
+IMPORT_SPECS = {
+    "artysci": ImportSpec(
+        Artysci,
+        {"IdArtysty": _liczba, "Nazwa": _tekst, "Imie": _tekst, "Nazwisko": _tekst},
+        ("Nazwa",),
+    ),
+    "inzynierowie": ImportSpec(
+        Inzynierowie,
+        {"IdInzyniera": _liczba, "Imie": _tekst, "Nazwisko": _tekst},
+    ),
+    "sprzet": ImportSpec(
+        Sprzet,
+        {"IdSprzetu": _liczba, "Producent": _tekst, "Model": _tekst, "Kategoria": _tekst},
+    ),
+    "sesje": ImportSpec(
+        Sesje,
+        {"IdSesji": _liczba, "IdArtysty": _liczba, "IdInzyniera": _liczba,
+         "TerminStart": _termin, "TerminStop": _termin},
+        ("IdArtysty", "IdInzyniera", "TerminStart"),
+        {"IdArtysty": Artysci.IdArtysty, "IdInzyniera": Inzynierowie.IdInzyniera},
+    ),
+    "utwory": ImportSpec(
+        Utwory,
+        {"IdUtworu": _liczba, "IdArtysty": _liczba, "IdSesji": _liczba, "Tytul": _tekst},
+        ("IdArtysty", "IdSesji", "Tytul"),
+        {"IdArtysty": Artysci.IdArtysty, "IdSesji": Sesje.IdSesji},
+    ),
+    "sprzety_sesje": ImportSpec(
+        SprzetySesje,
+        {"IdSprzetu": _liczba, "IdSesji": _liczba},
+        ("IdSprzetu", "IdSesji"),
+        {"IdSprzetu": Sprzet.IdSprzetu, "IdSesji": Sesje.IdSesji},
+    ),
+}
+
+
+@dataclass
+class ImportStats:
+    wczytane: int = 0
+    zaimportowane: int = 0
+    pominiete: int = 0
+    bledne: int = 0
+    bledy: list = field(default_factory=list)
+
+    def add_error(self, nr_wiersza, komunikat):
+        self.bledne += 1
+        if len(self.bledy) < MAX_ERRORS:
+            self.bledy.append((nr_wiersza, komunikat))
+
+
+def detect_format(filename: str):
+    if filename.endswith(".csv"):
+        return "csv"
+    if filename.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    raise DataImportError(f"Nieobsługiwany format pliku: {filename} (użyj .csv lub .ndjson)")
+
+
+def _ndjson_row(line: str, nr_linii: int):
+    try:
+        obj = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise DataImportError(f"Linia {nr_linii}: niepoprawny JSON ({e.msg})") from e
+    if not isinstance(obj, dict):
+        raise DataImportError(f"Linia {nr_linii}: oczekiwano obiektu JSON")
+    return obj
+
+
+def read_rows(stream, fmt: str):
+    if fmt not in ("csv", "ndjson"):
+        raise DataImportError(f"Nieobsługiwany format: {fmt}")
+    # Plik jest dekodowany leniwie, więc błędne kodowanie wychodzi dopiero przy czytaniu
+    try:
+        if fmt == "csv":
+            reader = csv.reader(stream)
+            header = next(reader, [])
+            for row in reader:
+                yield dict(zip(header, row))
+        else:
+            for nr_linii, line in enumerate(stream, start=1):
+                if line.strip():
+                    yield _ndjson_row(line, nr_linii)
+    except UnicodeDecodeError as e:
+        raise DataImportError(f"Plik nie jest zapisany w UTF-8 ({e.reason})") from e
+
+
+def _convert(spec: ImportSpec, raw: dict):
+    # Wszystkie wiersze paczki muszą mieć te same klucze dla executemany
+    row = {column: convert(raw.get(column)) for column, convert in spec.pola.items()}
+    for column in spec.wymagane:
+        if row.get(column) is None:
+            raise DataImportError(f"Brak wartości w kolumnie {column}")
+    if spec.model is Sesje:
+        check_session_times(row["TerminStart"], row["TerminStop"])
+        row["TerminStart"] = _termin_do_bazy(row["TerminStart"])
+        row["TerminStop"] = _termin_do_bazy(row["TerminStop"])
+    return row
+
+
+def _missing_keys(conn, spec: ImportSpec, rows, known):
+    missing = {}
+    for column, target in spec.klucze_obce.items():
+        wanted = {row[column] for row in rows if row.get(column) is not None}
+        wanted -= known[column]
+        if wanted:
+            found = set(conn.execute(select(target).where(target.in_(wanted))).scalars())
+            if len(known[column]) + len(found) > FK_CACHE_SIZE:
+                known[column].clear()
+            known[column] |= found
+            missing[column] = wanted - found
+    return missing
+
+
+def _save_checkpoint(conn, zrodlo, entity, wiersze):
+    stmt = sqlite_insert(Importy.__table__).values(Zrodlo=zrodlo, Encja=entity, Wiersze=wiersze)
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=[Importy.Zrodlo], set_={"Encja": entity, "Wiersze": wiersze}
+    ))
+
+
+def get_checkpoint(zrodlo: str):
+    with database.engine.connect() as conn:
+        return conn.execute(
+            select(Importy.Wiersze).where(Importy.Zrodlo == zrodlo)
+        ).scalar() or 0
+
+
+def reset_checkpoint(zrodlo: str):
+    with database.engine.begin() as conn:
+        conn.execute(Importy.__table__.delete().where(Importy.Zrodlo == zrodlo))
+
+
+def drop_secondary_indexes(entity: str):
+    table = IMPORT_SPECS[entity].model.__table__
+    for index in table.indexes:
+        index.drop(bind=database.engine, checkfirst=True)
+
+
+def _validate_chunk(spec: ImportSpec, chunk, first_line, stats: ImportStats):
+    valid = []
+    for nr_wiersza, raw in enumerate(chunk, start=first_line):
+        try:
+            valid.append((nr_wiersza, _convert(spec, raw)))
+        except (ValueError, TypeError) as e:
+            stats.add_error(nr_wiersza, str(e))
+    return valid
+
+
+def _resolve_foreign_keys(conn, spec: ImportSpec, valid, known, stats: ImportStats):
+    missing = _missing_keys(conn, spec, [row for _, row in valid], known)
+    batch = []
+    for nr_wiersza, row in valid:
+        brakujace = [c for c, ids in missing.items() if row[c] in ids]
+        if brakujace:
+            stats.add_error(nr_wiersza, "Nie istnieje rekord powiązany: "
+                            + ", ".join(f"{c}={row[c]}" for c in brakujace))
+        else:
+            batch.append(row)
+    return batch
+
+
+def _insert_sql(spec: ImportSpec):
+    # Wiersze są już przekonwertowane, więc INSERT idzie prosto do sterownika
+    # (executemany) z pominięciem przetwarzania parametrów przez SQLAlchemy
+    return str(insert(spec.model.__table__).compile(
+        dialect=sqlite.dialect(paramstyle="named"), column_keys=list(spec.pola)
+    ))
+
+
+def _insert_batch(conn, insert_sql, batch, first_line, last_line):
+    try:
+        conn.exec_driver_sql(insert_sql, batch)
+    except IntegrityError as e:
+        raise DataImportError(
+            f"Wiersze {first_line}-{last_line}: naruszenie ograniczeń bazy ({e.orig})"
+        ) from e
+
+
+def import_rows(# pylint: disable=too-many-arguments,too-many-positional-arguments
+        entity: str, rows, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        checkpoint: str | None = None, progress=None, defer_indexes: bool = False):
+    if entity not in IMPORT_SPECS:
+        raise DataImportError(f"Nieznana encja: {entity}")
+    spec = IMPORT_SPECS[entity]
+    insert_sql = _insert_sql(spec)
+    stats = ImportStats()
+    known = {column: set() for column in spec.klucze_obce}
+
+    if checkpoint is not None:
+        stats.pominiete = get_checkpoint(checkpoint)
+        rows = islice(rows, stats.pominiete, None)
+    position = stats.pominiete
+
+    if defer_indexes:
+        # Aktualizacja indeksów przy każdym wierszu kosztuje więcej niż sam zapis;
+        # jednorazowe odbudowanie po imporcie jest kilkukrotnie szybsze
+        drop_secondary_indexes(entity)
+    try:
+        while chunk := list(islice(rows, chunk_size)):
+            valid = _validate_chunk(spec, chunk, position + 1, stats)
+            position += len(chunk)
+            stats.wczytane += len(chunk)
+
+            # Każda paczka to osobna transakcja razem z punktem kontrolnym,
+            # więc przerwany import wznawia się dokładnie za ostatnią zatwierdzoną paczką
+            with database.engine.begin() as conn:
+                batch = _resolve_foreign_keys(conn, spec, valid, known, stats)
+                if batch:
+                    _insert_batch(conn, insert_sql, batch, position - len(chunk) + 1, position)
+                    bump_table_versions(conn, {spec.model.__tablename__})
+                if checkpoint is not None:
+                    _save_checkpoint(conn, checkpoint, entity, position)
+
+            stats.zaimportowane += len(batch)
+            if progress is not None:
+                progress(stats)
+    finally:
+        if defer_indexes:
+            database.migrate_indexes()
+        # Import pisze z pominięciem ORM, więc zdarzenia sesji nie unieważnią list
+        lookup_cache.invalidate_tables({spec.model.__tablename__})
+        fragment_cache.invalidate_tables({spec.model.__tablename__})
+
+    return stats
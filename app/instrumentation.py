@@ -0,0 +1,118 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from flask import Flask, g, has_app_context, render_template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Ile najwolniejszych zapytań zapamiętać na żądanie
+SLOWEST_LIMIT = 5
+
+_collectors: ContextVar[tuple] = ContextVar("sql_collectors", default=())
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    czas: float = 0.0
+    najwolniejsze: list = field(default_factory=list)
+    wykonania: Counter = field(default_factory=Counter)
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.czas += duration
+        self.wykonania[statement] += 1
+        self.najwolniejsze.append((duration, statement))
+        self.najwolniejsze.sort(key=lambda item: item[0], reverse=True)
+        del self.najwolniejsze[SLOWEST_LIMIT:]
+
+    @property
+    def duplikaty(self):
+        # Ten sam tekst SQL wykonany wielokrotnie w jednym żądaniu to zwykle N+1
+        return {stmt: n for stmt, n in self.wykonania.most_common() if n > 1}
+
+
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+    # Start trzymany w kontekście wykonania znika razem z nim, także po błędzie
+    # zapytania, po którym after_cursor_execute nie jest wywoływane
+    context.query_start_time = time.perf_counter()
+
+
+def _record(statement, duration):
+    if has_app_context() and "sql_stats" in g:
+        g.sql_stats.record(statement, duration)
+    for stats in _collectors.get():
+        stats.record(statement, duration)
+
+
+def _after_cursor_execute(_conn, _cursor, statement, _parameters, context, _executemany):
+    _record(statement, time.perf_counter() - context.query_start_time)
+
+
+@contextmanager
+def timed_commit():
+    # COMMIT nie przechodzi przez kursor (pysqlite woła connection.commit()), więc zdarzenia
+    # kursora go nie widzą. Jego czas to czas zatwierdzenia bez zapytań zapisanych w trakcie
+    # (flush, podbicie wersje_tabel), które liczą się już jako osobne pozycje. Transakcja
+    # tylko do odczytu nie wykonuje przy zatwierdzeniu żadnego zapytania i nie jest liczona
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _collectors.reset(token)
+    if stats.count:
+        _record("COMMIT", time.perf_counter() - start - stats.czas)
+
+
+def install():
+    # Nasłuch na klasie Engine obejmuje też silniki podmieniane przez configure_engine
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def capture_queries():
+    install()
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+def server_timing(stats: QueryStats):
+    # Nagłówki HTTP muszą mieścić się w latin-1, stąd opis bez polskich znaków
+    return f'db;dur={stats.czas * 1000:.2f};desc="SQL: {stats.count} zapytan"'
+
+
+def init_app(app: Flask):
+    # Rejestrowane przed services.init_app: Flask wywołuje after_request w odwrotnej
+    # kolejności, więc nagłówek powstaje po zatwierdzeniu sesji żądania i obejmuje też
+    # flush, podbicie wersje_tabel i sam COMMIT (timed_commit)
+    install()
+
+    @app.before_request
+    def start_query_stats():
+        g.sql_stats = QueryStats()
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.pop("sql_stats", None)
+        if stats is None:
+            return response
+        response.headers.add("Server-Timing", server_timing(stats))
+
+        if (app.config.get("SQL_DEBUG_PANEL") and response.mimetype == "text/html"
+                and not response.is_streamed):
+            html = response.get_data(as_text=True)
+            if "</body>" in html:
+                panel = render_template("sql_panel.html", stats=stats)
+                response.set_data(html.replace("</body>", panel + "</body>", 1))
+        return response
@@ -1,15 +1,39 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import (Column, DateTime, ForeignKey, Index, Integer, String,
+                        text)
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 
 from app.database import base
 
+# Jeden kanoniczny format tekstowy (jak w seed_data.sql), dzięki któremu porównania
+# zakresów na indeksie są poprawne; odczyt toleruje też starsze zapisy z 'T'
+TERMIN_STORAGE_FORMAT = (
+    "%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+Termin = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format=TERMIN_STORAGE_FORMAT,
+        regexp=r"(\d+)-(\d+)-(\d+)(?:[ T](\d+):(\d+)(?::(\d+))?)?",
+    ),
+    "sqlite",
+)
+
+
+def _wersja_column():
+    # version_id_col: ORM dopisuje do każdego UPDATE warunek WHERE Wersja = :wczytana
+    # i podbija licznik, więc równoległy zapis kończy się StaleDataError zamiast nadpisaniem
+    return Column(Integer, nullable=False, server_default=text("1"))
+
 
 class Artysci(base):
     __tablename__ = "artysci"
     IdArtysty = Column(Integer, primary_key=True)
-    Nazwa = Column(String)
-    Imie = Column(String)
-    Nazwisko = Column(String)
+    Nazwa = Column(String, index=True)
+    Imie = Column(String, index=True)
+    Nazwisko = Column(String, index=True)
+    Usunieto = Column(Termin)
+    Wersja = _wersja_column()
+    __mapper_args__ = {"version_id_col": Wersja}
     sesje = relationship(
         "Sesje", back_populates="artysci", cascade="all, delete-orphan"
     )
@@ -21,8 +45,11 @@ class Artysci(base):
 class Inzynierowie(base):
     __tablename__ = "inzynierowie"
     IdInzyniera = Column(Integer, primary_key=True)
-    Imie = Column(String)
-    Nazwisko = Column(String)
+    Imie = Column(String, index=True)
+    Nazwisko = Column(String, index=True)
+    Usunieto = Column(Termin)
+    Wersja = _wersja_column()
+    __mapper_args__ = {"version_id_col": Wersja}
     sesje = relationship(
         "Sesje", back_populates="inzynierowie", cascade="all, delete-orphan"
     )
@@ -31,9 +58,12 @@ class Inzynierowie(base):
 class Sprzet(base):
     __tablename__ = "sprzet"
     IdSprzetu = Column(Integer, primary_key=True)
-    Producent = Column(String)
-    Model = Column(String)
-    Kategoria = Column(String)
+    Producent = Column(String, index=True)
+    Model = Column(String, index=True)
+    Kategoria = Column(String, index=True)
+    Usunieto = Column(Termin)
+    Wersja = _wersja_column()
+    __mapper_args__ = {"version_id_col": Wersja}
     sprzety_sesje = relationship(
         "SprzetySesje", back_populates="sprzet", cascade="all, delete-orphan"
     )
@@ -42,22 +72,35 @@ class Sprzet(base):
 class Utwory(base):
     __tablename__ = "utwory"
     IdUtworu = Column(Integer, primary_key=True)
-    IdArtysty = Column(Integer, ForeignKey("artysci.IdArtysty", ondelete="CASCADE"))
-    IdSesji = Column(Integer, ForeignKey("sesje.IdSesji", ondelete="CASCADE"))
-    Tytul = Column(String)
+    IdArtysty = Column(
+        Integer, ForeignKey("artysci.IdArtysty", ondelete="CASCADE"), index=True
+    )
+    IdSesji = Column(Integer, ForeignKey("sesje.IdSesji", ondelete="CASCADE"), index=True)
+    Tytul = Column(String, index=True)
+    Usunieto = Column(Termin)
+    Wersja = _wersja_column()
+    __mapper_args__ = {"version_id_col": Wersja}
     artysci = relationship("Artysci", back_populates="utwory")
     sesje = relationship("Sesje", back_populates="utwory")
 
 
 class Sesje(base):
     __tablename__ = "sesje"
+    # Indeksy (zasób, TerminStart) obsługują klucze obce i zapytania o zakres terminów
+    __table_args__ = (
+        Index("ix_sesje_IdArtysty_TerminStart", "IdArtysty", "TerminStart"),
+        Index("ix_sesje_IdInzyniera_TerminStart", "IdInzyniera", "TerminStart"),
+    )
     IdSesji = Column(Integer, primary_key=True)
     IdArtysty = Column(Integer, ForeignKey("artysci.IdArtysty", ondelete="CASCADE"))
     IdInzyniera = Column(
         Integer, ForeignKey("inzynierowie.IdInzyniera", ondelete="CASCADE")
     )
-    TerminStart = Column(String)
-    TerminStop = Column(String)
+    TerminStart = Column(Termin, index=True)
+    TerminStop = Column(Termin)
+    Usunieto = Column(Termin)
+    Wersja = _wersja_column()
+    __mapper_args__ = {"version_id_col": Wersja}
     artysci = relationship("Artysci", back_populates="sesje")
     inzynierowie = relationship("Inzynierowie", back_populates="sesje")
     utwory = relationship("Utwory", back_populates="sesje")
@@ -69,8 +112,58 @@ class SprzetySesje(base):
     IdSprzetu = Column(
         Integer, ForeignKey("sprzet.IdSprzetu", ondelete="CASCADE"), primary_key=True
     )
+    # IdSprzetu jest pierwszą kolumną klucza głównego, więc ma już indeks
     IdSesji = Column(
-        Integer, ForeignKey("sesje.IdSesji", ondelete="CASCADE"), primary_key=True
+        Integer, ForeignKey("sesje.IdSesji", ondelete="CASCADE"), primary_key=True, index=True
     )
     sprzet = relationship("Sprzet", back_populates="sprzety_sesje")
     sesje = relationship("Sesje", back_populates="sprzety_sesje")
+
+
+class Importy(base):
+    __tablename__ = "importy"
+    # Punkt kontrolny importu: liczba wierszy źródła zatwierdzonych w bazie
+    Zrodlo = Column(String, primary_key=True)
+    Encja = Column(String, nullable=False)
+    Wiersze = Column(Integer, nullable=False, default=0)
+
+
+# Agregaty dla /statystyki, utrzymywane wyzwalaczami (app/stats.py) w tej samej
+# transakcji co zmiana sesji, sprzętu sesji lub utworu
+class StatInzynierowDzien(base):
+    __tablename__ = "stat_inzynierowie_dzien"
+    Dzien = Column(String, primary_key=True)
+    IdInzyniera = Column(Integer, primary_key=True)
+    Sesje = Column(Integer, nullable=False, default=0)
+    Minuty = Column(Integer, nullable=False, default=0)
+
+
+class StatSprzetuDzien(base):
+    __tablename__ = "stat_sprzet_dzien"
+    Dzien = Column(String, primary_key=True)
+    IdSprzetu = Column(Integer, primary_key=True)
+    Sesje = Column(Integer, nullable=False, default=0)
+    Minuty = Column(Integer, nullable=False, default=0)
+
+
+class StatArtystow(base):
+    __tablename__ = "stat_artysci"
+    IdArtysty = Column(Integer, primary_key=True)
+    Sesje = Column(Integer, nullable=False, default=0, index=True)
+    Utwory = Column(Integer, nullable=False, default=0)
+
+
+class StatLiczniki(base):
+    __tablename__ = "stat_liczniki"
+    # Sumy całej historii ("sesje", "utwory") bez przeglądania tabel źródłowych
+    Nazwa = Column(String, primary_key=True)
+    Wartosc = Column(Integer, nullable=False, default=0)
+
+
+class WersjeTabel(base):
+    __tablename__ = "wersje_tabel"
+    # Licznik zmian tabeli podbijany przy zatwierdzeniu zapisu; źródło ETag (app/http_cache.py)
+    Tabela = Column(String, primary_key=True)
+    Wersja = Column(Integer, nullable=False, default=0)
+    # Czas ostatniej zmiany w sekundach epoki (nagłówek Last-Modified)
+    Zmieniono = Column(Integer, nullable=False, default=0)
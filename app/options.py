@@ -0,0 +1,129 @@
+"""Listy wyboru formularzy: stronicowane i zawężane prefiksem zamiast pełnych <select>.
+
+Formularz dostaje tylko pierwszą stronę opcji (z lookup_cache) i opcje już wybrane;
+kolejne strony i podpowiedzi pobiera z /szukaj/opcje/<encja>.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import Integer, column, select, text
+
+from app.models import Artysci, Inzynierowie, Sesje, Sprzet
+from app.search import SEARCH_INDEXES, build_match_query
+from app.services import get_db_session, lookup_cache, paginate_keyset
+
+OPTIONS_PAGE = 20
+MAX_OPTIONS_PAGE = 50
+
+
+@dataclass(frozen=True)
+class OptionList:
+    statement: Callable
+    key: object
+    # Kolumna z indeksem, po której idzie stronicowanie kursorem
+    sort: object
+    etykieta: Callable[[dict], str]
+    tables: frozenset
+    order: str = "asc"
+    search: str | None = None
+
+
+def _join(*parts):
+    return " ".join(str(part) for part in parts if part)
+
+
+def _artysta(row):
+    osoba = _join(row["Imie"], row["Nazwisko"])
+    return f"{row['Nazwa']} - {osoba}" if osoba else str(row["Nazwa"] or "")
+
+
+OPTION_LISTS = {
+    "artysci": OptionList(
+        lambda: select(Artysci.IdArtysty, Artysci.Nazwa, Artysci.Imie, Artysci.Nazwisko),
+        Artysci.IdArtysty, Artysci.Nazwa,
+        _artysta,
+        frozenset({"artysci"}), search="artysci",
+    ),
+    "inzynierowie": OptionList(
+        lambda: select(Inzynierowie.IdInzyniera, Inzynierowie.Imie, Inzynierowie.Nazwisko),
+        Inzynierowie.IdInzyniera, Inzynierowie.Nazwisko,
+        lambda r: _join(r["Imie"], r["Nazwisko"]),
+        frozenset({"inzynierowie"}), search="inzynierowie",
+    ),
+    "sprzet": OptionList(
+        lambda: select(Sprzet.IdSprzetu, Sprzet.Producent, Sprzet.Model, Sprzet.Kategoria),
+        Sprzet.IdSprzetu, Sprzet.Kategoria,
+        lambda r: _join(f"{r['Kategoria']}:", r["Producent"], r["Model"]),
+        frozenset({"sprzet"}), search="sprzet",
+    ),
+    # Najnowsze najpierw; z filtrem artysty czyta indeks (IdArtysty, TerminStart)
+    "sesje": OptionList(
+        lambda: select(Sesje.IdSesji, Sesje.IdArtysty, Artysci.Nazwa.label("NazwaArtysty"),
+                       Sesje.TerminStart)
+        .join(Artysci, Artysci.IdArtysty == Sesje.IdArtysty),
+        Sesje.IdSesji, Sesje.TerminStart,
+        lambda r: _join(f"{r['IdSesji']}:", r["NazwaArtysty"],
+                        r["TerminStart"] and f"({r['TerminStart']:%Y-%m-%d %H:%M})"),
+        frozenset({"sesje", "artysci"}), order="desc",
+    ),
+}
+
+
+def _labelled(spec: OptionList, rows):
+    for row in rows:
+        row["id"] = row[spec.key.key]
+        row["etykieta"] = spec.etykieta(row)
+    return rows
+
+
+def get_options(entity: str, query: str = "", cursor: str | None = None,
+                per_page: int = OPTIONS_PAGE, idartysty: int | None = None):
+    spec = OPTION_LISTS[entity]
+    stmt = spec.statement()
+    if idartysty is not None and entity == "sesje":
+        stmt = stmt.where(Sesje.IdArtysty == idartysty)
+    match = build_match_query(query) if spec.search else ""
+    if match:
+        # Prefiksy słów z indeksu FTS5 (app/search.py), bez skanowania tabeli przez LIKE
+        fts = SEARCH_INDEXES[spec.search].fts_table
+        stmt = stmt.where(spec.key.in_(
+            text(f"SELECT rowid FROM {fts} WHERE {fts} MATCH :match")
+            .bindparams(match=match).columns(column("rowid", Integer))
+        ))
+    with get_db_session() as session:
+        page = paginate_keyset(session, stmt, spec.sort, spec.key, spec.order, cursor,
+                               min(per_page, MAX_OPTIONS_PAGE), as_dicts=True)
+    _labelled(spec, page.items)
+    return page
+
+
+def get_options_by_ids(entity: str, ids):
+    # Opcje już wybrane (edycja, formularz po błędzie), których może nie być na pierwszej stronie
+    ids = [int(value) for value in ids if str(value).isdigit()]
+    if not ids:
+        return []
+    spec = OPTION_LISTS[entity]
+    with get_db_session() as session:
+        rows = session.execute(spec.statement().where(spec.key.in_(ids)).order_by(spec.key))
+        return _labelled(spec, [dict(row) for row in rows.mappings()])
+
+
+def first_page(entity: str):
+    return lookup_cache.get(FIRST_PAGE_LOOKUPS[entity])
+
+
+def form_options(entity: str, wybrane=()):
+    """Opcje do wyrenderowania w formularzu: wybrane, a po nich pierwsza strona listy."""
+    selected = get_options_by_ids(entity, wybrane)
+    ids = {row["id"] for row in selected}
+    page = first_page(entity)
+    return {"opcje": selected + [row for row in page if row["id"] not in ids],
+            "wybrane": ids, "next_cursor": page.next_cursor}
+
+
+# Pierwsze strony list w lookup_cache: formularz bez podpowiedzi czyta tylko wersje tabel
+FIRST_PAGE_LOOKUPS = {"artysci": "artysci", "inzynierowie": "inzynierowie", "sprzet": "sprzet",
+                      "sesje": "sesje_utworow"}
+for _entity, _name in FIRST_PAGE_LOOKUPS.items():
+    lookup_cache.register(_name, OPTION_LISTS[_entity].tables,
+                          lambda entity=_entity: get_options(entity))
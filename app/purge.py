@@ -0,0 +1,76 @@
+"""Twarde usuwanie rekordów oznaczonych jako usunięte (kolumna Usunieto).
+
+Kaskady idą zbiorowymi DELETE ... WHERE <klucz obcy> IN (...) na paczkach kluczy: najpierw
+wiersze zależne, potem rodzic. Każda paczka to osobna krótka transakcja, więc usuwanie
+artysty z setkami tysięcy sesji nie blokuje zapisów do bazy na cały czas operacji.
+"""
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime as dt
+
+from sqlalchemy import delete, literal_column, select
+
+from app import database
+from app.models import Sesje, Sprzet, SprzetySesje
+from app.services import SOFT_DELETE_CASCADES, SOFT_DELETE_MODELS
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Kaskady miękkiego usuwania i tabele powiązań, które nie mają własnej kolumny Usunieto
+PURGE_CASCADES = {
+    **SOFT_DELETE_CASCADES,
+    Sesje: (*SOFT_DELETE_CASCADES[Sesje], (SprzetySesje, SprzetySesje.IdSesji)),
+    Sprzet: ((SprzetySesje, SprzetySesje.IdSprzetu),),
+}
+
+
+@dataclass
+class PurgeStats:
+    usuniete: Counter = field(default_factory=Counter)
+    transakcje: int = 0
+    # Najdłuższa pojedyncza transakcja, czyli najdłuższa blokada zapisu
+    najdluzsza: float = 0.0
+
+
+def _key(model):
+    # Tabela powiązań ma złożony klucz główny - paczki wyznacza jej rowid
+    columns = list(model.__table__.primary_key.columns)
+    return columns[0] if len(columns) == 1 else literal_column("rowid")
+
+
+def _chunks(stmt, chunk_size):
+    while True:
+        with database.engine.connect() as conn:
+            ids = conn.execute(stmt.limit(chunk_size)).scalars().all()
+        if not ids:
+            return
+        yield ids
+
+
+def _purge_ids(model, ids, chunk_size, stats: PurgeStats):
+    for child, fk in PURGE_CASCADES.get(model, ()):
+        for child_ids in _chunks(select(_key(child)).where(fk.in_(ids)), chunk_size):
+            _purge_ids(child, child_ids, chunk_size, stats)
+
+    start = time.perf_counter()
+    with database.engine.begin() as conn:
+        usuniete = conn.execute(delete(model).where(_key(model).in_(ids))).rowcount
+    stats.najdluzsza = max(stats.najdluzsza, time.perf_counter() - start)
+    stats.transakcje += 1
+    stats.usuniete[model.__tablename__] += usuniete
+
+
+def purge_deleted(older_than: dt | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  progress=None):
+    """Usuwa rekordy oznaczone przed older_than (domyślnie wszystkie) razem z zależnymi."""
+    stats = PurgeStats()
+    for model in SOFT_DELETE_MODELS:
+        stmt = select(_key(model)).where(model.Usunieto.is_not(None))
+        if older_than is not None:
+            stmt = stmt.where(model.Usunieto < older_than)
+        for ids in _chunks(stmt, chunk_size):
+            _purge_ids(model, ids, chunk_size, stats)
+            if progress is not None:
+                progress(stats)
+    return stats
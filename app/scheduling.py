@@ -0,0 +1,169 @@
+from dataclasses import dataclass, field
+from datetime import datetime as dt
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from app.models import Sesje, SprzetySesje
+
+# Najdłuższe okno wyszukiwania wolnych terminów
+MAX_SEARCH_WINDOW = timedelta(days=366)
+
+# Górna granica długości sesji ogranicza skan indeksu (zasób, TerminStart) do okna
+# [start - MAX_SESSION_DURATION, stop), więc sprawdzenie kosztuje O(log n + k)
+MAX_SESSION_DURATION = timedelta(days=14)
+
+
+class SchedulingError(ValueError):
+    pass
+
+
+@dataclass
+class Conflict:
+    zasob: str
+    id_zasobu: int
+    idsesji: int
+    terminstart: dt
+    terminstop: dt
+
+    def __str__(self):
+        return (f"{self.zasob} #{self.id_zasobu} jest zajęty w sesji #{self.idsesji} "
+                f"({self.terminstart} - {self.terminstop})")
+
+
+class SessionConflictError(SchedulingError):
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__("Konflikt terminów: " + "; ".join(str(c) for c in conflicts))
+
+
+def _overlaps(start, stop):
+    return (
+        Sesje.TerminStart > start - MAX_SESSION_DURATION,
+        Sesje.TerminStart < stop,
+        Sesje.TerminStop > start,
+    )
+
+
+def find_conflicts(session, session_data, exclude_idsesji=None):
+    start, stop = session_data.terminstart, session_data.terminstop
+    if stop is None or stop <= start:
+        return []
+
+    conflicts = []
+    for zasob, column, id_zasobu in (
+        ("Inżynier", Sesje.IdInzyniera, session_data.idinzyniera),
+        ("Artysta", Sesje.IdArtysty, session_data.idartysty),
+    ):
+        stmt = (
+            select(Sesje.IdSesji, Sesje.TerminStart, Sesje.TerminStop)
+            .where(column == id_zasobu, *_overlaps(start, stop))
+        )
+        if exclude_idsesji is not None:
+            stmt = stmt.where(Sesje.IdSesji != exclude_idsesji)
+        conflicts.extend(
+            Conflict(zasob, id_zasobu, row.IdSesji, row.TerminStart, row.TerminStop)
+            for row in session.execute(stmt)
+        )
+
+    if session_data.sprzet_ids:
+        stmt = (
+            select(SprzetySesje.IdSprzetu, Sesje.IdSesji, Sesje.TerminStart, Sesje.TerminStop)
+            .join(Sesje, Sesje.IdSesji == SprzetySesje.IdSesji)
+            .where(SprzetySesje.IdSprzetu.in_(session_data.sprzet_ids), *_overlaps(start, stop))
+        )
+        if exclude_idsesji is not None:
+            stmt = stmt.where(Sesje.IdSesji != exclude_idsesji)
+        conflicts.extend(
+            Conflict("Sprzęt", row.IdSprzetu, row.IdSesji, row.TerminStart, row.TerminStop)
+            for row in session.execute(stmt)
+        )
+
+    return conflicts
+
+
+def validate_session_times(session_data):
+    check_session_times(session_data.terminstart, session_data.terminstop)
+
+
+def check_session_times(start, stop):
+    if stop is None:
+        return
+    if stop < start:
+        raise SchedulingError("Termin zakończenia jest wcześniejszy niż termin rozpoczęcia")
+    if stop - start > MAX_SESSION_DURATION:
+        raise SchedulingError(
+            f"Sesja nie może trwać dłużej niż {MAX_SESSION_DURATION.days} dni"
+        )
+
+
+def check_conflicts(session, session_data, exclude_idsesji=None):
+    conflicts = find_conflicts(session, session_data, exclude_idsesji)
+    if conflicts:
+        raise SessionConflictError(conflicts)
+
+
+@dataclass
+class SlotQuery:
+    duration: timedelta
+    window_start: dt
+    window_end: dt
+    idinzyniera: int | None = None
+    idartysty: int | None = None
+    sprzet_ids: list[int] = field(default_factory=list)
+
+
+def busy_intervals(session, query: SlotQuery):
+    start, stop = query.window_start, query.window_end
+    statements = []
+    for column, id_zasobu in ((Sesje.IdInzyniera, query.idinzyniera),
+                              (Sesje.IdArtysty, query.idartysty)):
+        if id_zasobu is not None:
+            statements.append(
+                select(Sesje.TerminStart, Sesje.TerminStop)
+                .where(column == id_zasobu, *_overlaps(start, stop))
+            )
+    if query.sprzet_ids:
+        statements.append(
+            select(Sesje.TerminStart, Sesje.TerminStop)
+            .join(SprzetySesje, SprzetySesje.IdSesji == Sesje.IdSesji)
+            .where(SprzetySesje.IdSprzetu.in_(query.sprzet_ids), *_overlaps(start, stop))
+        )
+
+    intervals = []
+    for stmt in statements:
+        intervals.extend((row.TerminStart, row.TerminStop) for row in session.execute(stmt))
+    return merge_intervals(intervals)
+
+
+def merge_intervals(intervals):
+    merged = []
+    for start, stop in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def find_free_slots(session, query: SlotQuery, limit=50):
+    if query.duration <= timedelta(0):
+        raise SchedulingError("Czas trwania musi być dodatni")
+    if query.window_end <= query.window_start:
+        raise SchedulingError("Koniec okna wyszukiwania musi być po jego początku")
+    if query.window_end - query.window_start > MAX_SEARCH_WINDOW:
+        raise SchedulingError(
+            f"Okno wyszukiwania nie może przekraczać {MAX_SEARCH_WINDOW.days} dni"
+        )
+
+    slots = []
+    cursor = query.window_start
+    for busy_start, busy_stop in busy_intervals(session, query) + [(query.window_end, None)]:
+        busy_start = min(busy_start, query.window_end)
+        if busy_start - cursor >= query.duration:
+            slots.append((cursor, busy_start))
+            if len(slots) == limit:
+                break
+        if busy_stop is not None:
+            cursor = max(cursor, busy_stop)
+    return slots
@@ -0,0 +1,156 @@
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import event, text
+
+from app import database
+from app.database import base
+from app.services import get_db_session
+
+# Litery, których unicode61 nie rozkłada na literę bazową i znak diakrytyczny
+FOLD_MAP = {"ł": "l", "Ł": "L"}
+
+# Gotowe indeksy krótkich prefiksów przyspieszają podpowiedzi od 2-3 znaków
+FTS_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+MAX_RESULTS = 50
+
+# Ile najlepszych dopasowań (ORDER BY rank w FTS5) łączyć z tabelą źródłową: krótki
+# prefiks potrafi pasować do setek tysięcy wierszy, a złączenie i filtr usuniętych
+# wystarczy wykonać dla czołówki rankingu
+MAX_CANDIDATES = 1000
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    table: str
+    key: str
+    columns: tuple
+    etykieta: str
+
+    @property
+    def fts_table(self):
+        return f"szukaj_{self.table}"
+
+
+SEARCH_INDEXES = {
+    "artysci": SearchIndex(
+        "artysci", "IdArtysty", ("Nazwa", "Imie", "Nazwisko"),
+        "trim(coalesce(t.Nazwa, '') || ' ' || coalesce(t.Imie, '') || ' ' "
+        "|| coalesce(t.Nazwisko, ''))",
+    ),
+    "inzynierowie": SearchIndex(
+        "inzynierowie", "IdInzyniera", ("Imie", "Nazwisko"),
+        "trim(coalesce(t.Imie, '') || ' ' || coalesce(t.Nazwisko, ''))",
+    ),
+    "sprzet": SearchIndex(
+        "sprzet", "IdSprzetu", ("Producent", "Model", "Kategoria"),
+        "trim(coalesce(t.Producent, '') || ' ' || coalesce(t.Model, ''))",
+    ),
+    "utwory": SearchIndex("utwory", "IdUtworu", ("Tytul",), "t.Tytul"),
+}
+
+
+def fold(value: str):
+    for letter, replacement in FOLD_MAP.items():
+        value = value.replace(letter, replacement)
+    return value
+
+
+def _fold_sql(expr):
+    expr = f"coalesce({expr}, '')"
+    for letter, replacement in FOLD_MAP.items():
+        expr = f"replace({expr}, '{letter}', '{replacement}')"
+    return expr
+
+
+def _folded_values(index: SearchIndex, row: str):
+    return ", ".join([f"{row}.{index.key}"]
+                     + [_fold_sql(f"{row}.{col}") for col in index.columns])
+
+
+def _insert_sql(index: SearchIndex):
+    return f'INSERT INTO {index.fts_table} (rowid, {", ".join(index.columns)}) '
+
+
+def schema_ddl(index: SearchIndex):
+    name = index.fts_table
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} "
+        f"USING fts5({', '.join(index.columns)}, {FTS_OPTIONS})",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {index.table} BEGIN "
+        f"{_insert_sql(index)}VALUES ({_folded_values(index, 'NEW')}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {index.table} BEGIN "
+        f"DELETE FROM {name} WHERE rowid = OLD.{index.key}; END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_au "
+        f"AFTER UPDATE OF {index.key}, {', '.join(index.columns)} ON {index.table} BEGIN "
+        f"DELETE FROM {name} WHERE rowid = OLD.{index.key}; "
+        f"{_insert_sql(index)}VALUES ({_folded_values(index, 'NEW')}); END",
+    ]
+
+
+def _create_schema(_target, connection, **_kw):
+    for index in SEARCH_INDEXES.values():
+        for statement in schema_ddl(index):
+            connection.exec_driver_sql(statement)
+
+
+def _drop_schema(_target, connection, **_kw):
+    for index in SEARCH_INDEXES.values():
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {index.fts_table}")
+
+
+# Tabele FTS i wyzwalacze powstają razem ze schematem (init-db, create_all)
+event.listen(base.metadata, "after_create", _create_schema)
+event.listen(base.metadata, "before_drop", _drop_schema)
+
+
+def rebuild_search_index():
+    counts = {}
+    with database.engine.begin() as conn:
+        _create_schema(None, conn)
+        for entity, index in SEARCH_INDEXES.items():
+            conn.exec_driver_sql(f"DELETE FROM {index.fts_table}")
+            conn.exec_driver_sql(f"{_insert_sql(index)}SELECT {_folded_values(index, 't')} "
+                                 f"FROM {index.table} AS t")
+            conn.exec_driver_sql(f"INSERT INTO {index.fts_table}({index.fts_table}) "
+                                 "VALUES ('optimize')")
+            counts[entity] = conn.exec_driver_sql(
+                f"SELECT count(*) FROM {index.fts_table}"
+            ).scalar()
+    return counts
+
+
+def build_match_query(query: str):
+    # Każde słowo jako prefiks w cudzysłowie: zapytanie użytkownika nie może
+    # wstrzyknąć operatorów FTS5 (AND, NEAR, *, kolumna:)
+    terms = re.findall(r"\w+", fold(query))
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search(entity: str, query: str, limit: int = 20):
+    match = build_match_query(query)
+    if not match:
+        return []
+    index = SEARCH_INDEXES[entity]
+    fts = index.fts_table
+    stmt = text(
+        f"SELECT t.{index.key} AS id, {index.etykieta} AS etykieta, k.ranking "
+        f"FROM (SELECT rowid, rank AS ranking FROM {fts} WHERE {fts} MATCH :match "
+        f"ORDER BY rank LIMIT :kandydaci) AS k JOIN {index.table} AS t ON t.{index.key} = k.rowid "
+        f"WHERE t.Usunieto IS NULL ORDER BY k.ranking LIMIT :limit"
+    )
+    with get_db_session() as session:
+        rows = session.execute(stmt, {"match": match, "kandydaci": MAX_CANDIDATES,
+                                      "limit": min(limit, MAX_RESULTS)})
+        return [{"encja": entity, "id": row.id, "etykieta": row.etykieta,
+                 "ranking": row.ranking} for row in rows]
+
+
+def search_all(query: str, limit: int = 10):
+    results = []
+    for entity in SEARCH_INDEXES:
+        results.extend(search(entity, query, limit))
+    # bm25 daje wartości ujemne: im mniejsza, tym lepsze dopasowanie
+    results.sort(key=lambda result: result["ranking"])
+    return results[:limit]
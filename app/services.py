@@ -1,14 +1,32 @@
+import base64
+import binascii
+import json
+import time
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime as dt
 
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from flask import g, has_request_context
+from sqlalchemy import (String, and_, bindparam, delete, event, func, insert,
+                        literal, or_, select, tuple_, type_coerce, update)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import (Session, joinedload, object_session, selectinload,
+                            with_loader_criteria)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
 
 from app import database
-from app.models import Artysci, Inzynierowie, Sesje, SprzetySesje, Utwory
+from app.cache import BACKENDS, FileBackend, FragmentCache, LookupCache
+from app.instrumentation import timed_commit
+from app.models import (Artysci, Inzynierowie, Sesje, Sprzet, SprzetySesje,
+                        Utwory, WersjeTabel)
+from app.scheduling import (SlotQuery, check_conflicts, find_free_slots,
+                            validate_session_times)
 
 
+class EditConflictError(Exception):
+    pass
+
 @dataclass
 class SessionData:
     idartysty: int
@@ -17,8 +35,84 @@ class SessionData:
     terminstop: dt
     sprzet_ids: list[int]
 
+@dataclass
+class DateRange:
+    od: dt | None = None
+    do: dt | None = None
+
+@dataclass
+class Page:
+    items: list
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+@dataclass(frozen=True)
+class EntityColumns:
+    model: type
+    columns: tuple
+    key: tuple
+    date_column: object = None
+
+ENTITIES = {
+    "artysci": EntityColumns(
+        Artysci,
+        (Artysci.IdArtysty, Artysci.Nazwa, Artysci.Imie, Artysci.Nazwisko),
+        (Artysci.IdArtysty,),
+    ),
+    "inzynierowie": EntityColumns(
+        Inzynierowie,
+        (Inzynierowie.IdInzyniera, Inzynierowie.Imie, Inzynierowie.Nazwisko),
+        (Inzynierowie.IdInzyniera,),
+    ),
+    "sprzet": EntityColumns(
+        Sprzet,
+        (Sprzet.IdSprzetu, Sprzet.Producent, Sprzet.Model, Sprzet.Kategoria),
+        (Sprzet.IdSprzetu,),
+    ),
+    "sesje": EntityColumns(
+        Sesje,
+        (Sesje.IdSesji, Sesje.IdArtysty, Sesje.IdInzyniera, Sesje.TerminStart, Sesje.TerminStop),
+        (Sesje.IdSesji,),
+        Sesje.TerminStart,
+    ),
+    "utwory": EntityColumns(
+        Utwory,
+        (Utwory.IdUtworu, Utwory.IdArtysty, Utwory.IdSesji, Utwory.Tytul),
+        (Utwory.IdUtworu,),
+    ),
+    "sprzety_sesje": EntityColumns(
+        SprzetySesje,
+        (SprzetySesje.IdSprzetu, SprzetySesje.IdSesji, Sesje.TerminStart, Sesje.TerminStop),
+        (SprzetySesje.IdSesji, SprzetySesje.IdSprzetu),
+        Sesje.TerminStart,
+    ),
+}
+
+def request_session():
+    # Jedna sesja na żądanie, otwierana przy pierwszym użyciu; zatwierdzana
+    # w after_request i zamykana w teardown_request (init_app)
+    if "db_session" not in g:
+        g.db_session = database.session()
+    return g.db_session
+
 @contextmanager
 def get_db_session():
+    if has_request_context():
+        session = request_session()
+        try:
+            yield session
+            session.flush()
+        except Exception:
+            session.rollback()
+            raise
+        return
+
     session = database.session()
     try:
         yield session
@@ -29,9 +123,131 @@ def get_db_session():
     finally:
         session.close()
 
-def get_all_sorted(model_class, sort_by=None, order='asc'):
+def init_app(app):
+    configure_lookup_cache(app.config)
+    app.add_template_global(lookup_cache.stats, "lookup_cache_stats")
+    configure_fragment_cache(app.config)
+    app.add_template_global(fragment_cache.stats, "fragment_cache_stats")
+
+    @app.after_request
+    def commit_request_session(response):
+        session = g.get("db_session")
+        if session is not None and response.status_code < 400:
+            with timed_commit():
+                session.commit()
+        return response
+
+    @app.teardown_request
+    def close_request_session(exc):
+        session = g.pop("db_session", None)
+        if session is not None:
+            if exc is not None:
+                session.rollback()
+            session.close()
+
+def encode_cursor(key, pk, direction="next", sort=()):
+    # sort: (kolumna, kierunek) listy, dla której wydano kursor - sprawdzany w decode_cursor
+    if isinstance(key, dt):
+        key = {"dt": key.isoformat()}
+    payload = json.dumps([key, pk, direction, *sort], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor, sort=()):
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, pk, direction, *cursor_sort = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    if direction not in ("next", "prev") or not isinstance(pk, int):
+        return None
+    if cursor_sort != list(sort):
+        return None
+    if isinstance(key, dict):
+        try:
+            key = dt.fromisoformat(key["dt"])
+        except (KeyError, TypeError, ValueError):
+            return None
+    return key, pk, direction
+
+def _cursor_sort(col, order):
+    return str(col), order
+
+def _key_fits_column(col, key):
+    # Klucz z kursora trafia do zapytania jako parametr typu kolumny; zły typ (np. tekst
+    # dla TerminStart) kończyłby się błędem bazy, więc taki kursor traktujemy jak brak kursora
+    if key is None:
+        return True
+    try:
+        python_type = col.type.python_type
+    except NotImplementedError:
+        return True
+    if python_type is float:
+        python_type = (int, float)
+    return isinstance(key, python_type) and not isinstance(key, bool)
+
+def _keyset_after(col, pk_col, key, pk, descending):
+    # SQLite sortuje NULL jako najmniejsze: na poczatku przy ASC, na koncu przy DESC
+    key_values = tuple_(literal(key, col.type), literal(pk, pk_col.type))
+    if descending:
+        if key is None:
+            return and_(col.is_(None), pk_col < pk)
+        return or_(tuple_(col, pk_col) < key_values, col.is_(None))
+    if key is None:
+        return or_(col.is_not(None), and_(col.is_(None), pk_col > pk))
+    return tuple_(col, pk_col) > key_values
+
+def paginate_keyset(# pylint: disable=too-many-arguments,too-many-positional-arguments
+    session, stmt, sort_col, pk_col, order="asc", cursor=None, per_page=50, as_dicts=False
+):
+    decoded = decode_cursor(cursor, _cursor_sort(sort_col, order))
+    if decoded is not None and not _key_fits_column(sort_col, decoded[0]):
+        decoded = None
+    backward = decoded is not None and decoded[2] == "prev"
+    descending = (order == "desc") != backward
+
+    if decoded is not None:
+        stmt = stmt.where(_keyset_after(sort_col, pk_col, decoded[0], decoded[1], descending))
+
+    if descending:
+        stmt = stmt.order_by(sort_col.desc(), pk_col.desc())
+    else:
+        stmt = stmt.order_by(sort_col.asc(), pk_col.asc())
+
+    keys = list(stmt.selected_columns.keys())
+    stmt = stmt.add_columns(sort_col.label("_klucz"), pk_col.label("_pk"))
+    rows = session.execute(stmt.limit(per_page + 1)).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backward:
+        rows.reverse()
+
+    if as_dicts:
+        page = Page(items=[dict(zip(keys, row)) for row in rows])
+    else:
+        page = Page(items=[row[0] for row in rows])
+    if rows:
+        if has_more or backward:
+            page.next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1],
+                                             sort=_cursor_sort(sort_col, order))
+        if (has_more and backward) or (decoded is not None and not backward):
+            page.prev_cursor = encode_cursor(rows[0][-2], rows[0][-1], "prev",
+                                             _cursor_sort(sort_col, order))
+    return page
+
+def _pk_column(model_class):
+    pk_name = list(model_class.__table__.primary_key.columns)[0].name
+    return getattr(model_class, pk_name)
+
+def get_all_sorted(model_class, sort_by=None, order='asc', cursor=None, per_page=None):
     with get_db_session() as session:
         stmt = select(model_class)
+        if per_page is not None:
+            pk_col = _pk_column(model_class)
+            col = getattr(model_class, sort_by) if sort_by else pk_col
+            return paginate_keyset(session, stmt, col, pk_col, order, cursor, per_page)
         if sort_by:
             col = getattr(model_class, sort_by)
             if order == 'desc':
@@ -52,18 +268,65 @@ def get_by_id(model_class, id_value):
     with get_db_session() as session:
         return session.query(model_class).filter(getattr(model_class, pk_name) == id_value).first()
 
-def update_record(instance, **kwargs):
+@contextmanager
+def version_conflict():
+    try:
+        yield
+    except StaleDataError as exc:
+        raise EditConflictError(
+            "Rekord został w międzyczasie zmieniony przez kogoś innego. "
+            "Formularz pokazuje aktualne dane - wprowadź zmiany ponownie."
+        ) from exc
+
+def expect_version(instance, wersja: int | None):
+    # Wersja z formularza staje się warunkiem UPDATE ... WHERE Wersja = :wersja
+    # (version_id_col), więc nieaktualny zapis zmienia 0 wierszy - bez SELECT przed zapisem.
+    # Jawne podbicie wymusza UPDATE także, gdy zmieniły się tylko powiązania rekordu
+    if wersja is None:
+        wersja = instance.Wersja
+    set_committed_value(instance, "Wersja", wersja)
+    instance.Wersja = wersja + 1
+
+def update_record(instance, wersja: int | None = None, **kwargs):
     for attr, value in kwargs.items():
         setattr(instance, attr, value)
+    with version_conflict(), get_db_session() as session:
+        # Obiekt wczytany w tym samym żądaniu jest już w sesji - merge() to dodatkowy SELECT
+        if object_session(instance) is not session:
+            instance = session.merge(instance)
+        expect_version(instance, wersja)
+
+# Usunięcie oznacza też wiersze zależne, jak cascade="all, delete-orphan" w modelach
+# i ON DELETE CASCADE kluczy obcych; twarde usuwanie robi app/purge.py
+SOFT_DELETE_CASCADES = {
+    Artysci: ((Sesje, Sesje.IdArtysty), (Utwory, Utwory.IdArtysty)),
+    Inzynierowie: ((Sesje, Sesje.IdInzyniera),),
+    Sesje: ((Utwory, Utwory.IdSesji),),
+}
+
+def _soft_delete(session, model, where, when):
+    # Zbiorowe UPDATE na każdy poziom kaskady zamiast wczytywania dzieci do pamięci
+    for child, fk in SOFT_DELETE_CASCADES.get(model, ()):
+        _soft_delete(session, child, fk.in_(select(_pk_column(model)).where(where)), when)
+    return session.execute(
+        update(model).where(where, model.Usunieto.is_(None))
+        .values(Usunieto=when, Wersja=model.Wersja + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+def soft_delete(model_class, id_value):
+    """Oznacza rekord (i zależne od niego) jako usunięty; zwraca False, gdy go nie ma."""
     with get_db_session() as session:
-        session.merge(instance)
+        return _soft_delete(session, model_class, _pk_column(model_class) == id_value,
+                            dt.now()) > 0
 
 def get_utwory_by_artist(id_artysty: int):
     with get_db_session() as session:
         stmt = select(Utwory).where(Utwory.IdArtysty == id_artysty)
         return session.execute(stmt).scalars().all()
 
-def get_utwory_sorted(sortby: str = "IdUtworu", order: str = "asc"):
+def get_utwory_sorted(sortby: str = "IdUtworu", order: str = "asc",
+                      cursor: str | None = None, per_page: int | None = None):
     with get_db_session() as session:
         stmt = (
             select(Utwory)
@@ -82,59 +345,111 @@ def get_utwory_sorted(sortby: str = "IdUtworu", order: str = "asc"):
         if sortby in ("Imie", "Nazwisko"):
             stmt = stmt.join(Artysci)
 
+        if per_page is not None:
+            return paginate_keyset(session, stmt, col, Utwory.IdUtworu, order, cursor, per_page)
+
         stmt = stmt.order_by(col.desc() if order == "desc" else col.asc())
         return session.execute(stmt).scalars().all()
 
 
-def get_sessions_sorted(sortby: str = "IdSesji", order: str = "asc"):
+SESSION_SORT_COLUMNS = {
+    "IdSesji": Sesje.IdSesji,
+    "TerminStart": Sesje.TerminStart,
+    "NazwaArtysty": Artysci.Nazwa,
+    "ImieArtysty": Artysci.Imie,
+    "NazwiskoArtysty": Artysci.Nazwisko,
+    "ImieInzyniera": Inzynierowie.Imie,
+    "NazwiskoInzyniera": Inzynierowie.Nazwisko,
+}
+
+def sessions_statement(sortby: str = "IdSesji", termin: DateRange | None = None):
+    stmt = (
+        select(Sesje)
+        .options(joinedload(Sesje.artysci))
+        .options(joinedload(Sesje.inzynierowie))
+    )
+    col = SESSION_SORT_COLUMNS.get(sortby, Sesje.IdSesji)
+    if sortby in ("NazwaArtysty", "ImieArtysty", "NazwiskoArtysty"):
+        stmt = stmt.join(Artysci)
+    if sortby in ("ImieInzyniera", "NazwiskoInzyniera"):
+        stmt = stmt.join(Inzynierowie)
+    if termin is not None and termin.od is not None:
+        stmt = stmt.where(Sesje.TerminStart >= termin.od)
+    if termin is not None and termin.do is not None:
+        stmt = stmt.where(Sesje.TerminStart < termin.do)
+    return stmt, col
+
+def get_sessions_sorted(sortby: str = "IdSesji", order: str = "asc",
+                        cursor: str | None = None, per_page: int | None = None,
+                        termin: DateRange | None = None):
     with get_db_session() as session:
-        stmt = (
-            select(Sesje)
-            .options(joinedload(Sesje.artysci))
-            .options(joinedload(Sesje.inzynierowie))
-        )
-
-        mapping = {
-            "IdSesji": Sesje.IdSesji,
-            "NazwaArtysty": Artysci.Nazwa,
-            "ImieArtysty": Artysci.Imie,
-            "NazwiskoArtysty": Artysci.Nazwisko,
-            "ImieInzyniera": Inzynierowie.Imie,
-            "NazwiskoInzyniera": Inzynierowie.Nazwisko,
-        }
-
-        col = mapping.get(sortby, Sesje.IdSesji)
-        if sortby in ("NazwaArtysty", "ImieArtysty", "NazwiskoArtysty"):
-            stmt = stmt.join(Artysci)
-        if sortby in ("ImieInzyniera", "NazwiskoInzyniera"):
-            stmt = stmt.join(Inzynierowie)
+        stmt, col = sessions_statement(sortby, termin)
+        if per_page is not None:
+            return paginate_keyset(session, stmt, col, Sesje.IdSesji, order, cursor, per_page)
 
         stmt = stmt.order_by(col.desc() if order == "desc" else col.asc())
         return session.execute(stmt).scalars().all()
 
 
+def sessions_details_statement(ids):
+    # Kolekcje przez selectinload: osobne zapytanie IN na kolekcję zamiast iloczynu
+    # utwory x sprzety_sesje w jednym złączeniu; liczba wierszy rośnie liniowo
+    return (
+        select(Sesje)
+        .options(joinedload(Sesje.artysci))
+        .options(joinedload(Sesje.inzynierowie))
+        .options(selectinload(Sesje.utwory))
+        .options(selectinload(Sesje.sprzety_sesje).joinedload(SprzetySesje.sprzet))
+        .where(Sesje.IdSesji.in_(ids))
+    )
+
+def session_details_statement(idsesji: int):
+    return sessions_details_statement([idsesji])
+
 def get_session_details(idsesji: int):
     with get_db_session() as session:
-        stmt = (
-            select(Sesje)
-            .options(joinedload(Sesje.artysci))
-            .options(joinedload(Sesje.inzynierowie))
-            .options(joinedload(Sesje.utwory))
-            .options(joinedload(Sesje.sprzety_sesje).joinedload(SprzetySesje.sprzet))
-            .where(Sesje.IdSesji == idsesji)
-        )
-        return session.execute(stmt).scalars().first()
+        return session.execute(session_details_statement(idsesji)).scalars().first()
+
+def get_sessions_details(ids):
+    """Szczegóły wielu sesji naraz, w kolejności ids; nieistniejące są pomijane."""
+    with get_db_session() as session:
+        sesje = {s.IdSesji: s for s in session.execute(sessions_details_statement(ids)).scalars()}
+        return [sesje[idsesji] for idsesji in ids if idsesji in sesje]
+
+def sync_links(session, owner_col, owner_id, target_col, target_ids):
+    # Zmiana zestawu powiązań many-to-many jako różnica zbiorów: niezmienione
+    # wiersze zostają, usunięte i dodane idą jednym DELETE i jednym INSERT
+    link_model = owner_col.class_
+    existing = set(session.scalars(select(target_col).where(owner_col == owner_id)))
+    wanted = {int(target_id) for target_id in target_ids}
+
+    removed = existing - wanted
+    if removed:
+        session.execute(delete(link_model).where(owner_col == owner_id,
+                                                 target_col.in_(removed)))
+    added = wanted - existing
+    if added:
+        session.execute(insert(link_model), [
+            {owner_col.key: owner_id, target_col.key: target_id} for target_id in sorted(added)
+        ])
+    return bool(removed or added)
+
+def apply_session_data(sesja: Sesje, session_data: SessionData):
+    sesja.IdArtysty = session_data.idartysty
+    sesja.IdInzyniera = session_data.idinzyniera
+    sesja.TerminStart = session_data.terminstart
+    sesja.TerminStop = session_data.terminstop
+    return sesja
 
 def create_session_with_equipment(session_data: SessionData):
+    validate_session_times(session_data)
     with get_db_session() as session:
-        nowa = Sesje(
-            IdArtysty=session_data.idartysty,
-            IdInzyniera=session_data.idinzyniera,
-            TerminStart=session_data.terminstart,
-            TerminStop=session_data.terminstop,
-        )
+        nowa = apply_session_data(Sesje(), session_data)
         session.add(nowa)
         session.flush()
+        # Sprawdzenie po zapisie: transakcja trzyma już blokadę zapisu SQLite,
+        # więc równoległe rezerwacje są weryfikowane kolejno
+        check_conflicts(session, session_data, exclude_idsesji=nowa.IdSesji)
 
         for idsprzetu in session_data.sprzet_ids:
             session.add(SprzetySesje(IdSprzetu=idsprzetu, IdSesji=nowa.IdSesji))
@@ -142,46 +457,311 @@ def create_session_with_equipment(session_data: SessionData):
         session.flush()
         return nowa
 
-def update_session_with_equipment(idsesji: int, session_data: SessionData):
-    with get_db_session() as session:
-        sesja = session.query(Sesje).filter_by(IdSesji=idsesji).first()
+def update_session_with_equipment(idsesji: int, session_data: SessionData,
+                                  wersja: int | None = None):
+    validate_session_times(session_data)
+    with version_conflict(), get_db_session() as session:
+        # W żądaniu sesja wczytana wcześniej przez widok jest w mapie tożsamości
+        sesja = session.get(Sesje, idsesji)
         if sesja is None:
             return None
 
-        sesja.IdArtysty = session_data.idartysty
-        sesja.IdInzyniera = session_data.idinzyniera
-        sesja.TerminStart = session_data.terminstart
-        sesja.TerminStop = session_data.terminstop
-
-        session.query(SprzetySesje).filter_by(IdSesji=idsesji).delete()
-        for idsprzetu in session_data.sprzet_ids:
-            session.add(SprzetySesje(IdSprzetu=idsprzetu, IdSesji=idsesji))
-
+        apply_session_data(sesja, session_data)
+        expect_version(sesja, wersja)
         session.flush()
+        check_conflicts(session, session_data, exclude_idsesji=idsesji)
+
+        if sync_links(session, SprzetySesje.IdSesji, idsesji, SprzetySesje.IdSprzetu,
+                      session_data.sprzet_ids):
+            session.expire(sesja, ["sprzety_sesje"])
         return sesja
 
-def get_sesje_for_utwor_form():
+def get_free_slots(query: SlotQuery, limit: int = 50):
     with get_db_session() as session:
-        stmt = (
-            select(
-                Sesje.IdSesji.label("IdSesji"),
-                Sesje.IdArtysty.label("IdArtysty"),
-                Artysci.Nazwa.label("NazwaArtysty"),
-            )
-            .join(Artysci, Artysci.IdArtysty == Sesje.IdArtysty)
-            .order_by(Sesje.IdSesji.asc())
+        return find_free_slots(session, query, limit)
+
+
+def _booked_minutes():
+    return func.coalesce(
+        (func.julianday(Sesje.TerminStop) - func.julianday(Sesje.TerminStart)) * 1440, 0
+    )
+
+def _usage_row(row):
+    return {"IdSprzetu": row.IdSprzetu, "Producent": row.Producent, "Model": row.Model,
+            "Kategoria": row.Kategoria, "sesje": row.sesje,
+            "godziny": round(row.minuty / 60, 2), "ostatnio": row.ostatnio}
+
+def equipment_usage_statement(termin: DateRange | None = None, idsprzetu: int | None = None):
+    # Jedno zapytanie grupujące sprzety_sesje ⨝ sesje; sprzęt bez sesji ma zera.
+    # Bez zakresu dostęp idzie kluczem głównym (IdSprzetu, IdSesji), z zakresem - indeksem
+    # TerminStart i ix_sprzety_sesje_IdSesji
+    usage = (
+        select(SprzetySesje.IdSprzetu,
+               func.count(Sesje.IdSesji).label("sesje"),  # pylint: disable=not-callable
+               func.sum(_booked_minutes()).label("minuty"),
+               func.max(Sesje.TerminStart).label("ostatnio"))
+        .join(Sesje, Sesje.IdSesji == SprzetySesje.IdSesji)
+        .group_by(SprzetySesje.IdSprzetu)
+    )
+    if idsprzetu is not None:
+        usage = usage.where(SprzetySesje.IdSprzetu == idsprzetu)
+    if termin is not None and termin.od is not None:
+        usage = usage.where(Sesje.TerminStart >= termin.od)
+    if termin is not None and termin.do is not None:
+        usage = usage.where(Sesje.TerminStart < termin.do)
+    usage = usage.subquery()
+    stmt = (
+        select(Sprzet.IdSprzetu, Sprzet.Producent, Sprzet.Model, Sprzet.Kategoria,
+               func.coalesce(usage.c.sesje, 0).label("sesje"),
+               func.coalesce(usage.c.minuty, 0).label("minuty"),
+               type_coerce(usage.c.ostatnio, Sesje.TerminStart.type).label("ostatnio"))
+        .outerjoin(usage, usage.c.IdSprzetu == Sprzet.IdSprzetu)
+    )
+    if idsprzetu is not None:
+        stmt = stmt.where(Sprzet.IdSprzetu == idsprzetu)
+    return stmt
+
+def get_equipment_usage(idsprzetu: int):
+    """Sprzęt z liczbą sesji, zarezerwowanymi godzinami i ostatnim użyciem albo None."""
+    with get_db_session() as session:
+        row = session.execute(equipment_usage_statement(idsprzetu=idsprzetu)).first()
+        return _usage_row(row) if row is not None else None
+
+def get_equipment_usage_all(termin: DateRange | None = None):
+    """Użycie całego sprzętu w zakresie dat jednym zapytaniem, bez pętli po sprzęcie."""
+    with get_db_session() as session:
+        stmt = equipment_usage_statement(termin).order_by(Sprzet.IdSprzetu)
+        return [_usage_row(row) for row in session.execute(stmt)]
+
+def get_equipment_timeline(idsprzetu: int, cursor: str | None = None, per_page: int = 50,
+                           termin: DateRange | None = None):
+    """Sesje, w których użyto sprzętu, od najnowszej; stronicowanie kursorem po TerminStart."""
+    stmt = (
+        select(Sesje.IdSesji, Sesje.TerminStart, Sesje.TerminStop,
+               Artysci.IdArtysty, Artysci.Nazwa.label("NazwaArtysty"),
+               Inzynierowie.IdInzyniera, Inzynierowie.Imie.label("ImieInzyniera"),
+               Inzynierowie.Nazwisko.label("NazwiskoInzyniera"),
+               func.round(_booked_minutes() / 60, 2).label("godziny"))
+        .join(SprzetySesje, SprzetySesje.IdSesji == Sesje.IdSesji)
+        .outerjoin(Artysci, Artysci.IdArtysty == Sesje.IdArtysty)
+        .outerjoin(Inzynierowie, Inzynierowie.IdInzyniera == Sesje.IdInzyniera)
+        .where(SprzetySesje.IdSprzetu == idsprzetu)
+    )
+    if termin is not None and termin.od is not None:
+        stmt = stmt.where(Sesje.TerminStart >= termin.od)
+    if termin is not None and termin.do is not None:
+        stmt = stmt.where(Sesje.TerminStart < termin.do)
+    with get_db_session() as session:
+        return paginate_keyset(session, stmt, Sesje.TerminStart, Sesje.IdSesji, "desc",
+                               cursor, per_page, as_dicts=True)
+
+def _filter_termin(stmt, spec: EntityColumns, termin: DateRange | None):
+    if termin is not None and spec.date_column is not None:
+        if termin.od is not None:
+            stmt = stmt.where(spec.date_column >= termin.od)
+        if termin.do is not None:
+            stmt = stmt.where(spec.date_column < termin.do)
+    return stmt
+
+def entity_statement(entity: str, sort_by=None, order="asc", termin: DateRange | None = None):
+    spec = ENTITIES[entity]
+    stmt = select(*spec.columns).select_from(spec.model)
+    if spec.date_column is not None and spec.model is not Sesje:
+        stmt = stmt.join(Sesje, Sesje.IdSesji == spec.model.IdSesji)
+
+    stmt = _filter_termin(stmt, spec, termin)
+
+    columns = {col.key: col for col in spec.columns}
+    order_cols = [columns[sort_by]] if sort_by in columns else []
+    order_cols += [col for col in spec.key if col.key != sort_by]
+    if order == "desc":
+        return stmt.order_by(*(col.desc() for col in order_cols))
+    return stmt.order_by(*order_cols)
+
+def get_export_columns(entity: str):
+    return [col.key for col in ENTITIES[entity].columns]
+
+def iter_export_rows(entity: str, sort_by=None, order="asc",
+                     termin: DateRange | None = None, batch_size: int = 1000):
+    stmt = entity_statement(entity, sort_by, order, termin)
+    with get_db_session() as session:
+        # yield_per pobiera wiersze partiami z kursora, więc pamięć nie rośnie z tabelą
+        result = session.execute(
+            stmt, execution_options={"yield_per": batch_size, "stream_results": True}
         )
+        yield from result.tuples()
+
+# Kolumny z tabel powiązanych dostępne w API: nazwa -> (kolumna, tabela, warunek złączenia)
+API_JOINED_COLUMNS = {
+    "sesje": {
+        "NazwaArtysty": (Artysci.Nazwa, Artysci, Artysci.IdArtysty == Sesje.IdArtysty),
+        "ImieInzyniera": (Inzynierowie.Imie, Inzynierowie,
+                          Inzynierowie.IdInzyniera == Sesje.IdInzyniera),
+        "NazwiskoInzyniera": (Inzynierowie.Nazwisko, Inzynierowie,
+                              Inzynierowie.IdInzyniera == Sesje.IdInzyniera),
+    },
+    "utwory": {
+        "NazwaArtysty": (Artysci.Nazwa, Artysci, Artysci.IdArtysty == Utwory.IdArtysty),
+        "TerminStart": (Sesje.TerminStart, Sesje, Sesje.IdSesji == Utwory.IdSesji),
+    },
+}
+
+API_ENTITIES = ("artysci", "inzynierowie", "sprzet", "sesje", "utwory")
+
+def get_api_fields(entity: str):
+    return get_export_columns(entity) + list(API_JOINED_COLUMNS.get(entity, {}))
+
+def _api_projection(entity: str, fields):
+    # Tylko żądane kolumny i tylko potrzebne złączenia, bez budowania obiektów ORM
+    spec = ENTITIES[entity]
+    base_columns = {col.key: col for col in spec.columns}
+    joined = API_JOINED_COLUMNS.get(entity, {})
+    stmt = select(*(
+        (base_columns[name] if name in base_columns else joined[name][0]).label(name)
+        for name in fields
+    )).select_from(spec.model)
+    joined_tables = []
+    for name in fields:
+        if name in joined and joined[name][1] not in joined_tables:
+            _col, table, onclause = joined[name]
+            stmt = stmt.outerjoin(table, onclause)
+            joined_tables.append(table)
+    return stmt
+
+def get_api_rows(# pylint: disable=too-many-arguments,too-many-positional-arguments
+    entity: str, fields=None, sort_by=None, order="asc", cursor=None, per_page=50,
+    termin: DateRange | None = None
+):
+    spec = ENTITIES[entity]
+    base_columns = {col.key: col for col in spec.columns}
+    stmt = _filter_termin(_api_projection(entity, fields or list(base_columns)), spec, termin)
+    pk_col = spec.key[0]
+    with get_db_session() as session:
+        return paginate_keyset(session, stmt, base_columns.get(sort_by, pk_col), pk_col,
+                               order, cursor, per_page, as_dicts=True)
 
-        rows = session.execute(stmt).all()
+def get_api_session_details(idsesji: int):
+    with get_db_session() as session:
+        sesja = session.execute(
+            _api_projection("sesje", get_api_fields("sesje")).where(Sesje.IdSesji == idsesji)
+        ).mappings().first()
+        if sesja is None:
+            return None
 
-        return [
-            {
-                "IdSesji": r.IdSesji,
-                "IdArtysty": r.IdArtysty,
-                "NazwaArtysty": r.NazwaArtysty,
-            }
-            for r in rows
-        ]
+        utwory = session.execute(
+            select(Utwory.IdUtworu, Utwory.Tytul)
+            .where(Utwory.IdSesji == idsesji)
+            .order_by(Utwory.IdUtworu)
+        ).mappings().all()
+        sprzet = session.execute(
+            select(Sprzet.IdSprzetu, Sprzet.Producent, Sprzet.Model, Sprzet.Kategoria)
+            .join(SprzetySesje, SprzetySesje.IdSprzetu == Sprzet.IdSprzetu)
+            .where(SprzetySesje.IdSesji == idsesji)
+            .order_by(Sprzet.IdSprzetu)
+        ).mappings().all()
+        return {**sesja, "utwory": [dict(u) for u in utwory], "sprzet": [dict(s) for s in sprzet]}
+
+# Listy wyboru formularzy rejestruje app/options.py
+lookup_cache = LookupCache()
+
+# Wyrenderowane tabele list (app/views/__init__.py: render_fragment)
+fragment_cache = FragmentCache()
+
+def get_lookup(name: str):
+    return lookup_cache.get(name)
+
+# Modele z kolumną Usunieto: zapytania ORM (także ładowanie relacji) pomijają usunięte
+# wiersze, chyba że zapytanie ma execution_options(include_deleted=True)
+SOFT_DELETE_MODELS = (Artysci, Inzynierowie, Sprzet, Sesje, Utwory)
+_NOT_DELETED = tuple(
+    with_loader_criteria(model, lambda cls: cls.Usunieto.is_(None), include_aliases=True)
+    for model in SOFT_DELETE_MODELS
+)
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted(orm_execute_state):
+    if (orm_execute_state.is_select and not orm_execute_state.is_column_load
+            and not orm_execute_state.execution_options.get("include_deleted", False)):
+        orm_execute_state.statement = orm_execute_state.statement.options(*_NOT_DELETED)
+
+@event.listens_for(Session, "after_flush")
+def _track_changed_tables(session, _flush_context):
+    tables = session.info.setdefault("zmienione_tabele", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tables.add(obj.__table__.name)
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_changes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        tables = orm_execute_state.session.info.setdefault("zmienione_tabele", set())
+        tables.add(orm_execute_state.statement.table.name)
+
+@event.listens_for(Session, "before_commit")
+def _bump_changed_versions(session):
+    # Flush przed odczytem zbioru, bo dopiero on rejestruje zmiany w after_flush
+    session.flush()
+    tables = session.info.get("zmienione_tabele")
+    if tables:
+        bump_table_versions(session.connection(), tables)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_lookups(session):
+    tables = session.info.pop("zmienione_tabele", None)
+    if tables:
+        lookup_cache.invalidate_tables(tables)
+        fragment_cache.invalidate_tables(tables)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_tables(session):
+    session.info.pop("zmienione_tabele", None)
+
+def bump_table_versions(connection, tables):
+    stmt = sqlite_insert(WersjeTabel).values([
+        {"Tabela": table, "Wersja": 1, "Zmieniono": int(time.time())} for table in sorted(tables)
+    ])
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=[WersjeTabel.Tabela],
+        set_={"Wersja": WersjeTabel.Wersja + 1, "Zmieniono": stmt.excluded.Zmieniono},
+    ))
+
+def get_table_versions(tables):
+    # Zwykły SELECT na połączeniu sesji żądania: bez mapowania obiektów ORM
+    with get_db_session() as session:
+        rows = session.connection().execute(
+            select(WersjeTabel.Tabela, WersjeTabel.Wersja, WersjeTabel.Zmieniono)
+            .where(WersjeTabel.Tabela.in_(tables))
+        )
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+def request_table_versions(tables):
+    # Jeden odczyt na żądanie dla tych samych tabel (ETag, cache fragmentów i list)
+    cache = g.setdefault("wersje_tabel", {})
+    key = tuple(sorted(tables))
+    if key not in cache:
+        cache[key] = get_table_versions(key)
+    return cache[key]
+
+def _lookup_table_versions(tables):
+    # Poza żądaniem kontekst aplikacji (CLI, rozgrzewka) obejmuje wiele zapisów,
+    # więc wersje zapamiętane w g mogłyby być nieaktualne
+    if has_request_context():
+        return request_table_versions(tables)
+    return get_table_versions(tables)
+
+def configure_lookup_cache(config):
+    backend_class = BACKENDS[config.get("LOOKUP_CACHE_BACKEND", "memory")]
+    options = {"max_entries": config.get("LOOKUP_CACHE_SIZE", 128)}
+    if backend_class is FileBackend:
+        options["directory"] = config.get("LOOKUP_CACHE_DIR")
+    lookup_cache.backend = backend_class(**options)
+    lookup_cache.ttl = config.get("LOOKUP_CACHE_TTL", 300)
+    # Wersje tabel w kluczu: zmiana z innego procesu roboczego (lub importu z CLI)
+    # nie zostawia tu nieaktualnej listy do końca TTL
+    lookup_cache.versions = _lookup_table_versions
+
+def configure_fragment_cache(config):
+    fragment_cache.max_entries = config.get("FRAGMENT_CACHE_SIZE", 256)
+    fragment_cache.max_bytes = config.get("FRAGMENT_CACHE_MAX_BYTES", 32 * 1024 * 1024)
 
 def get_selected_sprzet_ids(id_sesji):
     with get_db_session() as session:
@@ -191,6 +771,60 @@ def get_selected_sprzet_ids(id_sesji):
             ]
         return selected_sprzet_ids
 
+def parse_legacy_termin(value):
+    if value is None:
+        return None
+    return dt.fromisoformat(value.strip().replace('/', '-'))
+
+def normalize_session_dates(batch_size=5000, progress=None):
+    raw_start = type_coerce(Sesje.TerminStart, String).label("raw_start")
+    raw_stop = type_coerce(Sesje.TerminStop, String).label("raw_stop")
+    stats = {"sprawdzone": 0, "poprawione": 0, "bledne": []}
+    last_id = 0
+
+    while True:
+        with get_db_session() as session:
+            rows = session.execute(
+                select(Sesje.IdSesji, raw_start, raw_stop)
+                .where(Sesje.IdSesji > last_id)
+                .order_by(Sesje.IdSesji)
+                .limit(batch_size)
+                .execution_options(include_deleted=True)
+            ).all()
+            if not rows:
+                break
+
+            poprawki = []
+            for row in rows:
+                try:
+                    start = parse_legacy_termin(row.raw_start)
+                    stop = parse_legacy_termin(row.raw_stop)
+                except ValueError:
+                    stats["bledne"].append(row.IdSesji)
+                    continue
+                canonical = (
+                    start.strftime("%Y-%m-%d %H:%M:%S") if start else None,
+                    stop.strftime("%Y-%m-%d %H:%M:%S") if stop else None,
+                )
+                if canonical != (row.raw_start, row.raw_stop):
+                    poprawki.append({"Id": row.IdSesji, "Start": start, "Stop": stop})
+
+            if poprawki:
+                session.connection().execute(
+                    update(Sesje.__table__)
+                    .where(Sesje.__table__.c.IdSesji == bindparam("Id"))
+                    .values(TerminStart=bindparam("Start"), TerminStop=bindparam("Stop")),
+                    poprawki,
+                )
+
+        stats["sprawdzone"] += len(rows)
+        stats["poprawione"] += len(poprawki)
+        last_id = rows[-1].IdSesji
+        if progress is not None:
+            progress(stats)
+
+    return stats
+
 def safe_date_parse(date_str):
     date_str = (date_str or '').strip()
     if not date_str:
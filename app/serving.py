@@ -0,0 +1,25 @@
+import logging
+
+from flask import Flask
+
+from app import database
+from app.services import lookup_cache
+
+logger = logging.getLogger(__name__)
+
+
+def warmup(app: Flask):
+    """Kompiluje wszystkie szablony i wczytuje listy słownikowe przed pierwszym żądaniem."""
+    with app.app_context():
+        szablony = [name for name in app.jinja_env.list_templates() if name.endswith(".html")]
+        for name in szablony:
+            app.jinja_env.get_template(name)
+        listy = lookup_cache.warm()
+    logger.info("Rozgrzewka: %d szablonów, %d list słownikowych", len(szablony), listy)
+    return {"szablony": len(szablony), "listy": listy}
+
+
+def shutdown():
+    # Zamknięcie połączeń kończy też transakcje odczytu, więc WAL może zostać scalony
+    database.engine.dispose()
+    logger.info("Zamknięto połączenia z bazą danych")
@@ -0,0 +1,120 @@
+// Listy wyboru z podpowiedziami (szablon lista_wyboru.html): wpisany tekst zawęża opcje
+// po stronie serwera, "Więcej…" dociąga kolejną stronę; wybrane opcje zostają na liście.
+(function () {
+    const OPOZNIENIE_MS = 250;
+
+    function opcjeUrl(lista, parametry) {
+        const url = new URL(lista.dataset.opcjeUrl, window.location.origin);
+        Object.entries(parametry).forEach(([nazwa, wartosc]) => {
+            if (wartosc) {
+                url.searchParams.set(nazwa, wartosc);
+            }
+        });
+        if (lista.dataset.zalezyOd) {
+            const nadrzedna = document.getElementById(lista.dataset.zalezyOd);
+            if (nadrzedna && nadrzedna.value) {
+                url.searchParams.set("artysta", nadrzedna.value);
+            }
+        }
+        return url;
+    }
+
+    function dodajOpcje(lista, opcja) {
+        if (lista.tagName === "SELECT") {
+            const option = document.createElement("option");
+            option.value = opcja.id;
+            option.textContent = opcja.etykieta;
+            if (opcja.artysta) {
+                option.dataset.artysta = opcja.artysta;
+            }
+            lista.appendChild(option);
+            return;
+        }
+        const nazwa = lista.dataset.nazwa;
+        const wiersz = document.createElement("div");
+        wiersz.className = "p-2";
+        const pole = document.createElement("input");
+        pole.type = "checkbox";
+        pole.name = nazwa;
+        pole.value = opcja.id;
+        pole.id = `${nazwa}_${opcja.id}`;
+        pole.className = "form-check-input";
+        const etykieta = document.createElement("label");
+        etykieta.htmlFor = pole.id;
+        etykieta.className = "form-check-label";
+        etykieta.textContent = opcja.etykieta;
+        wiersz.append(pole, etykieta);
+        lista.appendChild(wiersz);
+    }
+
+    function wybrane(lista) {
+        if (lista.tagName === "SELECT") {
+            return new Set(lista.value ? [lista.value] : []);
+        }
+        return new Set([...lista.querySelectorAll("input:checked")].map(pole => pole.value));
+    }
+
+    function wyczysc(lista) {
+        // Zostają tylko wybrane opcje (i pusta opcja listy rozwijanej)
+        const zostaja = wybrane(lista);
+        if (lista.tagName === "SELECT") {
+            [...lista.options].forEach(option => {
+                if (option.value && !zostaja.has(option.value)) {
+                    option.remove();
+                }
+            });
+        } else {
+            lista.querySelectorAll("input").forEach(pole => {
+                if (!zostaja.has(pole.value)) {
+                    pole.parentElement.remove();
+                }
+            });
+        }
+        return zostaja;
+    }
+
+    async function wczytaj(lista, wiecej, kursor, zapytanie) {
+        const odpowiedz = await fetch(opcjeUrl(lista, {q: zapytanie, cursor: kursor}));
+        if (!odpowiedz.ok) {
+            return;
+        }
+        const dane = await odpowiedz.json();
+        const obecne = kursor ? wybrane(lista) : wyczysc(lista);
+        const juzNaLiscie = lista.tagName === "SELECT"
+            ? new Set([...lista.options].map(option => option.value))
+            : new Set([...lista.querySelectorAll("input")].map(pole => pole.value));
+        dane.opcje.forEach(opcja => {
+            if (!obecne.has(String(opcja.id)) && !juzNaLiscie.has(String(opcja.id))) {
+                dodajOpcje(lista, opcja);
+            }
+        });
+        lista.dataset.nextCursor = dane.next_cursor || "";
+        wiecej.hidden = !dane.next_cursor;
+    }
+
+    document.querySelectorAll("[data-opcje-url]").forEach(lista => {
+        const cel = lista.id;
+        const szukaj = document.querySelector(`[data-lista-szukaj="${cel}"]`);
+        const wiecej = document.querySelector(`[data-lista-wiecej="${cel}"]`);
+        const zapytanie = () => (szukaj ? szukaj.value : "");
+        let opoznienie;
+
+        if (szukaj) {
+            szukaj.addEventListener("input", () => {
+                clearTimeout(opoznienie);
+                opoznienie = setTimeout(() => wczytaj(lista, wiecej, null, zapytanie()),
+                                        OPOZNIENIE_MS);
+            });
+        }
+        wiecej.addEventListener("click", () => {
+            wczytaj(lista, wiecej, lista.dataset.nextCursor, zapytanie());
+        });
+        if (lista.dataset.zalezyOd) {
+            const nadrzedna = document.getElementById(lista.dataset.zalezyOd);
+            nadrzedna.addEventListener("change", () => {
+                lista.value = "";
+                wczytaj(lista, wiecej, null, zapytanie());
+            });
+        }
+    });
+})();
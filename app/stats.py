@@ -0,0 +1,215 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event, func, select
+
+from app import database
+from app.database import base
+from app.models import (Artysci, Inzynierowie, Sprzet, StatArtystow,
+                        StatInzynierowDzien, StatLiczniki, StatSprzetuDzien)
+from app.services import get_db_session
+
+# Domyślny zakres pulpitu: ostatnie tygodnie do dziś włącznie
+DEFAULT_WEEKS = 12
+
+STAT_TABLES = ("stat_inzynierowie_dzien", "stat_sprzet_dzien", "stat_artysci",
+               "stat_liczniki")
+
+
+def _day(row):
+    # Sesja liczy się w całości do dnia rozpoczęcia (rzadko przechodzi przez północ)
+    return f"date({row}.TerminStart)"
+
+
+def _minutes(row):
+    return (f"CAST(round(coalesce((julianday({row}.TerminStop) - julianday({row}.TerminStart))"
+            f" * 1440, 0)) AS INTEGER)")
+
+
+def _upsert(table, keys, counters, select_sql):
+    # WHERE w SELECT jest wymagane, żeby SQLite nie pomylił ON CONFLICT ze złączeniem
+    updates = ", ".join(f"{c} = {c} + excluded.{c}" for c in counters)
+    return (f"INSERT INTO {table} ({', '.join(keys + counters)}) {select_sql} "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}")
+
+
+def _engineer(row, sign):
+    return _upsert(
+        "stat_inzynierowie_dzien", ["Dzien", "IdInzyniera"], ["Sesje", "Minuty"],
+        f"SELECT {_day(row)}, {row}.IdInzyniera, {sign}1, {sign}{_minutes(row)} "
+        f"WHERE {_day(row)} IS NOT NULL AND {row}.IdInzyniera IS NOT NULL "
+        f"AND {row}.Usunieto IS NULL",
+    )
+
+
+def _equipment_of_session(row, sign):
+    return _upsert(
+        "stat_sprzet_dzien", ["Dzien", "IdSprzetu"], ["Sesje", "Minuty"],
+        f"SELECT {_day(row)}, ss.IdSprzetu, {sign}1, {sign}{_minutes(row)} "
+        f"FROM sprzety_sesje AS ss WHERE ss.IdSesji = {row}.IdSesji AND {_day(row)} IS NOT NULL "
+        f"AND {row}.Usunieto IS NULL",
+    )
+
+
+def _equipment_of_link(row, sign):
+    return _upsert(
+        "stat_sprzet_dzien", ["Dzien", "IdSprzetu"], ["Sesje", "Minuty"],
+        f"SELECT {_day('s')}, {row}.IdSprzetu, {sign}1, {sign}{_minutes('s')} "
+        f"FROM sesje AS s WHERE s.IdSesji = {row}.IdSesji AND {_day('s')} IS NOT NULL "
+        "AND s.Usunieto IS NULL",
+    )
+
+
+def _artist(row, sign, counter):
+    values = {"Sesje": "0", "Utwory": "0", counter: f"{sign}1"}
+    return _upsert(
+        "stat_artysci", ["IdArtysty"], ["Sesje", "Utwory"],
+        f"SELECT {row}.IdArtysty, {values['Sesje']}, {values['Utwory']} "
+        f"WHERE {row}.IdArtysty IS NOT NULL AND {row}.Usunieto IS NULL",
+    )
+
+
+def _total(name, row, sign):
+    return _upsert("stat_liczniki", ["Nazwa"], ["Wartosc"],
+                   f"SELECT '{name}', {sign}1 WHERE {row}.Usunieto IS NULL")
+
+
+def _trigger(name, event_sql, statements):
+    return f"CREATE TRIGGER IF NOT EXISTS {name} {event_sql} BEGIN {'; '.join(statements)}; END"
+
+
+def trigger_ddl():
+    return [
+        _trigger("stat_sesje_ai", "AFTER INSERT ON sesje",
+                 [_engineer("NEW", ""), _artist("NEW", "", "Sesje"), _total("sesje", "NEW", "")]),
+        # BEFORE: kaskadowe usunięcie sprzety_sesje następuje dopiero po usunięciu sesji
+        _trigger("stat_sesje_bd", "BEFORE DELETE ON sesje",
+                 [_engineer("OLD", "-"), _artist("OLD", "-", "Sesje"), _total("sesje", "OLD", "-"),
+                  _equipment_of_session("OLD", "-")]),
+        # Miękkie usunięcie (Usunieto) odejmuje sesję tak jak DELETE
+        _trigger("stat_sesje_au",
+                 "AFTER UPDATE OF IdArtysty, IdInzyniera, TerminStart, TerminStop, Usunieto "
+                 "ON sesje",
+                 [_engineer("OLD", "-"), _engineer("NEW", ""),
+                  _artist("OLD", "-", "Sesje"), _artist("NEW", "", "Sesje"),
+                  _total("sesje", "OLD", "-"), _total("sesje", "NEW", ""),
+                  _equipment_of_session("OLD", "-"), _equipment_of_session("NEW", "")]),
+        _trigger("stat_sprzety_sesje_ai", "AFTER INSERT ON sprzety_sesje",
+                 [_equipment_of_link("NEW", "")]),
+        _trigger("stat_sprzety_sesje_ad", "AFTER DELETE ON sprzety_sesje",
+                 [_equipment_of_link("OLD", "-")]),
+        _trigger("stat_sprzety_sesje_au", "AFTER UPDATE ON sprzety_sesje",
+                 [_equipment_of_link("OLD", "-"), _equipment_of_link("NEW", "")]),
+        _trigger("stat_utwory_ai", "AFTER INSERT ON utwory",
+                 [_artist("NEW", "", "Utwory"), _total("utwory", "NEW", "")]),
+        _trigger("stat_utwory_ad", "AFTER DELETE ON utwory",
+                 [_artist("OLD", "-", "Utwory"), _total("utwory", "OLD", "-")]),
+        _trigger("stat_utwory_au", "AFTER UPDATE OF IdArtysty, Usunieto ON utwory",
+                 [_artist("OLD", "-", "Utwory"), _artist("NEW", "", "Utwory"),
+                  _total("utwory", "OLD", "-"), _total("utwory", "NEW", "")]),
+    ]
+
+
+def _create_triggers(_target, connection, **_kw):
+    for statement in trigger_ddl():
+        connection.exec_driver_sql(statement)
+
+
+event.listen(base.metadata, "after_create", _create_triggers)
+
+
+REBUILD_SQL = [
+    "INSERT INTO stat_inzynierowie_dzien (Dzien, IdInzyniera, Sesje, Minuty) "
+    f"SELECT {_day('s')}, s.IdInzyniera, count(*), sum({_minutes('s')}) FROM sesje AS s "
+    f"WHERE {_day('s')} IS NOT NULL AND s.IdInzyniera IS NOT NULL AND s.Usunieto IS NULL "
+    "GROUP BY 1, 2",
+    "INSERT INTO stat_sprzet_dzien (Dzien, IdSprzetu, Sesje, Minuty) "
+    f"SELECT {_day('s')}, ss.IdSprzetu, count(*), sum({_minutes('s')}) "
+    "FROM sprzety_sesje AS ss JOIN sesje AS s ON s.IdSesji = ss.IdSesji "
+    f"WHERE {_day('s')} IS NOT NULL AND s.Usunieto IS NULL GROUP BY 1, 2",
+    "INSERT INTO stat_artysci (IdArtysty, Sesje, Utwory) "
+    "SELECT IdArtysty, sum(s), sum(u) FROM ("
+    "SELECT IdArtysty, 1 AS s, 0 AS u FROM sesje WHERE Usunieto IS NULL "
+    "UNION ALL SELECT IdArtysty, 0, 1 FROM utwory WHERE Usunieto IS NULL"
+    ") WHERE IdArtysty IS NOT NULL GROUP BY IdArtysty",
+    "INSERT INTO stat_liczniki (Nazwa, Wartosc) "
+    "SELECT 'sesje', count(*) FROM sesje WHERE Usunieto IS NULL "
+    "UNION ALL SELECT 'utwory', count(*) FROM utwory WHERE Usunieto IS NULL",
+]
+
+
+def rebuild_stats():
+    tables = [base.metadata.tables[name] for name in STAT_TABLES]
+    base.metadata.create_all(database.engine, tables=tables)
+    with database.engine.begin() as conn:
+        # Wyzwalacze tworzone od nowa: baza mogła mieć je w starszej wersji
+        for (name,) in conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'stat%'"
+        ).all():
+            conn.exec_driver_sql(f"DROP TRIGGER {name}")
+        _create_triggers(None, conn)
+        for table in STAT_TABLES:
+            conn.exec_driver_sql(f"DELETE FROM {table}")
+        for statement in REBUILD_SQL:
+            conn.exec_driver_sql(statement)
+        return {table: conn.exec_driver_sql(f"SELECT count(*) FROM {table}").scalar()
+                for table in STAT_TABLES}
+
+
+def default_range(today: date | None = None):
+    do = (today or date.today()) + timedelta(days=1)
+    return do - timedelta(weeks=DEFAULT_WEEKS), do
+
+
+def engineer_utilization(od: date, do: date):
+    # Poniedziałek tygodnia, do którego należy dzień
+    tydzien = func.date(StatInzynierowDzien.Dzien, "weekday 0", "-6 days").label("tydzien")
+    stmt = (
+        select(tydzien, Inzynierowie.IdInzyniera, Inzynierowie.Imie, Inzynierowie.Nazwisko,
+               func.sum(StatInzynierowDzien.Sesje), func.sum(StatInzynierowDzien.Minuty))
+        .join(Inzynierowie, Inzynierowie.IdInzyniera == StatInzynierowDzien.IdInzyniera)
+        .where(StatInzynierowDzien.Dzien >= od.isoformat(),
+               StatInzynierowDzien.Dzien < do.isoformat())
+        .group_by(tydzien, Inzynierowie.IdInzyniera)
+        .having(func.sum(StatInzynierowDzien.Sesje) > 0)
+        .order_by(tydzien, Inzynierowie.IdInzyniera)
+    )
+    with get_db_session() as session:
+        return [{"tydzien": row[0], "IdInzyniera": row[1], "inzynier": f"{row[2]} {row[3]}",
+                 "sesje": row[4], "godziny": round(row[5] / 60, 2)}
+                for row in session.execute(stmt)]
+
+
+def equipment_usage(od: date, do: date, limit: int = 20):
+    uzycia = func.sum(StatSprzetuDzien.Sesje).label("uzycia")
+    stmt = (
+        select(Sprzet.IdSprzetu, Sprzet.Producent, Sprzet.Model, uzycia,
+               func.sum(StatSprzetuDzien.Minuty))
+        .join(Sprzet, Sprzet.IdSprzetu == StatSprzetuDzien.IdSprzetu)
+        .where(StatSprzetuDzien.Dzien >= od.isoformat(), StatSprzetuDzien.Dzien < do.isoformat())
+        .group_by(Sprzet.IdSprzetu)
+        .having(uzycia > 0)
+        .order_by(uzycia.desc(), Sprzet.IdSprzetu)
+        .limit(limit)
+    )
+    with get_db_session() as session:
+        return [{"IdSprzetu": row[0], "sprzet": f"{row[1]} {row[2]}", "uzycia": row[3],
+                 "godziny": round(row[4] / 60, 2)} for row in session.execute(stmt)]
+
+
+def artist_stats(limit: int = 20):
+    stmt = (
+        select(Artysci.IdArtysty, Artysci.Nazwa, StatArtystow.Sesje, StatArtystow.Utwory)
+        .join(Artysci, Artysci.IdArtysty == StatArtystow.IdArtysty)
+        .where(StatArtystow.Sesje > 0)
+        # Kolejność zgodna z indeksem na Sesje (z kluczem głównym), bez sortowania remisów
+        .order_by(StatArtystow.Sesje.desc(), StatArtystow.IdArtysty.desc())
+        .limit(limit)
+    )
+    with get_db_session() as session:
+        artysci = [{"IdArtysty": row[0], "artysta": row[1], "sesje": row[2], "utwory": row[3],
+                    "utwory_na_sesje": round(row[3] / row[2], 2)}
+                   for row in session.execute(stmt)]
+        totals = dict(session.execute(select(StatLiczniki.Nazwa, StatLiczniki.Wartosc)).all())
+    sesje, utwory = totals.get("sesje", 0), totals.get("utwory", 0)
+    return {"artysci": artysci, "sesje": sesje, "utwory": utwory,
+            "utwory_na_sesje": round(utwory / sesje, 2) if sesje else 0}
@@ -0,0 +1,45 @@
+from urllib.parse import urlencode
+
+from flask import current_app, render_template, request, url_for
+from markupsafe import Markup
+
+from app.http_cache import request_table_versions
+from app.services import DateRange, fragment_cache, safe_date_parse
+
+
+def url_with_args(**overrides):
+    args = request.args.to_dict()
+    args.update(overrides)
+    args = {name: value for name, value in args.items() if value is not None}
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+
+def url_with_cursor(cursor):
+    return url_with_args(cursor=cursor)
+
+
+def date_range_from_args():
+    termin = DateRange()
+    if request.args.get("od"):
+        termin.od = safe_date_parse(request.args["od"])
+    if request.args.get("do"):
+        termin.do = safe_date_parse(request.args["do"])
+    return termin
+
+
+def render_fragment(template: str, tables, load_context):
+    # Klucz: adres z parametrami listy i wersje tabel; przy trafieniu load_context
+    # (zapytanie ORM) ani pętla szablonu nie są wykonywane
+    if not current_app.config.get("FRAGMENT_CACHE", True):
+        return Markup(render_template(template, **load_context()))
+    versions = request_table_versions(tables)
+    key = "|".join((
+        template,
+        f"{request.path}?{urlencode(sorted(request.args.items(multi=True)))}",
+        ",".join(f"{table}={wersja}" for table, (wersja, _) in sorted(versions.items())),
+    ))
+    html = fragment_cache.get(key)
+    if html is None:
+        html = render_template(template, **load_context())
+        fragment_cache.set(key, html, tables)
+    return Markup(html)
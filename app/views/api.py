@@ -0,0 +1,105 @@
+import json
+from datetime import datetime as dt
+
+from flask import Blueprint, abort, current_app, request
+
+from app.services import (API_ENTITIES, get_api_fields, get_api_rows,
+                          get_api_session_details, get_equipment_timeline,
+                          get_equipment_usage, get_equipment_usage_all)
+from app.views import date_range_from_args
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+api_bp = Blueprint("api", __name__)
+
+# Górna granica liczby rekordów na stronę odpowiedzi
+MAX_LIMIT = 1000
+
+
+def _json_value(value):
+    if isinstance(value, dt):
+        return value.isoformat()
+    raise TypeError(f"Nieobsługiwany typ: {type(value).__name__}")
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)  # pylint: disable=no-member
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"),
+                      default=_json_value).encode()
+
+
+def _json_response(data, status=200):
+    return current_app.response_class(dumps(data), status=status, mimetype="application/json")
+
+
+def _limit():
+    try:
+        limit = int(request.args.get("limit", current_app.config["PER_PAGE"]))
+    except ValueError:
+        return None
+    return limit if 0 < limit <= MAX_LIMIT else None
+
+
+@api_bp.route("/<entity>")
+def api_list_view(entity: str):
+    if entity not in API_ENTITIES:
+        abort(404)
+
+    fields = [f for f in request.args.get("fields", "").split(",") if f]
+    nieznane = [f for f in fields if f not in get_api_fields(entity)]
+    if nieznane:
+        return _json_response({"blad": f"Nieznane pola: {', '.join(nieznane)}"}, 400)
+    limit = _limit()
+    if limit is None:
+        return _json_response({"blad": f"Parametr limit musi być liczbą od 1 do {MAX_LIMIT}"},
+                              400)
+    try:
+        termin = date_range_from_args()
+    except ValueError as e:
+        return _json_response({"blad": f"Nieprawidłowy format daty: {e}"}, 400)
+
+    page = get_api_rows(entity, fields=fields, sort_by=request.args.get("sort"),
+                        order=request.args.get("order", "asc"),
+                        cursor=request.args.get("cursor"), per_page=limit, termin=termin)
+    return _json_response({"dane": page.items, "nastepny": page.next_cursor,
+                           "poprzedni": page.prev_cursor})
+
+
+@api_bp.route("/sesje/<int:idsesji>")
+def api_sesja_view(idsesji: int):
+    sesja = get_api_session_details(idsesji)
+    if sesja is None:
+        return _json_response({"blad": f"Nie znaleziono sesji {idsesji}"}, 404)
+    return _json_response(sesja)
+
+
+@api_bp.route("/sprzet/<int:idsprzetu>/historia")
+def api_sprzet_historia_view(idsprzetu: int):
+    limit = _limit()
+    if limit is None:
+        return _json_response({"blad": f"Parametr limit musi być liczbą od 1 do {MAX_LIMIT}"},
+                              400)
+    try:
+        termin = date_range_from_args()
+    except ValueError as e:
+        return _json_response({"blad": f"Nieprawidłowy format daty: {e}"}, 400)
+    uzycie = get_equipment_usage(idsprzetu)
+    if uzycie is None:
+        return _json_response({"blad": f"Nie znaleziono sprzętu {idsprzetu}"}, 404)
+
+    page = get_equipment_timeline(idsprzetu, request.args.get("cursor"), limit, termin)
+    return _json_response({"sprzet": uzycie, "dane": page.items, "nastepny": page.next_cursor,
+                           "poprzedni": page.prev_cursor})
+
+
+@api_bp.route("/sprzet/uzycie")
+def api_sprzet_uzycie_view():
+    try:
+        termin = date_range_from_args()
+    except ValueError as e:
+        return _json_response({"blad": f"Nieprawidłowy format daty: {e}"}, 400)
+    return _json_response({"dane": get_equipment_usage_all(termin)})
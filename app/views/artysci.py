@@ -1,18 +1,23 @@
-from flask import Blueprint, redirect, render_template, request, url_for
+from flask import (Blueprint, abort, current_app, flash, redirect,
+                   render_template, request, url_for)
 
+from app.http_cache import versioned
 from app.models import Artysci
-from app.services import (create_record, get_all_sorted, get_by_id,
-                          get_utwory_by_artist, update_record)
+from app.services import (EditConflictError, create_record, get_all_sorted,
+                          get_by_id, get_utwory_by_artist, soft_delete,
+                          update_record)
 
 artysci_bp = Blueprint("artysci", __name__)
 
 
 @artysci_bp.route("/")
+@versioned("artysci")
 def artysci_view():
     sortby = request.args.get("sort", "IdArtysty")
     order = request.args.get("order", "asc")
+    cursor = request.args.get("cursor")
 
-    artysci = get_all_sorted(Artysci, sortby, order)
+    artysci = get_all_sorted(Artysci, sortby, order, cursor, current_app.config["PER_PAGE"])
 
     return render_template("artysci.html", artysci=artysci, sort_by=sortby, order=order)
 
@@ -34,20 +39,36 @@ def dodaj_artyste_view():
 @artysci_bp.route("/edytuj/<int:id_artysty>", methods=["GET", "POST"])
 def edytuj_artyste_view(id_artysty: int):
     artysta = get_by_id(Artysci, id_artysty)
+    if artysta is None:
+        abort(404)
 
     if request.method == "POST":
-        update_record(
-            artysta,
-            Nazwa=request.form.get("nazwa"),
-            Imie=request.form.get("imie"),
-            Nazwisko=request.form.get("nazwisko"),
-        )
+        try:
+            update_record(
+                artysta,
+                wersja=request.form.get("wersja", type=int),
+                Nazwa=request.form.get("nazwa"),
+                Imie=request.form.get("imie"),
+                Nazwisko=request.form.get("nazwisko"),
+            )
+        except EditConflictError as e:
+            flash(str(e), "error")
+            return render_template("edytuj_artyste.html", artysta=artysta), 409
         return redirect(url_for("artysci.artysci_view"))
 
     return render_template("edytuj_artyste.html", artysta=artysta)
 
 
+@artysci_bp.route("/usun/<int:id_artysty>", methods=["POST"])
+def usun_artyste_view(id_artysty: int):
+    # Razem z sesjami i utworami artysty; trwale usuwa je dopiero flask purge
+    if not soft_delete(Artysci, id_artysty):
+        abort(404)
+    return redirect(url_for("artysci.artysci_view"))
+
+
 @artysci_bp.route("/utwory/<int:id_artysty>")
+@versioned("utwory")
 def utwory_artysty_view(id_artysty: int):
     utwory = get_utwory_by_artist(id_artysty)
     return render_template("modal_utwory.html", utwory_artysty=utwory)
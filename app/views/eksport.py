@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from datetime import datetime as dt
+
+from flask import Blueprint, Response, abort, request, stream_with_context
+
+from app.services import ENTITIES, get_export_columns, iter_export_rows
+from app.views import date_range_from_args
+
+eksport_bp = Blueprint("eksport", __name__)
+
+# Rozmiar bufora, po którego zapełnieniu fragment odpowiedzi trafia do klienta
+CHUNK_SIZE = 64 * 1024
+
+
+def _export_rows(entity):
+    if entity not in ENTITIES:
+        abort(404)
+    try:
+        termin = date_range_from_args()
+    except ValueError as e:
+        abort(Response(f"Nieprawidłowy format daty: {e}", status=400))
+    return iter_export_rows(entity, sort_by=request.args.get("sort"),
+                            order=request.args.get("order", "asc"), termin=termin)
+
+
+def _attachment(entity, extension):
+    return {"Content-Disposition": f"attachment; filename={entity}.{extension}"}
+
+
+def _json_value(value):
+    if isinstance(value, dt):
+        return value.isoformat(sep=" ")
+    raise TypeError(f"Nieobsługiwany typ: {type(value).__name__}")
+
+
+@eksport_bp.route("/<entity>.csv")
+def export_csv(entity: str):
+    rows = _export_rows(entity)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(get_export_columns(entity))
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return Response(stream_with_context(generate()), mimetype="text/csv",
+                    headers=_attachment(entity, "csv"))
+
+
+@eksport_bp.route("/<entity>.ndjson")
+def export_ndjson(entity: str):
+    rows = _export_rows(entity)
+    columns = get_export_columns(entity)
+
+    def generate():
+        chunk = []
+        size = 0
+        for row in rows:
+            line = json.dumps(dict(zip(columns, row)), ensure_ascii=False,
+                              default=_json_value) + "\n"
+            chunk.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield "".join(chunk)
+                chunk, size = [], 0
+        yield "".join(chunk)
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson",
+                    headers=_attachment(entity, "ndjson"))
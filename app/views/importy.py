@@ -0,0 +1,37 @@
+import io
+
+from flask import Blueprint, abort, jsonify, request
+
+from app.importer import (IMPORT_SPECS, DataImportError, detect_format,
+                          import_rows, read_rows)
+
+importy_bp = Blueprint("importy", __name__)
+
+
+@importy_bp.route("/<entity>", methods=["POST"])
+def import_view(entity: str):
+    if entity not in IMPORT_SPECS:
+        abort(404)
+    plik = request.files.get("plik")
+    if plik is None or not plik.filename:
+        return jsonify({"blad": "Brak pliku (pole plik)"}), 400
+
+    # Opcjonalny identyfikator źródła włącza punkt kontrolny, więc ponowne
+    # wysłanie tego samego pliku po przerwaniu importuje tylko brakujące wiersze
+    zrodlo = request.form.get("zrodlo")
+    try:
+        stream = io.TextIOWrapper(plik.stream, encoding="utf-8", newline="")
+        stats = import_rows(
+            entity, read_rows(stream, detect_format(plik.filename)),
+            checkpoint=f"{entity}:upload:{zrodlo}" if zrodlo else None,
+        )
+    except DataImportError as e:
+        return jsonify({"blad": str(e)}), 400
+
+    return jsonify({
+        "wczytane": stats.wczytane,
+        "zaimportowane": stats.zaimportowane,
+        "pominiete": stats.pominiete,
+        "bledne": stats.bledne,
+        "bledy": [{"wiersz": nr, "komunikat": msg} for nr, msg in stats.bledy],
+    })
@@ -1,18 +1,24 @@
-from flask import Blueprint, redirect, render_template, request, url_for
+from flask import (Blueprint, abort, current_app, flash, redirect,
+                   render_template, request, url_for)
 
+from app.http_cache import versioned
 from app.models import Inzynierowie
-from app.services import (create_record, get_all_sorted, get_by_id,
-                          update_record)
+from app.services import (EditConflictError, create_record, get_all_sorted,
+                          get_by_id, soft_delete, update_record)
 
 inzynierowie_bp = Blueprint("inzynierowie", __name__)
 
 
 @inzynierowie_bp.route("/")
+@versioned("inzynierowie")
 def inzynierowie_view():
     sortby = request.args.get("sort", "IdInzyniera")
     order = request.args.get("order", "asc")
+    cursor = request.args.get("cursor")
 
-    inzynierowie = get_all_sorted(Inzynierowie, sortby, order)
+    inzynierowie = get_all_sorted(
+        Inzynierowie, sortby, order, cursor, current_app.config["PER_PAGE"]
+    )
     context = {"inzynierowie": inzynierowie, "sort_by": sortby, "order": order}
     return render_template("inzynierowie.html", **context)
 
@@ -33,13 +39,27 @@ def dodaj_inzyniera_view():
 @inzynierowie_bp.route("/edytuj/<int:id_inzyniera>", methods=["GET", "POST"])
 def edytuj_inzyniera_view(id_inzyniera: int):
     inzynier = get_by_id(Inzynierowie, id_inzyniera)
+    if inzynier is None:
+        abort(404)
 
     if request.method == "POST":
-        update_record(
-            inzynier,
-            Imie=request.form.get("imie"),
-            Nazwisko=request.form.get("nazwisko"),
-        )
+        try:
+            update_record(
+                inzynier,
+                wersja=request.form.get("wersja", type=int),
+                Imie=request.form.get("imie"),
+                Nazwisko=request.form.get("nazwisko"),
+            )
+        except EditConflictError as e:
+            flash(str(e), "error")
+            return render_template("edytuj_inzyniera.html", inzynier=inzynier), 409
         return redirect(url_for("inzynierowie.inzynierowie_view"))
 
     return render_template("edytuj_inzyniera.html", inzynier=inzynier)
+
+
+@inzynierowie_bp.route("/usun/<int:id_inzyniera>", methods=["POST"])
+def usun_inzyniera_view(id_inzyniera: int):
+    if not soft_delete(Inzynierowie, id_inzyniera):
+        abort(404)
+    return redirect(url_for("inzynierowie.inzynierowie_view"))
@@ -1,25 +1,120 @@
-from flask import Blueprint, redirect, render_template, request, url_for, flash
-
-from app.models import Artysci, Inzynierowie, Sesje, Sprzet
-from app.services import (SessionData, create_session_with_equipment,
-                          get_all_sorted, get_by_id,
-                          get_session_details, get_sessions_sorted,
+import math
+from datetime import timedelta
+
+from flask import (Blueprint, abort, current_app, flash, jsonify, redirect,
+                   render_template, request, url_for)
+
+from app import async_services
+from app.http_cache import versioned
+from app.models import Sesje
+from app.options import form_options
+from app.scheduling import MAX_SESSION_DURATION, SchedulingError, SlotQuery
+from app.services import (DateRange, EditConflictError, SessionData,
+                          create_session_with_equipment,
+                          get_by_id, get_free_slots,
+                          get_session_details, get_sessions_details,
+                          get_sessions_sorted, soft_delete,
                           update_session_with_equipment, get_selected_sprzet_ids, safe_date_parse)
+from app.views import date_range_from_args, render_fragment
 
 sesje_bp = Blueprint("sesje", __name__)
 
+# Tabele czytane przez listę sesji i modal_detale.html
+SESSION_LIST_TABLES = ("sesje", "artysci", "inzynierowie")
+SESSION_DETAIL_TABLES = ("sesje", "artysci", "inzynierowie", "utwory", "sprzet", "sprzety_sesje")
+# Górna granica liczby sesji w jednym żądaniu /sesje/detale
+MAX_DETAIL_IDS = 100
+
+def _service(sync_fn):
+    # SERVICE_MODE="async": korutyna o tej samej nazwie z app/async_services.py
+    if current_app.config["SERVICE_MODE"] == "async":
+        return current_app.ensure_sync(getattr(async_services, sync_fn.__name__))
+    return sync_fn
+
+def _form_lists(artysta, inzynier, sprzet):
+    return {
+        "artysci": form_options("artysci", [artysta]),
+        "inzynierowie": form_options("inzynierowie", [inzynier]),
+        "sprzety": form_options("sprzet", sprzet),
+    }
+
+def _form_data_from_request():
+    return {
+        'artysta': request.form.get("artysta", ""),
+        'inzynier': request.form.get("inzynier", ""),
+        'termin_start': request.form.get("termin_start", ""),
+        'termin_stop': request.form.get("termin_stop", ""),
+        'sprzet': request.form.getlist("sprzet")
+    }
+
 @sesje_bp.route("/")
+@versioned(*SESSION_LIST_TABLES)
 def sesje_view():
     sortby = request.args.get("sort", "IdSesji")
     order = request.args.get("order", "asc")
-    sesje = get_sessions_sorted(sortby=sortby, order=order)
-    return render_template("sesje.html", sesje=sesje, sort_by=sortby, order=order)
+    cursor = request.args.get("cursor")
+
+    termin = DateRange()
+    try:
+        termin = date_range_from_args()
+    except ValueError as e:
+        flash(f'Nieprawidłowy format daty (użyj YYYY-MM-DD HH:MM), błąd: {str(e)}', 'error')
+
+    tabela = render_fragment("sesje_tabela.html", SESSION_LIST_TABLES, lambda: {
+        "sesje": _service(get_sessions_sorted)(
+            sortby=sortby, order=order, cursor=cursor,
+            per_page=current_app.config["PER_PAGE"], termin=termin),
+        "sort_by": sortby, "order": order,
+    })
+    context = {"tabela": tabela, "sort_by": sortby, "order": order,
+               "od": request.args.get("od", ""), "do": request.args.get("do", "")}
+    return render_template("sesje.html", **context)
 
 @sesje_bp.route("/<int:idsesji>")
+@versioned(*SESSION_DETAIL_TABLES)
 def sesja_details_view(idsesji: int):
-    sesja_details = get_session_details(idsesji)
+    sesja_details = _service(get_session_details)(idsesji)
     return render_template("modal_detale.html", sesja_details=sesja_details)
 
+@sesje_bp.route("/detale")
+@versioned(*SESSION_DETAIL_TABLES)
+def sesje_detale_view():
+    # Szczegóły wszystkich sesji widocznej strony jednym żądaniem (sesje.html)
+    ids = request.args.get("ids", "").split(",")
+    if len(ids) > MAX_DETAIL_IDS or not all(value.isdigit() for value in ids):
+        abort(400)
+    sesje = _service(get_sessions_details)([int(value) for value in ids])
+    return render_template("modal_detale_lista.html", sesje=sesje)
+
+@sesje_bp.route("/wolne-terminy")
+def wolne_terminy_view():
+    try:
+        godziny = request.args.get("godziny", type=float)
+        if godziny is None:
+            raise ValueError("Podaj czas trwania w godzinach (parametr godziny)")
+        max_godzin = MAX_SESSION_DURATION / timedelta(hours=1)
+        if not math.isfinite(godziny) or not 0 < godziny <= max_godzin:
+            raise ValueError(
+                f"Czas trwania musi mieścić się w przedziale (0, {max_godzin:g}] godzin")
+        query = SlotQuery(
+            duration=timedelta(hours=godziny),
+            window_start=safe_date_parse(request.args.get("od")),
+            window_end=safe_date_parse(request.args.get("do")),
+            idinzyniera=request.args.get("inzynier", type=int),
+            idartysty=request.args.get("artysta", type=int),
+            sprzet_ids=request.args.getlist("sprzet", type=int),
+        )
+        slots = get_free_slots(query)
+    except ValueError as e:
+        return jsonify({"blad": str(e)}), 400
+
+    return jsonify({
+        "wolne_terminy": [
+            {"od": start.isoformat(sep=" "), "do": stop.isoformat(sep=" ")}
+            for start, stop in slots
+        ]
+    })
+
 @sesje_bp.route("/dodaj", methods=["GET", "POST"])
 def dodaj_sesje_view():
     form_data = {}
@@ -38,28 +133,19 @@ def dodaj_sesje_view():
             session_data = SessionData(idartysty=idartysty, idinzyniera=idinzyniera,
                                      terminstart=terminstart, terminstop=terminstop,
                                      sprzet_ids=sprzet_ids)
-            create_session_with_equipment(session_data)
+            _service(create_session_with_equipment)(session_data)
             return redirect(url_for("sesje.sesje_view"))
 
+        except SchedulingError as e:
+            flash(str(e), 'error')
+            form_data = _form_data_from_request()
         except (ValueError, TypeError, IndexError) as e:
             flash(f'Nieprawidłowy format daty (użyj YYYY-MM-DD HH:MM), błąd: {str(e)}', 'error')
-            form_data = {
-                'artysta': request.form.get("artysta", ""),
-                'inzynier': request.form.get("inzynier", ""),
-                'termin_start': request.form.get("termin_start", ""),
-                'termin_stop': request.form.get("termin_stop", ""),
-                'sprzet': request.form.getlist("sprzet")
-            }
-
-    artysci = get_all_sorted(Artysci, "Nazwa", "asc")
-    inzynierowie = get_all_sorted(Inzynierowie, "Nazwisko", "asc")
-    sprzety = get_all_sorted(Sprzet, "Kategoria", "asc")
-    return render_template("dodaj_sesje.html",
-                           artysci=artysci,
-                           inzynierowie=inzynierowie,
-                           sprzety=sprzety,
-                           form_data=form_data
-                        )
+            form_data = _form_data_from_request()
+
+    lists = _form_lists(form_data.get("artysta"), form_data.get("inzynier"),
+                        form_data.get("sprzet", []))
+    return render_template("dodaj_sesje.html", form_data=form_data, **lists)
 
 @sesje_bp.route("/edytuj/<int:idsesji>", methods=["GET", "POST"])
 def edytuj_sesje_view(idsesji: int):
@@ -68,6 +154,7 @@ def edytuj_sesje_view(idsesji: int):
         return ("Not Found", 404)
 
     form_data = {}
+    status = 200
 
     if request.method == "POST":
         try:
@@ -85,34 +172,39 @@ def edytuj_sesje_view(idsesji: int):
                 sprzet_ids=[int(id) for id in request.form.getlist('sprzet')]
             )
 
-            updated = update_session_with_equipment(idsesji, session_data)
+            updated = _service(update_session_with_equipment)(
+                idsesji, session_data, request.form.get("wersja", type=int))
             if updated is None:
                 return ("Not Found", 404)
 
             return redirect(url_for("sesje.sesje_view"))
 
+        except EditConflictError as e:
+            # Formularz z aktualnymi danymi sesji i jej nową wersją
+            flash(str(e), 'error')
+            status = 409
+        except SchedulingError as e:
+            flash(str(e), 'error')
+            form_data = _form_data_from_request()
         except (ValueError, TypeError, IndexError) as e:
             flash(f'Nieprawidłowy format daty (użyj YYYY-MM-DD HH:MM), błąd: {str(e)}', 'error')
-            form_data = {
-                'artysta': request.form.get("artysta", ""),
-                'inzynier': request.form.get("inzynier", ""),
-                'termin_start': request.form.get("termin_start", ""),
-                'termin_stop': request.form.get("termin_stop", ""),
-                'sprzet': request.form.getlist("sprzet")
-            }
-
-    lists = {
-        'artysci': get_all_sorted(Artysci, "Nazwa", "asc"),
-        'inzynierowie': get_all_sorted(Inzynierowie, "Nazwisko", "asc"),
-        'sprzety': get_all_sorted(Sprzet, "Kategoria", "asc")
-    }
+            form_data = _form_data_from_request()
 
-    selected_sprzet_ids = get_selected_sprzet_ids(idsesji)
+    if form_data:
+        lists = _form_lists(form_data["artysta"], form_data["inzynier"], form_data["sprzet"])
+    else:
+        lists = _form_lists(sesja.IdArtysty, sesja.IdInzyniera, get_selected_sprzet_ids(idsesji))
 
     context = {
         "sesja": sesja,
-        "selected_sprzet_ids": selected_sprzet_ids,
         "form_data": form_data,
          **lists
     }
-    return render_template("edytuj_sesje.html", **context)
+    return render_template("edytuj_sesje.html", **context), status
+
+
+@sesje_bp.route("/usun/<int:idsesji>", methods=["POST"])
+def usun_sesje_view(idsesji: int):
+    if not soft_delete(Sesje, idsesji):
+        abort(404)
+    return redirect(url_for("sesje.sesje_view"))
@@ -1,20 +1,39 @@
-from flask import Blueprint, redirect, render_template, request, url_for
+from flask import (Blueprint, abort, current_app, redirect, render_template,
+                   request, url_for)
 
+from app.http_cache import versioned
 from app.models import Sprzet
-from app.services import create_record, get_all_sorted
+from app.services import (create_record, get_all_sorted, get_equipment_timeline,
+                          get_equipment_usage, soft_delete)
 
 sprzet_bp = Blueprint("sprzet", __name__)
 
+# Tabele czytane przez podsumowanie i historię użycia sprzętu
+EQUIPMENT_USAGE_TABLES = ("sprzet", "sprzety_sesje", "sesje", "artysci", "inzynierowie")
+
 
 @sprzet_bp.route("/")
+@versioned("sprzet")
 def sprzet_view():
     sortby = request.args.get("sort", "IdSprzetu")
     order = request.args.get("order", "asc")
+    cursor = request.args.get("cursor")
 
-    sprzety = get_all_sorted(Sprzet, sortby, order)
+    sprzety = get_all_sorted(Sprzet, sortby, order, cursor, current_app.config["PER_PAGE"])
     return render_template("sprzet.html", sprzety=sprzety, sort_by=sortby, order=order)
 
 
+@sprzet_bp.route("/<int:idsprzetu>")
+@versioned(*EQUIPMENT_USAGE_TABLES)
+def sprzet_details_view(idsprzetu: int):
+    uzycie = get_equipment_usage(idsprzetu)
+    if uzycie is None:
+        abort(404)
+    historia = get_equipment_timeline(idsprzetu, request.args.get("cursor"),
+                                      current_app.config["PER_PAGE"])
+    return render_template("sprzet_detale.html", uzycie=uzycie, historia=historia)
+
+
 @sprzet_bp.route("/dodaj", methods=["GET", "POST"])
 def dodaj_sprzet_view():
     if request.method == "POST":
@@ -27,3 +46,10 @@ def dodaj_sprzet_view():
         return redirect(url_for("sprzet.sprzet_view"))
 
     return render_template("dodaj_sprzet.html")
+
+
+@sprzet_bp.route("/usun/<int:idsprzetu>", methods=["POST"])
+def usun_sprzet_view(idsprzetu: int):
+    if not soft_delete(Sprzet, idsprzetu):
+        abort(404)
+    return redirect(url_for("sprzet.sprzet_view"))
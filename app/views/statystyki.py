@@ -0,0 +1,60 @@
+from datetime import date
+
+from flask import Blueprint, flash, jsonify, render_template, request
+
+from app.stats import (artist_stats, default_range, engineer_utilization,
+                       equipment_usage)
+
+statystyki_bp = Blueprint("statystyki", __name__)
+
+
+def _date_range():
+    od, do = default_range()
+    if request.args.get("od"):
+        od = date.fromisoformat(request.args["od"])
+    if request.args.get("do"):
+        do = date.fromisoformat(request.args["do"])
+    return od, do
+
+
+def _limit():
+    return max(1, min(request.args.get("limit", 20, type=int), 100))
+
+
+@statystyki_bp.route("/")
+def statystyki_view():
+    try:
+        od, do = _date_range()
+    except ValueError as e:
+        flash(f"Nieprawidłowy format daty (użyj YYYY-MM-DD), błąd: {e}", "error")
+        od, do = default_range()
+    context = {
+        "od": od, "do": do,
+        "inzynierowie": engineer_utilization(od, do),
+        "sprzet": equipment_usage(od, do, _limit()),
+        "artysci": artist_stats(_limit()),
+    }
+    return render_template("statystyki.html", **context)
+
+
+@statystyki_bp.route("/inzynierowie.json")
+def inzynierowie_json():
+    try:
+        od, do = _date_range()
+    except ValueError as e:
+        return jsonify({"blad": f"Nieprawidłowy format daty: {e}"}), 400
+    return jsonify(engineer_utilization(od, do))
+
+
+@statystyki_bp.route("/sprzet.json")
+def sprzet_json():
+    try:
+        od, do = _date_range()
+    except ValueError as e:
+        return jsonify({"blad": f"Nieprawidłowy format daty: {e}"}), 400
+    return jsonify(equipment_usage(od, do, _limit()))
+
+
+@statystyki_bp.route("/artysci.json")
+def artysci_json():
+    return jsonify(artist_stats(_limit()))
@@ -0,0 +1,37 @@
+from flask import Blueprint, abort, jsonify, render_template, request
+
+from app.http_cache import versioned
+from app.options import OPTION_LISTS, OPTIONS_PAGE, get_options
+from app.search import MAX_RESULTS, SEARCH_INDEXES, search, search_all
+
+szukaj_bp = Blueprint("szukaj", __name__)
+
+NAGLOWKI = {"artysci": "Artyści", "inzynierowie": "Inżynierowie", "sprzet": "Sprzęt",
+            "utwory": "Utwory"}
+
+
+@szukaj_bp.route("/")
+def szukaj_view():
+    q = request.args.get("q", "").strip()
+    wyniki = {entity: search(entity, q) for entity in SEARCH_INDEXES} if q else {}
+    return render_template("szukaj.html", q=q, wyniki=wyniki, naglowki=NAGLOWKI)
+
+
+@szukaj_bp.route("/podpowiedzi")
+def podpowiedzi_view():
+    limit = request.args.get("limit", 10, type=int)
+    return jsonify(search_all(request.args.get("q", ""), max(1, min(limit, MAX_RESULTS))))
+
+
+@szukaj_bp.route("/opcje/<encja>")
+@versioned("artysci", "inzynierowie", "sprzet", "sesje")
+def opcje_view(encja):
+    if encja not in OPTION_LISTS:
+        abort(404)
+    page = get_options(encja, request.args.get("q", ""), request.args.get("cursor"),
+                       max(1, request.args.get("limit", OPTIONS_PAGE, type=int)),
+                       request.args.get("artysta", type=int))
+    # Sesja niesie swojego artystę: formularz utworu ustawia go po wyborze sesji
+    opcje = [{"id": row["id"], "etykieta": row["etykieta"],
+              **({"artysta": row["IdArtysty"]} if encja == "sesje" else {})} for row in page]
+    return jsonify({"opcje": opcje, "next_cursor": page.next_cursor})
@@ -1,20 +1,31 @@
-from flask import Blueprint, redirect, render_template, request, url_for
+from flask import (Blueprint, abort, current_app, redirect, render_template,
+                   request, url_for)
 
-from app.models import Artysci, Utwory
-from app.services import (create_record, get_all_sorted,
-                          get_sesje_for_utwor_form, get_utwory_sorted)
+from app.http_cache import versioned
+from app.models import Utwory
+from app.options import form_options
+from app.services import create_record, get_utwory_sorted, soft_delete
+from app.views import render_fragment
 
 utwory_bp = Blueprint("utwory", __name__)
 
+UTWORY_LIST_TABLES = ("utwory", "artysci", "sesje")
+
 
 @utwory_bp.route("/")
+@versioned(*UTWORY_LIST_TABLES)
 def utwory_view():
     sortby = request.args.get("sort", "IdUtworu")
     order = request.args.get("order", "asc")
+    cursor = request.args.get("cursor")
 
-    utwory = get_utwory_sorted(sortby=sortby, order=order)
+    tabela = render_fragment("utwory_tabela.html", UTWORY_LIST_TABLES, lambda: {
+        "utwory": get_utwory_sorted(sortby=sortby, order=order, cursor=cursor,
+                                    per_page=current_app.config["PER_PAGE"]),
+        "sort_by": sortby, "order": order,
+    })
 
-    return render_template("utwory.html", utwory=utwory, sort_by=sortby, order=order)
+    return render_template("utwory.html", tabela=tabela)
 
 
 @utwory_bp.route("/dodaj", methods=["GET", "POST"])
@@ -28,6 +39,12 @@ def dodaj_utwor_view():
         )
         return redirect(url_for("utwory.utwory_view"))
 
-    artysci = get_all_sorted(Artysci, "Nazwa", "asc")
-    sesje = get_sesje_for_utwor_form()
-    return render_template("dodaj_utwor.html", artysci=artysci, sesje=sesje)
+    return render_template("dodaj_utwor.html", artysci=form_options("artysci"),
+                           sesje=form_options("sesje"))
+
+
+@utwory_bp.route("/usun/<int:idutworu>", methods=["POST"])
+def usun_utwor_view(idutworu: int):
+    if not soft_delete(Utwory, idutworu):
+        abort(404)
+    return redirect(url_for("utwory.utwory_view"))
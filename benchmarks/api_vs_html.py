@@ -0,0 +1,59 @@
+"""Czas odpowiedzi i szczyt alokacji: API JSON z projekcją kolumn kontra strony HTML.
+
+Uruchomienie: python -m benchmarks.api_vs_html --rows 20000 --requests 200 --page 500
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from app import create_app, database
+from benchmarks.form_latency import seed
+
+
+def measure(call, n_requests):
+    timings = []
+    for _ in range(n_requests):
+        started = time.perf_counter()
+        resp = call()
+        timings.append((time.perf_counter() - started) * 1000)
+        assert resp.status_code == 200, resp.status_code
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), sorted(timings)[int(len(timings) * 0.95)], peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--page", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'b.db')}",
+                          "DB_PROFILE": "prod", "PER_PAGE": args.page})
+        database.init_db()
+        seed(args.rows)
+        client = app.test_client()
+        fields = "IdSesji,TerminStart,TerminStop,NazwaArtysty,NazwiskoInzyniera"
+
+        cases = {
+            "GET /sesje/": lambda: client.get("/sesje/"),
+            "GET /api/v1/sesje": lambda: client.get(f"/api/v1/sesje?fields={fields}"),
+            "GET /sesje/1": lambda: client.get("/sesje/1"),
+            "GET /api/v1/sesje/1": lambda: client.get("/api/v1/sesje/1"),
+        }
+        for name, call in cases.items():
+            median, p95, peak = measure(call, args.requests)
+            print(f"{name:>20}: mediana {median:7.2f} ms, p95 {p95:7.2f} ms, "
+                  f"szczyt pamięci {peak / 1024:8.1f} KiB")
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Przepustowość importu CSV/NDJSON (wiersze/s) do pliku SQLite.
+
+Uruchomienie: python -m benchmarks.bulk_import --rows 500000 --profile prod
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app import create_app, database
+from app.importer import import_rows, read_rows
+
+
+def write_sources(tmp, n_rows, fmt):
+    start = datetime(2020, 1, 1, 9, 0)
+    sources = {
+        "artysci": [
+            {"IdArtysty": i, "Nazwa": f"Artysta {i}", "Imie": "Jan", "Nazwisko": f"K{i}"}
+            for i in range(1, 1001)
+        ],
+        "inzynierowie": [
+            {"IdInzyniera": i, "Imie": "Adam", "Nazwisko": f"N{i}"} for i in range(1, 51)
+        ],
+        "sesje": (
+            {
+                "IdSesji": i,
+                "IdArtysty": i % 1000 + 1,
+                "IdInzyniera": i % 50 + 1,
+                "TerminStart": (start + timedelta(hours=3 * i)).isoformat(sep=" "),
+                "TerminStop": (start + timedelta(hours=3 * i + 2)).isoformat(sep=" "),
+            }
+            for i in range(1, n_rows + 1)
+        ),
+    }
+    paths = {}
+    for entity, rows in sources.items():
+        path = os.path.join(tmp, f"{entity}.{fmt}")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if fmt == "csv":
+                rows = iter(rows)
+                first = next(rows)
+                writer = csv.DictWriter(f, fieldnames=list(first))
+                writer.writeheader()
+                writer.writerow(first)
+                writer.writerows(rows)
+            else:
+                f.writelines(json.dumps(row) + "\n" for row in rows)
+        paths[entity] = path
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--profile", default="prod")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--defer-indexes", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_sources(tmp, args.rows, args.format)
+        create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                    "DB_PROFILE": args.profile})
+        database.engine.echo = False
+        database.init_db()
+
+        for entity in ("artysci", "inzynierowie", "sesje"):
+            with open(paths[entity], encoding="utf-8", newline="") as f:
+                started = time.perf_counter()
+                stats = import_rows(entity, read_rows(f, args.format), args.chunk_size,
+                                     defer_indexes=args.defer_indexes)
+                elapsed = time.perf_counter() - started
+            print(f"{entity:>12}: {stats.zaimportowane:>8} wierszy w {elapsed:.2f} s "
+                  f"({stats.zaimportowane / elapsed:,.0f} wierszy/s, błędnych {stats.bledne})")
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Przepustowość współbieżnych odczytów /sesje/ dla profili silnika bazy.
+
+Uruchomienie: python -m benchmarks.concurrent_reads --profiles dev prod
+"""
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app, database
+from app.models import Artysci, Inzynierowie, Sesje
+
+
+def seed(n_sessions):
+    start = datetime(2020, 1, 1, 9, 0)
+    with database.engine.begin() as conn:
+        conn.execute(insert(Artysci), [
+            {"IdArtysty": i, "Nazwa": f"Artysta {i:04d}", "Imie": "Jan", "Nazwisko": f"K{i}"}
+            for i in range(1, 201)
+        ])
+        conn.execute(insert(Inzynierowie), [
+            {"IdInzyniera": i, "Imie": "Adam", "Nazwisko": f"N{i}"} for i in range(1, 21)
+        ])
+        conn.execute(insert(Sesje), [
+            {
+                "IdArtysty": i % 200 + 1,
+                "IdInzyniera": i % 20 + 1,
+                "TerminStart": start + timedelta(hours=3 * i),
+                "TerminStop": start + timedelta(hours=3 * i + 2),
+            }
+            for i in range(n_sessions)
+        ])
+        conn.exec_driver_sql("ANALYZE")
+
+
+def writer(stop_event):
+    # Równoległy zapis, który w trybie rollback-journal blokuje czytelników
+    i = 0
+    while not stop_event.is_set():
+        with database.engine.begin() as conn:
+            conn.execute(insert(Sesje), {"IdArtysty": 1, "IdInzyniera": 1,
+                                         "TerminStart": datetime(2030, 1, 1) + timedelta(hours=i)})
+        i += 1
+        time.sleep(0.005)
+
+
+def run_profile(profile, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "DB_PROFILE": profile})
+        database.init_db()
+        seed(args.sessions)
+
+        errors = []
+
+        def reader():
+            client = app.test_client()
+            for _ in range(args.requests):
+                resp = client.get("/sesje/?sort=NazwaArtysty&order=asc")
+                if resp.status_code != 200:
+                    errors.append(resp.status_code)
+
+        stop_event = threading.Event()
+        threads = [threading.Thread(target=reader) for _ in range(args.threads)]
+        write_thread = threading.Thread(target=writer, args=(stop_event,))
+
+        started = time.perf_counter()
+        write_thread.start()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        stop_event.set()
+        write_thread.join()
+        database.engine.dispose()
+
+    total = args.threads * args.requests
+    return {"profile": profile, "requests": total, "seconds": round(elapsed, 3),
+            "req_per_s": round(total / elapsed, 1), "errors": len(errors)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", nargs="+", default=["dev", "prod"])
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    results = []
+    echo_logger = logging.getLogger("sqlalchemy.engine.Engine")
+    for profile in args.profiles:
+        # echo=True w profilu dev nadal formatuje każde zapytanie, ale nie zaśmieca wyniku
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            streams = [handler.setStream(devnull) for handler in echo_logger.handlers]
+            try:
+                results.append(run_profile(profile, args))
+            finally:
+                for handler, stream in zip(echo_logger.handlers, streams):
+                    handler.setStream(stream)
+
+    for result in results:
+        print(f"{result['profile']:>5}: {result['req_per_s']:>8} req/s "
+              f"({result['requests']} żądań w {result['seconds']} s, błędy: {result['errors']})")
+
+
+if __name__ == "__main__":
+    main()
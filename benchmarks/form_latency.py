@@ -0,0 +1,84 @@
+"""Opóźnienie formularzy dodawania i edycji (GET i POST) na pliku SQLite.
+
+Uruchomienie: python -m benchmarks.form_latency --requests 300
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app, database
+from app.models import Artysci, Inzynierowie, Sesje, Sprzet
+
+
+def seed(n_rows):
+    start = datetime(2020, 1, 1, 9, 0)
+    with database.engine.begin() as conn:
+        conn.execute(insert(Artysci), [{"Nazwa": f"Artysta {i}"} for i in range(n_rows)])
+        conn.execute(insert(Inzynierowie), [
+            {"Imie": "Adam", "Nazwisko": f"N{i}"} for i in range(n_rows)
+        ])
+        conn.execute(insert(Sprzet), [
+            {"Producent": "P", "Model": f"M{i}", "Kategoria": "Mikrofony"} for i in range(n_rows)
+        ])
+        conn.execute(insert(Sesje), [
+            {"IdArtysty": i % n_rows + 1, "IdInzyniera": i % n_rows + 1,
+             "TerminStart": start + timedelta(hours=3 * i),
+             "TerminStop": start + timedelta(hours=3 * i + 2)}
+            for i in range(n_rows)
+        ])
+
+
+def measure(call, n_requests):
+    timings = []
+    for i in range(n_requests):
+        started = time.perf_counter()
+        resp = call(i)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert resp.status_code in (200, 302), resp.status_code
+    return statistics.median(timings), sorted(timings)[int(len(timings) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'b.db')}",
+                          "DB_PROFILE": "prod"})
+        database.init_db()
+        seed(args.rows)
+        client = app.test_client()
+        base_day = datetime(2030, 1, 1, 9, 0)
+
+        def edit_post(i):
+            start = base_day + timedelta(days=i)
+            return client.post("/sesje/edytuj/1", data={
+                "artysta": "1", "inzynier": "1", "sprzet": ["1", "2"],
+                "termin_start": start.strftime("%Y-%m-%d %H:%M"),
+                "termin_stop": (start + timedelta(hours=2)).strftime("%Y-%m-%d %H:%M"),
+            })
+
+        cases = {
+            "GET /sesje/dodaj": lambda i: client.get("/sesje/dodaj"),
+            "GET /sesje/edytuj/1": lambda i: client.get("/sesje/edytuj/1"),
+            "GET /utwory/dodaj": lambda i: client.get("/utwory/dodaj"),
+            "GET /artysci/edytuj/1": lambda i: client.get("/artysci/edytuj/1"),
+            "POST /artysci/edytuj/1": lambda i: client.post(
+                "/artysci/edytuj/1", data={"nazwa": f"Artysta {i}"}),
+            "POST /sesje/edytuj/1": edit_post,
+        }
+        for name, call in cases.items():
+            median, p95 = measure(call, args.requests)
+            print(f"{name:>24}: mediana {median:6.2f} ms, p95 {p95:6.2f} ms")
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Syntetyczne dane studia w dowolnej skali, o rozkładach zbliżonych do rzeczywistych.
+
+Uruchomienie: python -m benchmarks.generator --artysci 10000 --db studio_bench.db
+"""
+import argparse
+import bisect
+import itertools
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app, database
+from app.models import Artysci, Inzynierowie, Sesje, Sprzet, SprzetySesje, Utwory
+
+SYLABY = ["ka", "ło", "mi", "żu", "ra", "sze", "no", "wą", "ty", "ść", "be", "lo", "gra", "de",
+          "an", "to", "ri", "ma"]
+KATEGORIE = {"Mikrofony": 5, "Przedwzmacniacze": 2, "Procesory": 2, "Instrumenty": 3,
+             "Monitory": 1, "Interfejsy": 1}
+PRODUCENCI = ["Neumann", "Shure", "AKG", "Universal Audio", "Focusrite", "Yamaha", "Fender",
+              "Roland", "Genelec", "Sennheiser"]
+BATCH = 20000
+
+
+@dataclass
+class Skala:
+    artysci: int
+    # Wartości pochodne, jeśli nie podano: studio ma kilkudziesięciu artystów na inżyniera
+    # i kilka do kilkunastu sesji na artystę
+    inzynierowie: int | None = None
+    sprzet: int | None = None
+    sesje: int | None = None
+    utwory_na_sesje: float = 1.5
+
+    def __post_init__(self):
+        self.inzynierowie = self.inzynierowie or max(3, self.artysci // 50)
+        self.sprzet = self.sprzet or max(20, self.artysci // 10)
+        self.sesje = self.sesje or self.artysci * 8
+
+
+def _slowo(rng):
+    return "".join(rng.choice(SYLABY) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def _zipf_weights(n, s=0.9):
+    # Popularność artystów i sprzętu: kilku bardzo częstych, długi ogon rzadkich
+    return list(itertools.accumulate(1 / (i + 1) ** s for i in range(n)))
+
+
+def _choose(rng, cumulative):
+    return bisect.bisect(cumulative, rng.random() * cumulative[-1])
+
+
+def _poisson(rng, mean):
+    # Algorytm Knutha; średnie są małe (kilka utworów), więc pętla jest krótka
+    limit, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def _insert_batches(conn, model, rows):
+    batch = list(itertools.islice(rows, BATCH))
+    while batch:
+        conn.execute(insert(model), batch)
+        batch = list(itertools.islice(rows, BATCH))
+
+
+def _artysci(rng, n):
+    for _ in range(n):
+        yield {"Nazwa": f"{_slowo(rng)} {_slowo(rng)}" if rng.random() < 0.7 else _slowo(rng),
+               "Imie": _slowo(rng), "Nazwisko": _slowo(rng)}
+
+
+def _sprzet(rng, n):
+    kategorie = [k for k, waga in KATEGORIE.items() for _ in range(waga)]
+    for i in range(n):
+        yield {"Producent": rng.choice(PRODUCENCI), "Model": f"{_slowo(rng)[:3].upper()}-{i}",
+               "Kategoria": rng.choice(kategorie)}
+
+
+def _terminy(rng, skala: Skala, start: datetime):
+    # Każdy inżynier ma własny kalendarz: początek w dni robocze 9-17, bez nakładania się
+    kalendarze = [start] * skala.inzynierowie
+    for _ in range(skala.sesje):
+        idx = rng.randrange(skala.inzynierowie)
+        poczatek = kalendarze[idx] + timedelta(hours=rng.choice((0, 0, 1, 2, 18, 42)))
+        if poczatek.hour < 9 or poczatek.hour > 17:
+            poczatek = (poczatek + timedelta(days=1)).replace(hour=9)
+        while poczatek.weekday() >= 5:
+            poczatek += timedelta(days=1)
+        koniec = poczatek + timedelta(hours=rng.choice((2, 3, 4, 4, 6, 8)))
+        kalendarze[idx] = koniec
+        yield idx + 1, poczatek, koniec
+
+
+def generate(skala: Skala, seed: int = 0, start: datetime = datetime(2020, 1, 6, 9, 0)):
+    """Wstawia dane do bieżącej bazy (database.engine) i zwraca liczby wierszy."""
+    rng = random.Random(seed)
+    popularnosc_artystow = _zipf_weights(skala.artysci)
+    popularnosc_sprzetu = _zipf_weights(skala.sprzet, s=0.7)
+    sesje, utwory, powiazania = [], [], []
+    for id_sesji, (id_inzyniera, poczatek, koniec) in enumerate(_terminy(rng, skala, start), 1):
+        id_artysty = _choose(rng, popularnosc_artystow) + 1
+        sesje.append({"IdSesji": id_sesji, "IdArtysty": id_artysty, "IdInzyniera": id_inzyniera,
+                      "TerminStart": poczatek, "TerminStop": koniec})
+        utwory.extend({"IdArtysty": id_artysty, "IdSesji": id_sesji,
+                       "Tytul": f"{_slowo(rng)} {_slowo(rng)}"}
+                      for _ in range(_poisson(rng, skala.utwory_na_sesje)))
+        powiazania.extend({"IdSesji": id_sesji, "IdSprzetu": id_sprzetu} for id_sprzetu in {
+            _choose(rng, popularnosc_sprzetu) + 1 for _ in range(rng.randint(1, 6))})
+
+    with database.engine.begin() as conn:
+        _insert_batches(conn, Artysci, _artysci(rng, skala.artysci))
+        _insert_batches(conn, Inzynierowie, ({"Imie": _slowo(rng), "Nazwisko": _slowo(rng)}
+                                             for _ in range(skala.inzynierowie)))
+        _insert_batches(conn, Sprzet, _sprzet(rng, skala.sprzet))
+        _insert_batches(conn, Sesje, iter(sesje))
+        _insert_batches(conn, Utwory, iter(utwory))
+        _insert_batches(conn, SprzetySesje, iter(powiazania))
+        conn.exec_driver_sql("ANALYZE")
+    return {"artysci": skala.artysci, "inzynierowie": skala.inzynierowie,
+            "sprzet": skala.sprzet, "sesje": len(sesje), "utwory": len(utwory),
+            "sprzety_sesje": len(powiazania)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--artysci", type=int, default=10000)
+    parser.add_argument("--sesje", type=int, help="Domyślnie 8 na artystę")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", default="studio_bench.db")
+    args = parser.parse_args()
+
+    create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{args.db}", "DB_PROFILE": "prod"})
+    database.init_db()
+    started = time.perf_counter()
+    liczby = generate(Skala(args.artysci, sesje=args.sesje), seed=args.seed)
+    print(f"Wygenerowano w {time.perf_counter() - started:.1f} s: {liczby}")
+    database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Czas list /sesje/ i /utwory/ z cache wyrenderowanych tabel i bez niego.
+
+Uruchomienie: python -m benchmarks.list_fragments --rows 20000 --per-page 500 --requests 200
+"""
+import argparse
+import os
+import tempfile
+
+from app import create_app, database
+from app.services import fragment_cache
+from benchmarks.generator import Skala, generate
+from benchmarks.stats_dashboard import measure
+
+# Kilka wariantów sortowania, między którymi przełącza się użytkownik
+URLS = ["/sesje/", "/sesje/?sort=NazwaArtysty&order=desc", "/utwory/",
+        "/utwory/?sort=Tytul&order=asc"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--per-page", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'l.db')}",
+                          "DB_PROFILE": "prod", "PER_PAGE": args.per_page})
+        database.init_db()
+        generate(Skala(max(1, args.rows // 8), sesje=args.rows))
+        client = app.test_client()
+
+        for wlaczony in (False, True):
+            app.config["FRAGMENT_CACHE"] = wlaczony
+            fragment_cache.clear()
+            for url in URLS:
+                median, p95 = measure(client, url, args.requests)
+                print(f"cache {'tak' if wlaczony else 'nie':>3} {url:>38}: "
+                      f"mediana {median:7.2f} ms, p95 {p95:7.2f} ms")
+        print(f"Statystyki cache: {fragment_cache.stats()}")
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
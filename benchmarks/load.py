@@ -0,0 +1,156 @@
+"""Współbieżne obciążenie HTTP wszystkich głównych tras aplikacji (czysty Python, bez locusta).
+
+Bez --url uruchamia aplikację z run.py (create_app) na wygenerowanej bazie w wątku serwera
+werkzeug. Z --url obciąża już działający serwer, np. python run.py albo waitress.
+
+Uruchomienie: python -m benchmarks.load --artysci 5000 --watki 8 --czas 20
+"""
+import argparse
+import http.client
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from werkzeug.serving import make_server
+
+from app import create_app, database
+from benchmarks.generator import Skala, generate
+from benchmarks.results import summarize
+
+# (etykieta, szablon adresu, waga): mieszanka zbliżona do pracy recepcji studia
+TRASY = [
+    ("GET /sesje/", "/sesje/", 10),
+    ("GET /sesje/?sort", "/sesje/?sort=NazwaArtysty&order=desc", 4),
+    ("GET /sesje/<id>", "/sesje/{sesja}", 12),
+    ("GET /sesje/?od&do", "/sesje/?od=2020-06-01&do=2020-07-01", 3),
+    ("GET /artysci/", "/artysci/", 6),
+    ("GET /artysci/utwory/<id>", "/artysci/utwory/{artysta}", 8),
+    ("GET /utwory/", "/utwory/?sort=Tytul", 4),
+    ("GET /inzynierowie/", "/inzynierowie/", 2),
+    ("GET /sprzet/", "/sprzet/", 2),
+    ("GET /sesje/dodaj", "/sesje/dodaj", 3),
+    ("GET /sesje/edytuj/<id>", "/sesje/edytuj/{sesja}", 2),
+    ("GET /sesje/wolne-terminy",
+     "/sesje/wolne-terminy?godziny=3&od=2021-03-01+09:00&do=2021-03-08+21:00&inzynier=1", 1),
+    ("GET /szukaj/podpowiedzi", "/szukaj/podpowiedzi?q={prefiks}", 6),
+    ("GET /api/v1/sesje", "/api/v1/sesje?limit=100&fields=IdSesji,NazwaArtysty,TerminStart", 3),
+    ("GET /statystyki/", "/statystyki/", 1),
+]
+PREFIKSY = ["ka", "mi", "ra", "sze", "lo", "gra", "an", "to"]
+
+
+def _adres(szablon, rng, liczby):
+    return szablon.format(sesja=rng.randint(1, liczby["sesje"]),
+                          artysta=rng.randint(1, liczby["artysci"]),
+                          prefiks=rng.choice(PREFIKSY))
+
+
+@dataclass
+class Przebieg:
+    koniec: float
+    pomiary: defaultdict = field(default_factory=lambda: defaultdict(list))
+    bledy: defaultdict = field(default_factory=lambda: defaultdict(int))
+
+
+def worker(base_url, liczby, seed, przebieg: Przebieg):
+    rng = random.Random(seed)
+    czesci = urlsplit(base_url)
+    conn = http.client.HTTPConnection(czesci.hostname, czesci.port, timeout=30)
+    wagi = [waga for _, _, waga in TRASY]
+    while time.perf_counter() < przebieg.koniec:
+        etykieta, szablon, _ = rng.choices(TRASY, weights=wagi)[0]
+        started = time.perf_counter()
+        try:
+            conn.request("GET", czesci.path.rstrip("/") + _adres(szablon, rng, liczby))
+            resp = conn.getresponse()
+            resp.read()
+            status = resp.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            status = None
+        przebieg.pomiary[etykieta].append((time.perf_counter() - started) * 1000)
+        if status is None or status >= 400:
+            przebieg.bledy[etykieta] += 1
+    conn.close()
+
+
+def run(base_url, liczby, watki, czas):
+    przebieg = Przebieg(time.perf_counter() + czas)
+    threads = [threading.Thread(target=worker, args=(base_url, liczby, i, przebieg))
+               for i in range(watki)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    wyniki = {f"http.{name}": {**summarize(timings), "bledy": przebieg.bledy[name]}
+              for name, timings in sorted(przebieg.pomiary.items())}
+    wszystkie = [t for timings in przebieg.pomiary.values() for t in timings]
+    wyniki["http.razem"] = {"zadania": len(wszystkie), "req_s": round(len(wszystkie) / elapsed, 1),
+                            "bledy": sum(przebieg.bledy.values()), "watki": watki,
+                            "p99_ms": summarize(wszystkie)["p99_ms"]}
+    return wyniki
+
+
+class LocalServer:
+    """Aplikacja z run.py (create_app) na podanej bazie, serwowana przez werkzeug w wątku."""
+
+    def __init__(self, database_uri):
+        app = create_app({"SQLALCHEMY_DATABASE_URI": database_uri, "DB_PROFILE": "prod"})
+        # Log każdego żądania na konsolę zaniżałby przepustowość
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self._thread.join()
+
+
+def print_results(wyniki):
+    for name, wynik in wyniki.items():
+        if "mediana_ms" in wynik:
+            print(f"{name:>34}: {wynik['n']:>6} żądań, mediana {wynik['mediana_ms']:8.2f} ms, "
+                  f"p95 {wynik['p95_ms']:8.2f} ms, błędy {wynik['bledy']}")
+    razem = wyniki["http.razem"]
+    print(f"Razem: {razem['zadania']} żądań, {razem['req_s']} req/s, błędy {razem['bledy']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="Adres działającego serwera; wymaga --sesje i --artysci "
+                                      "zgodnych z jego bazą")
+    parser.add_argument("--artysci", type=int, default=5000)
+    parser.add_argument("--sesje", type=int)
+    parser.add_argument("--watki", type=int, default=8)
+    parser.add_argument("--czas", type=float, default=20, help="Czas obciążenia w sekundach")
+    args = parser.parse_args()
+
+    if args.url:
+        liczby = {"artysci": args.artysci, "sesje": args.sesje or args.artysci * 8}
+        print_results(run(args.url, liczby, args.watki, args.czas))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with LocalServer(f"sqlite:///{os.path.join(tmp, 'load.db')}") as server:
+            database.init_db()
+            liczby = generate(Skala(args.artysci, sesje=args.sesje))
+            print_results(run(server.url, liczby, args.watki, args.czas))
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
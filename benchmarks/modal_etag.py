@@ -0,0 +1,66 @@
+"""Powtórne otwieranie modali (/sesje/<id>, /artysci/utwory/<id>) z ETag i bez.
+
+Uruchomienie: python -m benchmarks.modal_etag --rows 10000 --requests 500
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import insert
+
+from app import create_app, database
+from app.models import SprzetySesje, Utwory
+from benchmarks.form_latency import seed
+
+# Modale otwierane na zmianę, jak przy klikaniu kilku wierszy listy
+OTWARTE = 20
+
+
+def measure(client, urls, n_requests, etags=None):
+    timings = []
+    for i in range(n_requests):
+        url = urls[i % len(urls)]
+        headers = {"If-None-Match": etags[url]} if etags else {}
+        started = time.perf_counter()
+        resp = client.get(url, headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert resp.status_code == (304 if etags else 200), resp.status_code
+    return statistics.median(timings), sorted(timings)[int(len(timings) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'm.db')}",
+                          "DB_PROFILE": "prod"})
+        database.init_db()
+        seed(args.rows)
+        with database.engine.begin() as conn:
+            conn.execute(insert(Utwory), [
+                {"IdArtysty": i % args.rows + 1, "IdSesji": i % args.rows + 1, "Tytul": f"U{i}"}
+                for i in range(args.rows * 3)
+            ])
+            conn.execute(insert(SprzetySesje), [
+                {"IdSesji": i + 1, "IdSprzetu": (i + k) % args.rows + 1}
+                for i in range(args.rows) for k in range(3)
+            ])
+        client = app.test_client()
+
+        for nazwa, szablon in (("modal sesji", "/sesje/{}"),
+                               ("modal utworów", "/artysci/utwory/{}")):
+            urls = [szablon.format(i + 1) for i in range(OTWARTE)]
+            etags = {url: client.get(url).headers["ETag"] for url in urls}
+            for tryb, naglowki in (("bez ETag", None), ("If-None-Match", etags)):
+                median, p95 = measure(client, urls, args.requests, naglowki)
+                print(f"{nazwa:>14}, {tryb:>13}: mediana {median:6.2f} ms, p95 {p95:6.2f} ms")
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Usunięcie artysty z bardzo dużą liczbą sesji: oznaczenie Usunieto i trwałe flask purge.
+
+Porównuje najdłuższą transakcję (czas blokady zapisu) przy usuwaniu wszystkiego naraz
+i paczkami. Uruchomienie: python -m benchmarks.purge --sessions 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app, database
+from app.models import Artysci, Inzynierowie, Sesje, Sprzet, SprzetySesje, Utwory
+from app.purge import DEFAULT_CHUNK_SIZE, purge_deleted
+from app.services import soft_delete
+
+
+def seed(n_sessions):
+    start = datetime(2020, 1, 1, 9, 0)
+    with database.engine.begin() as conn:
+        conn.execute(insert(Artysci), [{"Nazwa": "Usuwany"}, {"Nazwa": "Zostaje"}])
+        conn.execute(insert(Inzynierowie), [{"Imie": "Adam", "Nazwisko": "N"}])
+        conn.execute(insert(Sprzet), [{"Producent": "P", "Model": f"M{i}"} for i in range(10)])
+        conn.execute(insert(Sesje), [
+            {"IdArtysty": 1 if i % 100 else 2, "IdInzyniera": 1,
+             "TerminStart": start + timedelta(hours=3 * i),
+             "TerminStop": start + timedelta(hours=3 * i + 2)}
+            for i in range(n_sessions)
+        ])
+        conn.execute(insert(Utwory), [
+            {"IdArtysty": 1 if i % 100 else 2, "IdSesji": i + 1, "Tytul": f"U{i}"}
+            for i in range(n_sessions)
+        ])
+        conn.execute(insert(SprzetySesje), [
+            {"IdSesji": i + 1, "IdSprzetu": i % 10 + 1} for i in range(n_sessions)
+        ])
+
+
+def run(n_sessions, chunk_size):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'p.db')}",
+                          "DB_PROFILE": "prod"})
+        database.init_db()
+        seed(n_sessions)
+        with app.app_context():
+            started = time.perf_counter()
+            soft_delete(Artysci, 1)
+            oznaczenie = time.perf_counter() - started
+        started = time.perf_counter()
+        stats = purge_deleted(chunk_size=chunk_size)
+        purge = time.perf_counter() - started
+        database.engine.dispose()
+    return oznaczenie, purge, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100000)
+    args = parser.parse_args()
+
+    for nazwa, chunk_size in (("jedna transakcja", args.sessions * 2),
+                              ("paczki", DEFAULT_CHUNK_SIZE)):
+        oznaczenie, purge, stats = run(args.sessions, chunk_size)
+        print(f"{nazwa:>16}: oznaczenie {oznaczenie * 1000:7.0f} ms, "
+              f"purge {purge * 1000:7.0f} ms w {stats.transakcje:3d} transakcjach, "
+              f"najdłuższa {stats.najdluzsza * 1000:6.0f} ms, "
+              f"usunięto {sum(stats.usuniete.values())} wierszy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Zapis wyników pomiarów do JSON i porównanie z zapisaną linią bazową.
+
+Uruchomienie: python -m benchmarks.results wyniki.json --baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+
+# Domyślny próg regresji: mediana wolniejsza o ponad 25% względem linii bazowej
+DEFAULT_THRESHOLD = 0.25
+# Różnice poniżej tej wartości (ms) to szum pomiaru nawet przy dużym procencie
+MIN_DELTA_MS = 0.2
+
+
+def summarize(timings_ms):
+    ordered = sorted(timings_ms)
+    return {"n": len(ordered), "mediana_ms": round(statistics.median(ordered), 3),
+            "p95_ms": round(ordered[int(len(ordered) * 0.95)], 3),
+            "p99_ms": round(ordered[int(len(ordered) * 0.99)], 3),
+            "max_ms": round(ordered[-1], 3)}
+
+
+def metadata(**extra):
+    return {"czas": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version, "platforma": platform.platform(), **extra}
+
+
+def save(path, meta, wyniki):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "wyniki": wyniki}, f, ensure_ascii=False, indent=2,
+                  sort_keys=True)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Pomiary, których mediana wzrosła ponad próg; brakujące w linii bazowej są pomijane."""
+    regresje = []
+    for name, wynik in sorted(current["wyniki"].items()):
+        bazowy = baseline["wyniki"].get(name)
+        if bazowy is None or "mediana_ms" not in wynik:
+            continue
+        teraz, przed = wynik["mediana_ms"], bazowy["mediana_ms"]
+        if teraz - przed > MIN_DELTA_MS and teraz > przed * (1 + threshold):
+            regresje.append({"pomiar": name, "przed_ms": przed, "teraz_ms": teraz,
+                             "zmiana": round(teraz / przed - 1, 3) if przed else None})
+    return regresje
+
+
+def report(regresje, threshold=DEFAULT_THRESHOLD):
+    if not regresje:
+        print(f"Brak regresji powyżej {threshold:.0%}.")
+        return
+    print(f"Regresje powyżej {threshold:.0%}:")
+    for r in regresje:
+        print(f"  {r['pomiar']}: {r['przed_ms']:.2f} ms -> {r['teraz_ms']:.2f} ms "
+              f"(+{r['zmiana']:.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("wyniki")
+    parser.add_argument("--baseline", required=True)
+    parser.add_argument("--prog", type=float, default=DEFAULT_THRESHOLD,
+                        help="Dopuszczalny wzrost mediany (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    regresje = compare(load(args.wyniki), load(args.baseline), args.prog)
+    report(regresje, args.prog)
+    sys.exit(1 if regresje else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Opóźnienie wyszukiwania pełnotekstowego (FTS5) i podpowiedzi na dużej tabeli.
+
+Uruchomienie: python -m benchmarks.search --rows 1000000 --requests 200
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import insert
+
+from app import create_app, database
+from app.models import Artysci, Utwory
+from app.search import search, search_all
+
+SYLABY = ["ka", "ło", "mi", "żu", "ra", "sze", "no", "wą", "ty", "ść", "be", "lo", "gra", "de"]
+
+
+def _slowo(rng):
+    return "".join(rng.choice(SYLABY) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def seed(n_rows, batch=50000):
+    rng = random.Random(0)
+    with database.engine.begin() as conn:
+        for start in range(0, n_rows, batch):
+            size = min(batch, n_rows - start)
+            conn.execute(insert(Artysci), [
+                {"Nazwa": f"{_slowo(rng)} {_slowo(rng)}", "Imie": _slowo(rng),
+                 "Nazwisko": _slowo(rng)} for _ in range(size)
+            ])
+            conn.execute(insert(Utwory), [
+                {"IdArtysty": start + i + 1, "Tytul": f"{_slowo(rng)} {_slowo(rng)} {_slowo(rng)}"}
+                for i in range(size)
+            ])
+
+
+def measure(call, queries, n_requests):
+    timings = []
+    for i in range(n_requests):
+        started = time.perf_counter()
+        call(queries[i % len(queries)])
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), sorted(timings)[int(len(timings) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--db", help="Plik bazy; istniejący jest używany bez ponownego "
+                                     "wypełniania (wstawienie miliona wierszy trwa minuty)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or os.path.join(tmp, "b.db")
+        seeded = os.path.exists(path)
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "DB_PROFILE": "prod"})
+        if not seeded:
+            database.init_db()
+            started = time.perf_counter()
+            seed(args.rows)
+            print(f"Wstawiono {args.rows} artystów i utworów "
+                  f"w {time.perf_counter() - started:.1f} s")
+        client = app.test_client()
+
+        slowa = [_slowo(random.Random(i)) for i in range(50)]
+        cases = {
+            "artysci, prefiks 3 znaki": (lambda q: search("artysci", q), [s[:3] for s in slowa]),
+            "artysci, dwa słowa": (lambda q: search("artysci", q),
+                                   [f"{a} {b[:3]}" for a, b in zip(slowa, slowa[1:])]),
+            "utwory, pełne słowo": (lambda q: search("utwory", q), slowa),
+            "search_all, prefiks 4": (search_all, [s[:4] for s in slowa]),
+            "GET /szukaj/podpowiedzi": (
+                lambda q: client.get("/szukaj/podpowiedzi", query_string={"q": q}),
+                [f"{a} {b[:3]}" for a, b in zip(slowa, slowa[1:])]),
+        }
+        for name, (call, queries) in cases.items():
+            median, p95 = measure(call, queries, args.requests)
+            print(f"{name:>26}: mediana {median:7.2f} ms, p95 {p95:7.2f} ms")
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Serwisy sesji synchroniczne i asynchroniczne przy dużej współbieżności: req/s i p99.
+
+sync: N wątków wywołuje aplikację WSGI, jak wątki gunicorn/waitress.
+async: N zadań asyncio wywołuje app.asgi.AsgiApp z SERVICE_MODE=async na jednej pętli, jak
+uvicorn. Oba tryby dostają identyczne environ (app.asgi.wsgi_environ) i tę samą bazę (profil
+prod). Cache fragmentów i HTTP są wyłączone, żeby każde żądanie dochodziło do serwisów.
+Mierzony jest sam serwer aplikacji, bez sieci i parsowania HTTP.
+
+Uruchomienie: python -m benchmarks.service_mode --wspolbieznosc 64 --czas 15
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app, database
+from app.asgi import AsgiApp, wsgi_environ
+from benchmarks import load
+from benchmarks.generator import Skala, generate
+from benchmarks.results import summarize
+
+# Trasy obsługiwane przez serwisy sesji (app/async_services.py), z wagami jak w load
+TRASY = [trasa for trasa in load.TRASY
+         if trasa[0] in ("GET /sesje/", "GET /sesje/?sort", "GET /sesje/<id>",
+                         "GET /sesje/?od&do")]
+
+
+def _losuj_adres(rng, liczby):
+    _, szablon, _ = rng.choices(TRASY, weights=[waga for _, _, waga in TRASY])[0]
+    return szablon.format(sesja=rng.randint(1, liczby["sesje"]))
+
+
+def _scope(adres):
+    path, _, query = adres.partition("?")
+    return {"type": "http", "method": "GET", "path": path, "query_string": query.encode(),
+            "headers": [], "http_version": "1.1", "scheme": "http", "root_path": "",
+            "server": ("127.0.0.1", 80), "client": ("127.0.0.1", 0)}
+
+
+def _podsumuj(czasy, bledy, elapsed):
+    return {"zadania": len(czasy), "req_s": round(len(czasy) / elapsed, 1),
+            "p99_ms": summarize(czasy)["p99_ms"], "bledy": bledy}
+
+
+def run_sync(app, liczby, wspolbieznosc, czas):
+    koniec = time.perf_counter() + czas
+    czasy, bledy = [], []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < koniec:
+            environ = wsgi_environ(_scope(_losuj_adres(rng, liczby)), b"")
+            statusy = []
+            started = time.perf_counter()
+            wynik = app(environ, lambda status, _headers: statusy.append(int(status[:3])))
+            b"".join(wynik)
+            wynik.close()
+            czasy.append((time.perf_counter() - started) * 1000)
+            if statusy[0] >= 400:
+                bledy.append(statusy[0])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(wspolbieznosc) as pool:
+        list(pool.map(worker, range(wspolbieznosc)))
+    return _podsumuj(czasy, len(bledy), time.perf_counter() - started)
+
+
+async def _get(asgi_app, adres):
+    wiadomosci = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        wiadomosci.append(message)
+
+    await asgi_app(_scope(adres), receive, send)
+    return wiadomosci[0]["status"]
+
+
+async def run_async(asgi_app, liczby, wspolbieznosc, czas):
+    koniec = time.perf_counter() + czas
+    czasy, bledy = [], []
+
+    async def worker(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < koniec:
+            started = time.perf_counter()
+            status = await _get(asgi_app, _losuj_adres(rng, liczby))
+            czasy.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                bledy.append(status)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(i) for i in range(wspolbieznosc)))
+    finally:
+        await database.dispose_async_engine()
+    return _podsumuj(czasy, len(bledy), time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--artysci", type=int, default=2000)
+    parser.add_argument("--wspolbieznosc", type=int, default=64,
+                        help="Wątki (sync) albo zadania asyncio (async)")
+    parser.add_argument("--czas", type=float, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'tryby.db')}",
+                  "DB_PROFILE": "prod", "FRAGMENT_CACHE": False, "HTTP_CACHE": False}
+        sync_app = create_app({**config, "SERVICE_MODE": "sync"})
+        database.init_db()
+        liczby = generate(Skala(args.artysci))
+        async_app = AsgiApp(create_app({**config, "SERVICE_MODE": "async"}))
+
+        wyniki = {
+            "sync": run_sync(sync_app, liczby, args.wspolbieznosc, args.czas),
+            "async": asyncio.run(run_async(async_app, liczby, args.wspolbieznosc, args.czas)),
+        }
+        database.engine.dispose()
+
+    for tryb, wynik in wyniki.items():
+        print(f"{tryb:>5} x {args.wspolbieznosc}: {wynik['req_s']:>8} req/s, "
+              f"p99 {wynik['p99_ms']} ms, {wynik['zadania']} żądań, błędy {wynik['bledy']}")
+
+
+if __name__ == "__main__":
+    main()
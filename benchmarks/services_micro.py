@@ -0,0 +1,160 @@
+"""Mikro-pomiary publicznych funkcji app/services.py na danych z benchmarks.generator.
+
+Uruchomienie: python -m benchmarks.services_micro --artysci 5000 --powtorzenia 200
+"""
+import argparse
+import inspect
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app import create_app, database, services
+from app.models import Artysci, Sesje, Sprzet, Utwory
+from app.scheduling import SlotQuery
+from app.services import DateRange, SessionData
+from benchmarks.generator import Skala, generate
+from benchmarks.results import summarize
+
+# Funkcje bez własnego pomiaru: infrastruktura sesji i konfiguracji albo jednorazowe migracje
+POMINIETE = {
+    "request_session", "get_db_session", "init_app", "configure_lookup_cache",
+    "configure_fragment_cache", "normalize_session_dates", "sync_links", "apply_session_data",
+    "expect_version", "version_conflict"
+}
+
+
+def cases(liczby):
+    n_artysci, n_sesje = liczby["artysci"], liczby["sesje"]
+    # Zapisy w przyszłości, żeby nie kolidowały z wygenerowanym kalendarzem
+    przyszlosc = datetime(2040, 1, 2, 9, 0)
+    edytowana = services.create_session_with_equipment(SessionData(
+        1, 1, przyszlosc - timedelta(days=1), przyszlosc - timedelta(days=1, hours=-2), [1, 2]))
+    kursor = services.get_sessions_sorted(per_page=50).next_cursor
+
+    def artysta(i):
+        return i * 7919 % n_artysci + 1
+
+    def sesja(i):
+        return i * 7919 % n_sesje + 1
+
+    def nowa_sesja(i):
+        start = przyszlosc + timedelta(days=i)
+        return SessionData(artysta(i), 1, start, start + timedelta(hours=3), [1, 2, 3])
+
+    def edycja(i):
+        start = przyszlosc - timedelta(days=2, hours=i % 5)
+        return SessionData(1, 1, start, start + timedelta(hours=2), [1 + i % 3, 4])
+
+    return {
+        "encode_cursor": lambda i: services.encode_cursor("Nazwa", i),
+        "decode_cursor": lambda i: services.decode_cursor(kursor),
+        "paginate_keyset": lambda i: _paginate(kursor),
+        "get_all_sorted": lambda i: services.get_all_sorted(Sprzet, "Model", "desc", None, 50),
+        "create_record": lambda i: services.create_record(Artysci, Nazwa=f"Mikro {i}"),
+        "get_by_id": lambda i: services.get_by_id(Sesje, sesja(i)),
+        "update_record": lambda i: services.update_record(
+            services.get_by_id(Artysci, artysta(i)), Imie=f"Imię {i}"),
+        "get_utwory_by_artist": lambda i: services.get_utwory_by_artist(artysta(i)),
+        "get_utwory_sorted": lambda i: services.get_utwory_sorted("Nazwisko", "asc", None, 50),
+        "get_sessions_sorted": lambda i: services.get_sessions_sorted(
+            "NazwaArtysty", "desc", None, 50),
+        "get_sessions_sorted (kursor)": lambda i: services.get_sessions_sorted(
+            "IdSesji", "asc", kursor, 50),
+        "get_session_details": lambda i: services.get_session_details(sesja(i)),
+        "sessions_statement": lambda i: services.sessions_statement("NazwaArtysty"),
+        "get_sessions_details (50)": lambda i: services.get_sessions_details(
+            [sesja(i + j) for j in range(50)]),
+        "sessions_details_statement": lambda i: services.sessions_details_statement(
+            [sesja(i + j) for j in range(50)]),
+        "session_details_statement": lambda i: services.session_details_statement(sesja(i)),
+        "create_session_with_equipment": lambda i: services.create_session_with_equipment(
+            nowa_sesja(i)),
+        "update_session_with_equipment": lambda i: services.update_session_with_equipment(
+            edytowana.IdSesji, edycja(i)),
+        "get_free_slots": lambda i: services.get_free_slots(SlotQuery(
+            timedelta(hours=3), datetime(2021, 3, 1, 9), datetime(2021, 3, 8, 21),
+            idinzyniera=1 + i % 3, sprzet_ids=[1])),
+        "equipment_usage_statement": lambda i: services.equipment_usage_statement(
+            DateRange(datetime(2021, 1, 1), datetime(2021, 4, 1))),
+        "get_equipment_usage": lambda i: services.get_equipment_usage(1 + i % 20),
+        "get_equipment_usage_all": lambda i: services.get_equipment_usage_all(
+            DateRange(datetime(2021, 1, 1), datetime(2021, 4, 1))),
+        "get_equipment_timeline": lambda i: services.get_equipment_timeline(1 + i % 20),
+        "entity_statement": lambda i: services.entity_statement(
+            "sesje", "TerminStart", "desc", DateRange(datetime(2020, 6, 1))),
+        "get_export_columns": lambda i: services.get_export_columns("utwory"),
+        "iter_export_rows (1000)": lambda i: sum(1 for _ in zip(
+            range(1000), services.iter_export_rows("sesje", "TerminStart"))),
+        "get_api_fields": lambda i: services.get_api_fields("sesje"),
+        "get_api_rows": lambda i: services.get_api_rows(
+            "sesje", ["IdSesji", "NazwaArtysty", "TerminStart"], "TerminStart", "desc",
+            None, 100, DateRange()),
+        "get_api_session_details": lambda i: services.get_api_session_details(sesja(i)),
+        "get_lookup": lambda i: services.get_lookup("sprzet"),
+        "get_selected_sprzet_ids": lambda i: services.get_selected_sprzet_ids(sesja(i)),
+        "bump_table_versions": lambda i: _bump(),
+        "get_table_versions": lambda i: services.get_table_versions(
+            ["sesje", "artysci", "inzynierowie"]),
+        "parse_legacy_termin": lambda i: services.parse_legacy_termin("2024-03-01T10:30"),
+        "safe_date_parse": lambda i: services.safe_date_parse("2024-03-01 10:30"),
+        # Na końcu: ukrywa kolejne utwory przed pozostałymi pomiarami
+        "soft_delete": lambda i: services.soft_delete(Utwory, i + 1),
+    }
+
+
+def _paginate(kursor):
+    with services.get_db_session() as session:
+        return services.paginate_keyset(session, select(Sesje.IdSesji, Sesje.TerminStart),
+                                        Sesje.IdSesji, Sesje.IdSesji, "asc", kursor, 50,
+                                        as_dicts=True)
+
+
+def _bump():
+    with database.engine.begin() as conn:
+        services.bump_table_versions(conn, {Utwory.__tablename__})
+
+
+def uncovered(names):
+    publiczne = {name for name, obj in inspect.getmembers(services, inspect.isfunction)
+                 if obj.__module__ == services.__name__ and not name.startswith("_")}
+    pokryte = {name.split(" ")[0] for name in names}
+    return sorted(publiczne - pokryte - POMINIETE)
+
+
+def run(liczby, powtorzenia):
+    wyniki = {}
+    for name, call in cases(liczby).items():
+        timings = []
+        for i in range(powtorzenia):
+            started = time.perf_counter()
+            call(i)
+            timings.append((time.perf_counter() - started) * 1000)
+        wyniki[f"services.{name}"] = summarize(timings)
+    return wyniki
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--artysci", type=int, default=5000)
+    parser.add_argument("--powtorzenia", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'm.db')}",
+                    "DB_PROFILE": "prod"})
+        database.init_db()
+        liczby = generate(Skala(args.artysci))
+        wyniki = run(liczby, args.powtorzenia)
+        database.engine.dispose()
+
+    for name, wynik in wyniki.items():
+        print(f"{name:>48}: mediana {wynik['mediana_ms']:8.3f} ms, p95 {wynik['p95_ms']:8.3f} ms")
+    if brak := uncovered(name.removeprefix("services.") for name in wyniki):
+        print(f"Funkcje bez pomiaru: {', '.join(brak)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Czas pulpitu /statystyki przy rosnącej historii sesji (agregaty zamiast pełnych przeglądów).
+
+Uruchomienie: python -m benchmarks.stats_dashboard --sizes 1000 100000 --requests 100
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from app import create_app, database
+from benchmarks.form_latency import seed
+
+# Zakres pulpitu stały dla wszystkich rozmiarów: pierwsze 12 tygodni historii
+ZAKRES = "od=2020-01-01&do=2020-03-25"
+
+
+def measure(client, url, n_requests):
+    timings = []
+    for _ in range(n_requests):
+        started = time.perf_counter()
+        resp = client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert resp.status_code == 200, resp.status_code
+    return statistics.median(timings), sorted(timings)[int(len(timings) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 's.db')}",
+                              "DB_PROFILE": "prod"})
+            database.init_db()
+            seed(size)
+            client = app.test_client()
+            for url in (f"/statystyki/?{ZAKRES}", f"/statystyki/inzynierowie.json?{ZAKRES}",
+                        f"/statystyki/sprzet.json?{ZAKRES}"):
+                median, p95 = measure(client, url, args.requests)
+                print(f"{size:>8} sesji {url.split('?', maxsplit=1)[0]:>28}: "
+                      f"mediana {median:6.2f} ms, p95 {p95:6.2f} ms")
+            database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
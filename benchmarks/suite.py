@@ -0,0 +1,54 @@
+"""Pełny przebieg pomiarów: generator danych, mikro-pomiary serwisów i obciążenie HTTP.
+
+Wynik trafia do pliku JSON; z --baseline porównanie z zapisanym przebiegiem kończy się
+kodem 1, jeśli któraś mediana wzrosła ponad próg.
+
+Uruchomienie: python -m benchmarks.suite --artysci 5000 --wynik wyniki.json \
+    --baseline benchmarks/baseline.json
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from app import database
+from benchmarks import load, results, services_micro
+from benchmarks.generator import Skala, generate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--artysci", type=int, default=5000)
+    parser.add_argument("--powtorzenia", type=int, default=200)
+    parser.add_argument("--watki", type=int, default=8)
+    parser.add_argument("--czas", type=float, default=20)
+    parser.add_argument("--wynik", default="wyniki_benchmark.json")
+    parser.add_argument("--baseline", help="Plik JSON poprzedniego przebiegu do porównania")
+    parser.add_argument("--prog", type=float, default=results.DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with load.LocalServer(f"sqlite:///{os.path.join(tmp, 'suite.db')}") as server:
+            database.init_db()
+            started = time.perf_counter()
+            liczby = generate(Skala(args.artysci))
+            print(f"Dane: {liczby} ({time.perf_counter() - started:.1f} s)")
+            # Najpierw HTTP na świeżych danych, potem serwisy (które dopisują wiersze)
+            wyniki = load.run(server.url, liczby, args.watki, args.czas)
+            load.print_results(wyniki)
+            wyniki.update(services_micro.run(liczby, args.powtorzenia))
+        database.engine.dispose()
+
+    meta = results.metadata(dane=liczby, watki=args.watki, czas_s=args.czas)
+    results.save(args.wynik, meta, wyniki)
+    print(f"Zapisano {len(wyniki)} pomiarów do {args.wynik}")
+
+    if args.baseline:
+        regresje = results.compare({"wyniki": wyniki}, results.load(args.baseline), args.prog)
+        results.report(regresje, args.prog)
+        sys.exit(1 if regresje else 0)
+
+
+if __name__ == "__main__":
+    main()
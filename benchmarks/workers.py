@@ -0,0 +1,78 @@
+"""Przepustowość serwera produkcyjnego (serve.py) przy różnej liczbie procesów.
+
+Dla każdej liczby procesów uruchamia serve.py jako podproces na tej samej wygenerowanej
+bazie i obciąża go mieszanką tras z benchmarks.load.
+
+Uruchomienie: python -m benchmarks.workers --procesy 1 4 8 --watki 16 --czas 15
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from app import create_app, database
+from benchmarks import load
+from benchmarks.generator import Skala, generate
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=30):
+    koniec = time.monotonic() + timeout
+    while time.monotonic() < koniec:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Serwer nie nasłuchuje na porcie {port}")
+
+
+def measure(db_path, liczby, procesy, args):
+    port = _free_port()
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}", "DB_PROFILE": "prod"}
+    with subprocess.Popen([sys.executable, "serve.py", "--server", args.server,
+                           "--host", "127.0.0.1", "--port", str(port),
+                           "--workers", str(procesy), "--threads", str(args.watki_serwera)],
+                          env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) as proc:
+        try:
+            _wait_for_port(port)
+            return load.run(f"http://127.0.0.1:{port}", liczby, args.watki, args.czas)
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--artysci", type=int, default=5000)
+    parser.add_argument("--procesy", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--server", default="gunicorn")
+    parser.add_argument("--watki-serwera", type=int, default=4)
+    parser.add_argument("--watki", type=int, default=16, help="Wątki klienta obciążającego")
+    parser.add_argument("--czas", type=float, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "workers.db")
+        create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}", "DB_PROFILE": "prod"})
+        database.init_db()
+        liczby = generate(Skala(args.artysci))
+        database.engine.dispose()
+
+        for procesy in args.procesy:
+            razem = measure(db_path, liczby, procesy, args)["http.razem"]
+            print(f"{procesy:>2} proc. x {args.watki_serwera} wątki: {razem['req_s']:>8} req/s, "
+                  f"p99 {razem['p99_ms']} ms, {razem['zadania']} żądań, błędy {razem['bledy']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,41 @@
+import os
+
+
 class Config:
-    SECRET_KEY = 'dev-secret-key-change-in-production'
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///studio_nagran.db'
-    SQLALCHEMY_ECHO = True
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///studio_nagran.db')
+    # Profil silnika bazy danych: dev / test / prod (patrz app/database.py)
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'dev')
+    PER_PAGE = 50
+    # Serwisy sesji: "sync" (services.py) lub "async" (async_services.py na aiosqlite,
+    # wymaga serwera ASGI: app/asgi.py)
+    SERVICE_MODE = os.environ.get('SERVICE_MODE', 'sync')
+    # Cache list do formularzy: "memory" (w procesie) lub "file" (wspólny dla procesów)
+    LOOKUP_CACHE_BACKEND = os.environ.get('LOOKUP_CACHE_BACKEND', 'memory')
+    LOOKUP_CACHE_DIR = os.environ.get('LOOKUP_CACHE_DIR')
+    LOOKUP_CACHE_TTL = 300
+    LOOKUP_CACHE_SIZE = 128
+    # Panel z liczbą i czasem zapytań SQL doklejany do stron HTML (app/instrumentation.py)
+    SQL_DEBUG_PANEL = os.environ.get('SQL_DEBUG_PANEL') == '1'
+    # Serwer produkcyjny (serve.py); pusty WEB_SERVER: gunicorn, a na Windows waitress
+    WEB_SERVER = os.environ.get('WEB_SERVER', '')
+    WEB_HOST = os.environ.get('WEB_HOST', '0.0.0.0')
+    WEB_PORT = int(os.environ.get('WEB_PORT', '8000'))
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', '2'))
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', '8'))
+    WEB_GRACEFUL_TIMEOUT = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', '30'))
+    # Kompilacja szablonów i wczytanie list słownikowych przed pierwszym żądaniem
+    WARMUP = True
+    # ETag/Last-Modified z wersji tabel dla list i modali (app/http_cache.py)
+    HTTP_CACHE = os.environ.get('HTTP_CACHE', '1') == '1'
+    # Cache-Control odpowiedzi z ETag; bez max-age przeglądarka pyta o aktualność za każdym razem
+    CACHE_CONTROL_DEFAULT = 'private, no-cache'
+    # Polityki per blueprint (nazwa blueprintu -> nagłówek), mają pierwszeństwo przed domyślną
+    CACHE_CONTROL = {
+        'eksport': 'no-store',
+        'importy': 'no-store',
+    }
+    # Cache wyrenderowanych tabel list sesji i utworów (klucz: parametry listy + wersje tabel)
+    FRAGMENT_CACHE = os.environ.get('FRAGMENT_CACHE', '1') == '1'
+    FRAGMENT_CACHE_SIZE = 256
+    FRAGMENT_CACHE_MAX_BYTES = 32 * 1024 * 1024
@@ -0,0 +1,123 @@
+"""Produkcyjne uruchomienie aplikacji: gunicorn (procesy + wątki), waitress (wątki, też Windows)
+lub uvicorn (pętla zdarzeń, SERVICE_MODE=async).
+
+Uruchomienie: python serve.py --workers 4 --threads 8
+"""
+import argparse
+import logging
+import os
+import signal
+
+from app import create_app
+from app.asgi import AsgiApp
+from app.serving import shutdown, warmup
+from config import Config
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+
+try:
+    import waitress
+except ImportError:
+    waitress = None
+
+try:
+    import uvicorn
+except ImportError:
+    uvicorn = None
+
+
+def _worker_exit(_server, _worker):
+    shutdown()
+
+
+def run_gunicorn(app, args):
+    class GunicornApplication(BaseApplication):  # pylint: disable=abstract-method
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    options = {
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers or Config.WEB_WORKERS,
+        "threads": args.threads,
+        "worker_class": "gthread",
+        # Aplikacja jest już utworzona i rozgrzana w procesie nadrzędnym; pula połączeń
+        # jest czyszczona w potomkach (database._reset_pool_after_fork)
+        "preload_app": True,
+        "graceful_timeout": args.graceful_timeout,
+        "worker_exit": _worker_exit,
+        "accesslog": "-" if args.access_log else None,
+    }
+    GunicornApplication().run()
+
+
+def run_waitress(app, args):
+    if args.workers and args.workers > 1:
+        logging.warning("waitress obsługuje jeden proces; --workers %d zignorowane", args.workers)
+    server = waitress.create_server(app, host=args.host, port=args.port, threads=args.threads)
+
+    def stop(_signum, _frame):
+        # waitress na SystemExit kończy pętlę i czeka (do 5 s) na trwające żądania
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.run()
+    finally:
+        shutdown()
+
+
+def run_uvicorn(app, args):
+    # Jeden proces z pętlą zdarzeń: współbieżność dają serwisy asynchroniczne (app/asgi.py);
+    # połączenia zamyka obsługa lifespan.shutdown
+    if args.workers and args.workers > 1:
+        logging.warning("uvicorn uruchamiany jest w jednym procesie; --workers %d zignorowane",
+                        args.workers)
+    uvicorn.run(AsgiApp(app), host=args.host, port=args.port, lifespan="on",
+                access_log=args.access_log,
+                timeout_graceful_shutdown=args.graceful_timeout)
+
+
+SERVERS = {"gunicorn": run_gunicorn, "waitress": run_waitress, "uvicorn": run_uvicorn}
+
+
+def default_server():
+    if BaseApplication is not None and os.name != "nt":
+        return "gunicorn"
+    return "waitress"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--server", choices=SERVERS, default=Config.WEB_SERVER or default_server())
+    parser.add_argument("--host", default=Config.WEB_HOST)
+    parser.add_argument("--port", type=int, default=Config.WEB_PORT)
+    parser.add_argument("--workers", type=int, help=f"Domyślnie {Config.WEB_WORKERS} (gunicorn)")
+    parser.add_argument("--threads", type=int, default=Config.WEB_THREADS)
+    parser.add_argument("--graceful-timeout", type=int, default=Config.WEB_GRACEFUL_TIMEOUT)
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args()
+
+    if {"gunicorn": BaseApplication, "waitress": waitress, "uvicorn": uvicorn}[args.server] is None:
+        parser.error(f"Serwer {args.server} nie jest zainstalowany (pip install {args.server})")
+    if Config.SERVICE_MODE == "async" and args.server != "uvicorn":
+        parser.error("SERVICE_MODE=async wymaga serwera ASGI (--server uvicorn)")
+    if args.server == "uvicorn" and Config.SERVICE_MODE != "async":
+        parser.error("uvicorn obsługuje żądania na jednym wątku - uruchom go z SERVICE_MODE=async")
+
+    logging.basicConfig(level=logging.INFO)
+    # Bez jawnego DB_PROFILE serwer produkcyjny używa profilu prod (WAL, pula połączeń)
+    app = create_app({"DB_PROFILE": os.environ.get("DB_PROFILE", "prod")})
+    if app.config.get("WARMUP", True):
+        warmup(app)
+    SERVERS[args.server](app, args)
+
+
+if __name__ == "__main__":
+    main()
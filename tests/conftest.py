@@ -1,5 +1,6 @@
 import sqlite3
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 
 import pytest
 from flask.testing import FlaskClient
@@ -7,9 +8,12 @@ from sqlalchemy import create_engine, event
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from app import create_app, database
+from app.instrumentation import capture_queries
 from app.models import Artysci, Inzynierowie, Sprzet, Utwory, base
-from app.services import (SessionData, create_session_with_equipment,
-                          get_db_session)
+from app.services import (SessionData, create_record,
+                          create_session_with_equipment, fragment_cache,
+                          get_db_session, lookup_cache)
+from app.stats import STAT_TABLES
 from tests.test_types import (ArtystaFixtures, MonkeyPatchFixtures,
                               SesjaFixtures, SimpleMonkeyPatchFixtures)
 
@@ -37,6 +41,8 @@ def _db_in_memory():
 
     database.session = test_session
     database.engine = engine
+    lookup_cache.clear()
+    fragment_cache.clear()
 
     try:
         yield
@@ -48,6 +54,13 @@ def _db_in_memory():
         database.engine = old_engine
 
 
+@pytest.fixture(name="restore_engine")
+def fixture_restore_engine(monkeypatch):
+    """configure_engine podmienia globalny silnik i fabrykę sesji; monkeypatch je przywraca."""
+    for name in ("engine", "session", "_engine_key", "async_engine", "_async_session"):
+        monkeypatch.setattr(database, name, getattr(database, name))
+
+
 @pytest.fixture(scope="function", name="client")
 def fixture_client() -> FlaskClient:
     test_app = create_app()
@@ -55,9 +68,24 @@ def fixture_client() -> FlaskClient:
     test_app.config["WTF_CSRF_ENABLED"] = False
     test_app.config["SECRET_KEY"] = "test-secret"
 
-    with test_app.test_client() as test_client:
-        with test_app.app_context():
-            yield test_client
+    # Bez "with test_client": zachowany kontekst ostatniego żądania sprawiałby,
+    # że wywołania serwisów w teście dołączałyby do zakończonej jednostki pracy
+    with test_app.app_context():
+        yield test_app.test_client()
+
+
+@pytest.fixture(name="assert_max_queries")
+def fixture_assert_max_queries():
+    """Context manager sprawdzający, że blok wykonał co najwyżej `limit` zapytań SQL."""
+    @contextmanager
+    def _assert(limit):
+        with capture_queries() as stats:
+            yield stats
+        assert stats.count <= limit, (
+            f"Wykonano {stats.count} zapytań SQL (limit {limit}); powtórzone: {stats.duplikaty}"
+        )
+
+    return _assert
 
 
 @pytest.fixture(scope="function", name="db_session")
@@ -157,6 +185,45 @@ def fixture_create_song(client, db_session):
     return _create
 
 
+@pytest.fixture(name="studio")
+def fixture_studio():
+    """Artysta, inżynier i dwa mikrofony utworzone przez serwisy; zwraca ich identyfikatory."""
+    return {
+        "a": create_record(Artysci, Nazwa="Dżem").IdArtysty,
+        "e": create_record(Inzynierowie, Imie="Ewa", Nazwisko="Kowal").IdInzyniera,
+        "s1": create_record(Sprzet, Producent="Neumann", Model="U87",
+                            Kategoria="Mikrofony").IdSprzetu,
+        "s2": create_record(Sprzet, Producent="Shure", Model="SM7B",
+                            Kategoria="Mikrofony").IdSprzetu,
+    }
+
+
+@pytest.fixture(name="add_session")
+def fixture_add_session(studio):
+    """Factory do tworzenia sesji inżyniera ze studia (domyślnie dla artysty ze studia)."""
+    def _create(start, godziny, sprzet=(), idartysty=None):
+        return create_session_with_equipment(SessionData(
+            idartysty or studio["a"], studio["e"], start, start + timedelta(hours=godziny),
+            list(sprzet),
+        ))
+
+    return _create
+
+
+@pytest.fixture(name="stat_snapshot")
+def fixture_stat_snapshot():
+    """Funkcja zwracająca niezerowe wiersze wszystkich tabel statystyk."""
+    def _snapshot():
+        with database.engine.connect() as conn:
+            return {table: sorted(tuple(row) for row in conn.exec_driver_sql(
+                f"SELECT * FROM {table} WHERE " + {
+                    "stat_artysci": "Sesje != 0 OR Utwory != 0", "stat_liczniki": "Wartosc != 0",
+                }.get(table, "Sesje != 0")
+            )) for table in STAT_TABLES}
+
+    return _snapshot
+
+
 @pytest.fixture(name="utwory_base_setup")
 def fixture_utwory_base_setup(create_artist, create_engineer, create_session):
     """Tworzy artystę, inżyniera i sesję dla testów utworów."""
@@ -0,0 +1,223 @@
+import asyncio
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+import pytest
+from sqlalchemy import select
+
+from app import async_services, create_app, database
+from app.asgi import create_asgi_app
+from app.models import Artysci, Inzynierowie, Sesje, Sprzet, SprzetySesje, WersjeTabel
+from app.services import (SessionData, create_record, get_by_id, get_lookup,
+                          get_selected_sprzet_ids, get_table_versions,
+                          lookup_cache)
+
+
+def _run(coro):
+    # Silnik aiosqlite należy do pętli, na której powstał; zamykany razem z nią
+    async def main():
+        try:
+            return await coro
+        finally:
+            await database.dispose_async_engine()
+
+    return asyncio.run(main())
+
+
+async def _request(app, method, path, form=None, headers=()):
+    body = urlencode(form, doseq=True).encode() if form else b""
+    wiadomosci = []
+    path, _, query = path.partition("?")
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode(),
+             "headers": [(b"content-type", b"application/x-www-form-urlencoded"),
+                         *((name.lower().encode(), value.encode()) for name, value in headers)],
+             "http_version": "1.1", "scheme": "http", "root_path": "",
+             "server": ("test", 80), "client": ("127.0.0.1", 1)}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        wiadomosci.append(message)
+
+    await app(scope, receive, send)
+    odpowiedz = {name.decode(): value.decode() for name, value in wiadomosci[0]["headers"]}
+    tresc = b"".join(m.get("body", b"") for m in wiadomosci[1:]).decode()
+    return wiadomosci[0]["status"], odpowiedz, tresc
+
+
+def _wersja_tabeli(tabela):
+    with database.engine.connect() as conn:
+        return conn.execute(select(WersjeTabel.Wersja)
+                            .where(WersjeTabel.Tabela == tabela)).scalar() or 0
+
+
+@pytest.fixture(name="asgi_app")
+def fixture_asgi_app(tmp_path, restore_engine):  # pylint: disable=unused-argument
+    """ASGI z SERVICE_MODE=async na bazie w pliku: oba silniki muszą widzieć te same dane."""
+    app = create_asgi_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'async.db'}",
+                           "DB_PROFILE": "test", "SERVICE_MODE": "async", "TESTING": True})
+    database.init_db()
+    return app
+
+
+@pytest.fixture(name="zasoby")
+def fixture_zasoby(asgi_app):  # pylint: disable=unused-argument
+    return {
+        "a": create_record(Artysci, Nazwa="Async").IdArtysty,
+        "e": create_record(Inzynierowie, Imie="Ewa", Nazwisko="Loop").IdInzyniera,
+        "s": create_record(Sprzet, Producent="Neumann", Model="U87",
+                           Kategoria="Mikrofony").IdSprzetu,
+    }
+
+
+def _form(zasoby, godzina=10, **extra):
+    return {"artysta": zasoby["a"], "inzynier": zasoby["e"], "sprzet": [zasoby["s"]],
+            "termin_start": f"2025-03-01 {godzina}:00",
+            "termin_stop": f"2025-03-01 {godzina + 2}:00", **extra}
+
+
+class TestAsyncServices:
+    def test_create_outside_request_commits_and_bumps_versions(self, zasoby):
+        wersja = _wersja_tabeli("sesje")
+
+        nowa = _run(async_services.create_session_with_equipment(SessionData(
+            zasoby["a"], zasoby["e"], datetime(2025, 3, 1, 10), datetime(2025, 3, 1, 12),
+            [zasoby["s"]])))
+
+        assert get_by_id(Sesje, nowa.IdSesji).IdArtysty == zasoby["a"]
+        assert get_selected_sprzet_ids(nowa.IdSesji) == [zasoby["s"]]
+        assert _wersja_tabeli("sesje") == wersja + 1
+
+    def test_sorted_page_and_details_match_sync_services(self, zasoby):
+        for godzina in (14, 10, 12):
+            create_record(Sesje, IdArtysty=zasoby["a"], IdInzyniera=zasoby["e"],
+                          TerminStart=datetime(2025, 3, 1, godzina))
+
+        async def odczyt():
+            strona = await async_services.get_sessions_sorted("TerminStart", per_page=2)
+            dalej = await async_services.get_sessions_sorted("TerminStart", per_page=2,
+                                                             cursor=strona.next_cursor)
+            return strona, dalej, await async_services.get_session_details(1)
+
+        strona, dalej, sesja = _run(odczyt())
+
+        assert [s.TerminStart.hour for s in strona] == [10, 12]
+        assert [s.TerminStart.hour for s in dalej] == [14]
+        assert sesja.artysci.Nazwa == "Async"
+
+    def test_invalid_service_mode_is_rejected(self):
+        with pytest.raises(ValueError, match="tryb serwisów"):
+            create_app({"SERVICE_MODE": "threads"})
+
+    def test_async_mode_requires_asgi_entry_point(self, asgi_app, zasoby):
+        client = asgi_app.flask_app.test_client()
+
+        with pytest.raises(RuntimeError, match="serwera ASGI"):
+            client.post("/sesje/dodaj", data=_form(zasoby))
+
+
+class TestAsgiEntryPoint:
+    def test_write_commits_bumps_versions_and_invalidates_caches(self, asgi_app, zasoby):
+        wersja = _wersja_tabeli("sesje")
+
+        async def scenariusz():
+            przed = await _request(asgi_app, "GET", "/sesje/")
+            zapis = await _request(asgi_app, "POST", "/sesje/dodaj", _form(zasoby))
+            po = await _request(asgi_app, "GET", "/sesje/",
+                                headers=[("If-None-Match", przed[1]["etag"])])
+            return przed, zapis, po
+
+        przed, zapis, po = _run(scenariusz())
+
+        assert zapis[0] == 302
+        assert "2025-03-01 10:00" not in przed[2]
+        # Nowy ETag i świeży fragment listy zamiast 304 i kopii sprzed zapisu
+        assert po[0] == 200 and po[1]["etag"] != przed[1]["etag"]
+        assert "2025-03-01 10:00" in po[2]
+        assert _wersja_tabeli("sesje") == wersja + 1
+        assert get_table_versions(["sprzety_sesje"])["sprzety_sesje"][0] >= 1
+        assert 'desc="SQL: ' in zapis[1]["server-timing"]
+
+    def test_write_invalidates_lookup_cache(self, asgi_app, zasoby, monkeypatch):
+        uniewaznione = []
+        oryginal = lookup_cache.invalidate_tables
+        monkeypatch.setattr(lookup_cache, "invalidate_tables",
+                            lambda tables: uniewaznione.extend(tables) or oryginal(tables))
+        with asgi_app.flask_app.app_context():
+            assert not get_lookup("sesje_utworow")
+
+        _run(_request(asgi_app, "POST", "/sesje/dodaj", _form(zasoby)))
+
+        assert {"sesje", "sprzety_sesje"} <= set(uniewaznione)
+        with asgi_app.flask_app.app_context():
+            assert [s["NazwaArtysty"] for s in get_lookup("sesje_utworow")] == ["Async"]
+
+    def test_conflicting_edit_rolls_back(self, asgi_app, zasoby):
+        _run(_request(asgi_app, "POST", "/sesje/dodaj", _form(zasoby)))
+        idsesji = get_by_id(Sesje, 1).IdSesji
+        wersja = _wersja_tabeli("sesje")
+
+        status, _, _ = _run(_request(asgi_app, "POST", f"/sesje/edytuj/{idsesji}",
+                                     _form(zasoby, godzina=14, wersja=99, sprzet=[])))
+
+        assert status == 409
+        assert get_by_id(Sesje, idsesji).TerminStart.hour == 10
+        assert get_selected_sprzet_ids(idsesji) == [zasoby["s"]]
+        assert _wersja_tabeli("sesje") == wersja
+
+    def test_edit_updates_session_and_links(self, asgi_app, zasoby):
+        _run(_request(asgi_app, "POST", "/sesje/dodaj", _form(zasoby)))
+
+        status, _, _ = _run(_request(asgi_app, "POST", "/sesje/edytuj/1",
+                                     _form(zasoby, godzina=14, wersja=1, sprzet=[])))
+
+        assert status == 302
+        assert get_by_id(Sesje, 1).TerminStart.hour == 14
+        with database.engine.connect() as conn:
+            assert conn.execute(select(SprzetySesje)).all() == []
+
+    def test_requests_share_event_loop_while_waiting(self, asgi_app, zasoby, monkeypatch):
+        _run(_request(asgi_app, "POST", "/sesje/dodaj", _form(zasoby)))
+        zdarzenia = []
+        oryginal = async_services.get_session_details
+
+        async def wolne_szczegoly(idsesji):
+            zdarzenia.append("start")
+            await asyncio.sleep(0.2)
+            zdarzenia.append("koniec")
+            return await oryginal(idsesji)
+
+        monkeypatch.setattr(async_services, "get_session_details", wolne_szczegoly)
+
+        async def rownolegle():
+            return await asyncio.gather(*(_request(asgi_app, "GET", "/sesje/1")
+                                          for _ in range(4)))
+
+        started = time.perf_counter()
+        wyniki = _run(rownolegle())
+
+        assert [status for status, _, _ in wyniki] == [200] * 4
+        assert zdarzenia[:4] == ["start"] * 4
+        assert time.perf_counter() - started < 0.2 * 4
+
+    def test_lifespan_shutdown_disposes_engines(self, asgi_app, zasoby):
+        async def cykl():
+            await _request(asgi_app, "GET", "/sesje/")
+            assert database.async_engine is not None
+            kolejka = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+            wyslane = []
+
+            async def receive():
+                return kolejka.pop(0)
+
+            async def send(message):
+                wyslane.append(message["type"])
+
+            await asgi_app({"type": "lifespan"}, receive, send)
+            return wyslane
+
+        assert _run(cykl()) == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert database.async_engine is None
+        assert get_by_id(Artysci, zasoby["a"]).Nazwa == "Async"
@@ -1,6 +1,12 @@
 # coding: utf-8
+import json
+from datetime import datetime
+
+import pytest
+
 import app.views.sesje as sesje_view_module
 from app.models import Artysci, Inzynierowie, Sesje, SprzetySesje, Utwory
+from app.services import encode_cursor
 from tests.test_types import (ArtystaFixtures, MonkeyPatchFixtures,
                               SesjaFixtures, SimpleMonkeyPatchFixtures)
 
@@ -48,6 +54,19 @@ class TestArtysciEndpoints:
         assert response.status_code == 200
         assert html.index("Adam") < html.index("Zenek")
 
+    def test_list_paginates_with_cursor_links(self, create_artist, client):
+        client.application.config["PER_PAGE"] = 2
+        for nazwa in ["Alfa", "Beta", "Gamma"]:
+            create_artist(nazwa=nazwa)
+
+        first = client.get("/artysci/?sort=Nazwa&order=asc").get_data(as_text=True)
+        assert "Alfa" in first and "Beta" in first and "Gamma" not in first
+        assert 'rel="next"' in first
+
+        next_url = first.split('rel="next"')[0].rsplit('href="', 1)[1].split('"')[0]
+        second = client.get(next_url.replace("&amp;", "&")).get_data(as_text=True)
+        assert "Gamma" in second and "Alfa" not in second
+
     def test_edytuj_get_renders_form(self, create_artist, client):
         artist = create_artist(nazwa="BandX", imie="Jan", nazwisko="Kowalski")
         resp = client.get(f"/artysci/edytuj/{artist.IdArtysty}")
@@ -205,6 +224,26 @@ class TestSesjeEndpoints:
 
         assert resp.status_code == 200
 
+    def test_list_filters_by_date_range(self, create_artist, create_engineer,
+                                        create_session, client):
+        artist = create_artist(nazwa="RangeArtist")
+        engineer = create_engineer(imie="Range", nazwisko="Eng")
+        create_session(artist, engineer, termin_start="2025-01-10")
+        create_session(artist, engineer, termin_start="2025-03-10")
+
+        resp = client.get("/sesje/?sort=TerminStart&od=2025-03-01 00:00&do=2025-04-01 00:00")
+        html = resp.get_data(as_text=True)
+
+        assert resp.status_code == 200
+        assert "2025-03-10 00:00" in html
+        assert "2025-01-10 00:00" not in html
+
+    def test_list_invalid_date_filter_flashes_error(self, client):
+        resp = client.get("/sesje/?od=10.01.2025")
+
+        assert resp.status_code == 200
+        assert "Nieprawidłowy format daty" in resp.get_data(as_text=True)
+
     def test_dodaj_sesje_get_renders_form(self, client):
         resp = client.get("/sesje/dodaj")
 
@@ -234,7 +273,7 @@ class TestSesjeEndpoints:
 
         assert resp.status_code == 200
         assert sesja is not None
-        assert str(sesja.TerminStart.replace("T", " "))[:16] == "2025-05-01 18:00"
+        assert sesja.TerminStart == datetime(2025, 5, 1, 18, 0)
         assert sesja.TerminStop is None
 
     def test_dodaj_sesje_post_with_termin_stop(
@@ -259,8 +298,8 @@ class TestSesjeEndpoints:
 
         assert resp.status_code == 200
         assert sesja is not None
-        assert str(sesja.TerminStart.replace("T", " "))[:16] == "2025-06-01 15:00"
-        assert str(sesja.TerminStop.replace("T", " "))[:16] == "2025-06-10 18:00"
+        assert sesja.TerminStart == datetime(2025, 6, 1, 15, 0)
+        assert sesja.TerminStop == datetime(2025, 6, 10, 18, 0)
 
     def test_edytuj_sesje_get_renders_form(
         self,
@@ -301,7 +340,7 @@ class TestSesjeEndpoints:
         assert resp.status_code == 200
 
         refreshed = session_fixtures.db_session.query(Sesje).filter_by(IdSesji=sesja.IdSesji).one()
-        assert str(refreshed.TerminStart).replace("T", " ")[:16] == "2025-02-02 12:00"
+        assert refreshed.TerminStart == datetime(2025, 2, 2, 12, 0)
         assert session_fixtures.db_session.query(
             SprzetySesje
         ).filter_by(IdSesji=sesja.IdSesji).count() == 2
@@ -343,7 +382,7 @@ class TestSesjeEndpoints:
         engineer = monkeypatch_fixtures.create_engineer(imie="Patch", nazwisko="Eng")
         sesja = monkeypatch_fixtures.create_session(artist, engineer)
 
-        def mock_update(_idsesji, _session_data):
+        def mock_update(_idsesji, _session_data, _wersja=None):
             return None
 
         monkeypatch_fixtures.monkeypatch.setattr(
@@ -494,3 +533,175 @@ class TestSesjeEndpoints:
 
         assert resp.status_code == 200
         assert "Nieprawidłowy format".encode() in resp.data
+
+
+class TestCursorValidation:
+    def test_session_list_ignores_cursor_with_wrong_key_type(self, create_artist,
+                                                             create_engineer,
+                                                             create_session, client):
+        artist = create_artist(nazwa="CursorArtist")
+        engineer = create_engineer(imie="Cursor", nazwisko="Eng")
+        create_session(artist, engineer, termin_start="2025-01-10")
+
+        cursor = encode_cursor("abc", 1, sort=("Sesje.TerminStart", "asc"))
+        resp = client.get(f"/sesje/?sort=TerminStart&cursor={cursor}")
+
+        assert resp.status_code == 200
+        assert "2025-01-10 00:00" in resp.get_data(as_text=True)
+
+
+class TestEksportEndpoints:
+    @pytest.fixture(name="sesje_z_sprzetem")
+    def fixture_sesje_z_sprzetem(self, create_artist, create_engineer, create_equipment,
+                                 create_session):
+        """Trzy sesje w kolejnych miesiącach z tym samym sprzętem."""
+        artist = create_artist(nazwa="ExportArtist")
+        engineer = create_engineer(imie="Export", nazwisko="Eng")
+        eq = create_equipment(producent="ExportProd", model="EX1")
+        sesje = [
+            create_session(artist, engineer, termin_start=f"2025-0{miesiac}-01",
+                           sprzet_ids=[eq.IdSprzetu])
+            for miesiac in (1, 2, 3)
+        ]
+        return sesje, eq
+
+    def test_export_sesje_csv_streams_all_rows(self, client, sesje_z_sprzetem):
+        sesje, _ = sesje_z_sprzetem
+
+        resp = client.get("/export/sesje.csv")
+
+        assert resp.status_code == 200
+        assert resp.is_streamed
+        assert resp.mimetype == "text/csv"
+        assert "sesje.csv" in resp.headers["Content-Disposition"]
+        lines = resp.get_data(as_text=True).splitlines()
+        assert lines[0] == "IdSesji,IdArtysty,IdInzyniera,TerminStart,TerminStop"
+        assert [int(line.split(",")[0]) for line in lines[1:]] == [s.IdSesji for s in sesje]
+        assert "2025-01-01 00:00:00" in lines[1]
+
+    def test_export_ndjson_respects_sort_and_range(self, client, sesje_z_sprzetem):
+        sesje, eq = sesje_z_sprzetem
+
+        resp = client.get("/export/sprzety_sesje.ndjson?sort=TerminStart&order=desc"
+                          "&od=2025-01-15 00:00&do=2025-03-15 00:00")
+
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        assert [row["IdSesji"] for row in rows] == [sesje[2].IdSesji, sesje[1].IdSesji]
+        assert rows[0] == {
+            "IdSprzetu": eq.IdSprzetu,
+            "IdSesji": sesje[2].IdSesji,
+            "TerminStart": "2025-03-01 00:00:00",
+            "TerminStop": "2025-03-01 00:00:00",
+        }
+
+    def test_export_unknown_sort_falls_back_to_primary_key(self, client, create_artist):
+        create_artist(nazwa="Beta")
+        create_artist(nazwa="Alfa")
+
+        resp = client.get("/export/artysci.csv?sort=Nieistniejaca")
+
+        lines = resp.get_data(as_text=True).splitlines()
+        assert [line.split(",")[1] for line in lines[1:]] == ["Beta", "Alfa"]
+
+    def test_export_unknown_entity_returns_404(self, client):
+        resp = client.get("/export/hasla.csv")
+
+        assert resp.status_code == 404
+
+    def test_export_invalid_date_returns_400(self, client):
+        resp = client.get("/export/sesje.ndjson?od=wczoraj")
+
+        assert resp.status_code == 400
+        assert "Nieprawidłowy format daty" in resp.get_data(as_text=True)
+
+
+class TestApiEndpoints:
+    @pytest.fixture(name="sesje_api")
+    def fixture_sesje_api(# pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, create_artist, create_engineer, create_equipment, create_session, create_song
+    ):
+        """Dwie sesje, pierwsza z utworem i sprzętem."""
+        artist = create_artist(nazwa="ApiArtist")
+        engineer = create_engineer(imie="Api", nazwisko="Eng")
+        eq = create_equipment(producent="ApiProd", model="A1")
+        pierwsza = create_session(artist, engineer, termin_start="2025-01-01",
+                                  sprzet_ids=[eq.IdSprzetu])
+        druga = create_session(artist, engineer, termin_start="2025-02-01")
+        utwor = create_song(artist, pierwsza, tytul="ApiSong")
+        return pierwsza, druga, eq, utwor
+
+    def test_api_returns_only_requested_fields(self, client, sesje_api, assert_max_queries):
+        pierwsza, druga, _, _ = sesje_api
+
+        with assert_max_queries(1):
+            resp = client.get("/api/v1/sesje?fields=IdSesji,TerminStart,NazwaArtysty"
+                              "&sort=TerminStart&order=desc")
+
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/json"
+        assert resp.get_json()["dane"] == [
+            {"IdSesji": druga.IdSesji, "TerminStart": "2025-02-01T00:00:00",
+             "NazwaArtysty": "ApiArtist"},
+            {"IdSesji": pierwsza.IdSesji, "TerminStart": "2025-01-01T00:00:00",
+             "NazwaArtysty": "ApiArtist"},
+        ]
+
+    def test_api_paginates_with_cursor(self, client, sesje_api):
+        pierwsza, druga, _, _ = sesje_api
+
+        first = client.get("/api/v1/sesje?fields=IdSesji&limit=1").get_json()
+        second = client.get(f"/api/v1/sesje?fields=IdSesji&limit=1"
+                            f"&cursor={first['nastepny']}").get_json()
+
+        assert first["dane"] == [{"IdSesji": pierwsza.IdSesji}]
+        assert second["dane"] == [{"IdSesji": druga.IdSesji}]
+        assert second["nastepny"] is None
+        assert second["poprzedni"] is not None
+
+    def test_api_cursor_from_other_sort_restarts_listing(self, client, sesje_api):
+        pierwsza, _, _, _ = sesje_api
+
+        first = client.get("/api/v1/sesje?fields=IdSesji&limit=1").get_json()
+        resp = client.get(f"/api/v1/sesje?fields=IdSesji&limit=1&sort=TerminStart"
+                          f"&cursor={first['nastepny']}")
+
+        assert resp.status_code == 200
+        assert resp.get_json()["dane"] == [{"IdSesji": pierwsza.IdSesji}]
+
+    def test_api_ignores_cursor_with_wrong_key_type(self, client, sesje_api):
+        pierwsza, _, _, _ = sesje_api
+
+        cursor = encode_cursor("abc", 1, sort=("Sesje.TerminStart", "asc"))
+        resp = client.get(f"/api/v1/sesje?fields=IdSesji&limit=1&sort=TerminStart"
+                          f"&cursor={cursor}")
+
+        assert resp.status_code == 200
+        assert resp.get_json()["dane"] == [{"IdSesji": pierwsza.IdSesji}]
+
+    def test_api_session_details(self, client, sesje_api):
+        pierwsza, _, eq, utwor = sesje_api
+
+        resp = client.get(f"/api/v1/sesje/{pierwsza.IdSesji}")
+
+        data = resp.get_json()
+        assert data["NazwiskoInzyniera"] == "Eng"
+        assert data["utwory"] == [{"IdUtworu": utwor.IdUtworu, "Tytul": "ApiSong"}]
+        assert data["sprzet"] == [{"IdSprzetu": eq.IdSprzetu, "Producent": "ApiProd",
+                                   "Model": "A1", "Kategoria": eq.Kategoria}]
+        assert client.get("/api/v1/sesje/999").status_code == 404
+
+    @pytest.mark.parametrize("query, komunikat", [
+        ("fields=IdSesji,Haslo", "Nieznane pola: Haslo"),
+        ("limit=0", "Parametr limit"),
+        ("od=wczoraj", "Nieprawidłowy format daty"),
+    ])
+    def test_api_rejects_invalid_parameters(self, client, query, komunikat):
+        resp = client.get(f"/api/v1/sesje?{query}")
+
+        assert resp.status_code == 400
+        assert komunikat in resp.get_json()["blad"]
+
+    def test_api_unknown_entity_returns_404(self, client):
+        assert client.get("/api/v1/sprzety_sesje").status_code == 404
@@ -0,0 +1,221 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import database
+from app.cache import FileBackend, FragmentCache, LookupCache, MemoryBackend
+from app.models import Artysci, Inzynierowie, Sesje, Sprzet
+from app.services import (SessionData, create_record,
+                          create_session_with_equipment, fragment_cache,
+                          get_by_id, get_lookup, lookup_cache, update_record,
+                          update_session_with_equipment)
+
+
+@pytest.fixture(name="zegar")
+def fixture_zegar(monkeypatch):
+    """Sterowany czas dla sprawdzania TTL."""
+    teraz = [1000.0]
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: teraz[0])
+    monkeypatch.setattr("app.cache.time.time", lambda: teraz[0])
+    return teraz
+
+
+@pytest.fixture(name="backend", params=["memory", "file"])
+def fixture_backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(max_entries=2)
+    return FileBackend(str(tmp_path), max_entries=2)
+
+
+class TestBackends:
+    def test_ttl_expiry(self, backend, zegar):
+        backend.set("a", [1], ttl=10)
+        assert backend.get("a") == (True, [1])
+
+        zegar[0] += 11
+        assert backend.get("a") == (False, None)
+
+    def test_lru_eviction(self, backend, zegar):
+        backend.set("a", 1, ttl=60)
+        zegar[0] += 1
+        backend.set("b", 2, ttl=60)
+        zegar[0] += 1
+        backend.get("a")
+        zegar[0] += 1
+        backend.set("c", 3, ttl=60)
+
+        assert backend.get("b") == (False, None)
+        assert backend.get("a") == (True, 1)
+        assert backend.get("c") == (True, 3)
+
+    def test_file_backend_is_shared_between_instances(self, tmp_path):
+        pierwszy, drugi = FileBackend(str(tmp_path)), FileBackend(str(tmp_path))
+
+        pierwszy.set("artysci", [{"IdArtysty": 1}], ttl=60)
+        assert drugi.get("artysci") == (True, [{"IdArtysty": 1}])
+
+        drugi.delete("artysci")
+        assert pierwszy.get("artysci") == (False, None)
+
+
+class TestLookupCache:
+    def test_counts_hits_and_misses_and_invalidates_by_table(self):
+        wczytania = []
+        cache = LookupCache()
+        cache.register("lista", {"artysci"}, lambda: wczytania.append(1) or len(wczytania))
+
+        assert [cache.get("lista"), cache.get("lista")] == [1, 1]
+        cache.invalidate_tables({"sprzet"})
+        assert cache.get("lista") == 1
+        cache.invalidate_tables({"artysci"})
+        assert cache.get("lista") == 2
+        assert cache.stats() == {"trafienia": 2, "chybienia": 2}
+
+    def test_invalidation_during_load_skips_store(self):
+        cache = LookupCache()
+        cache.register("lista", {"artysci"},
+                       lambda: cache.invalidate_tables({"artysci"}) or "stara")
+
+        cache.get("lista")
+
+        assert cache.backend.get("lista") == (False, None)
+
+
+class TestFragmentCache:
+    def test_lru_by_entries_and_bytes(self):
+        cache = FragmentCache(max_entries=2, max_bytes=10)
+        cache.set("a", "aaaa", {"t"})
+        cache.set("b", "bbbb", {"t"})
+        cache.get("a")
+        cache.set("c", "cccc", {"t"})
+
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("aaaa", None, "cccc")
+
+        cache.set("d", "ddddddd", {"t"})
+        assert cache.get("a") is None and cache.stats()["bajty"] == 7
+
+        cache.set("e", "ą" * 6, {"t"})
+        assert cache.get("e") is None
+
+    def test_invalidate_tables_and_stats(self):
+        cache = FragmentCache()
+        cache.set("sesje", "<tr>", {"sesje", "artysci"})
+        cache.set("sprzet", "<tr></tr>", {"sprzet"})
+        cache.get("sesje")
+        cache.invalidate_tables({"artysci"})
+
+        assert cache.get("sesje") is None
+        assert cache.stats() == {"trafienia": 1, "chybienia": 1, "skutecznosc": 0.5,
+                                 "zaoszczedzone_bajty": 4, "wpisy": 1, "bajty": 9}
+
+
+class TestListFragments:
+    def test_repeated_list_skips_query_and_loop(self, client, session_fixtures,
+                                                assert_max_queries):
+        artysta = session_fixtures.create_artist(nazwa="Fragment")
+        inzynier = session_fixtures.create_engineer()
+        session_fixtures.create_session(artysta, inzynier)
+        pierwsza = client.get("/sesje/").get_data(as_text=True)
+        trafienia = fragment_cache.hits
+
+        with assert_max_queries(1):
+            druga = client.get("/sesje/").get_data(as_text=True)
+
+        assert druga == pierwsza and "Fragment" in druga
+        assert fragment_cache.hits == trafienia + 1
+
+    def test_sort_params_and_writes_change_fragment(self, client, session_fixtures):
+        artysta = session_fixtures.create_artist(nazwa="Stara")
+        inzynier = session_fixtures.create_engineer()
+        session_fixtures.create_session(artysta, inzynier)
+        client.get("/sesje/")
+        client.get("/sesje/?sort=NazwaArtysty&order=desc")
+        assert fragment_cache.stats()["wpisy"] == 2
+
+        update_record(get_by_id(Artysci, artysta.IdArtysty), Nazwa="Nowa")
+
+        assert fragment_cache.stats()["wpisy"] == 0
+        assert "Nowa" in client.get("/sesje/").get_data(as_text=True)
+
+    def test_disabled(self, client, fixtures):
+        client.application.config["FRAGMENT_CACHE"] = False
+        fixtures.create_artist(nazwa="Bez cache")
+        client.get("/utwory/")
+        client.get("/utwory/")
+
+        assert fragment_cache.stats()["wpisy"] == 0
+
+
+class TestLookupInvalidation:
+    def test_form_lists_are_served_from_cache(self, client, assert_max_queries):
+        create_record(Artysci, Nazwa="Raz")
+        client.get("/sesje/dodaj")
+
+        # Jedyne zapytanie to odczyt wersji tabel, od których zależą listy
+        with assert_max_queries(1) as stats:
+            resp = client.get("/sesje/dodaj")
+
+        assert "Raz" in resp.get_data(as_text=True)
+        assert all("wersje_tabel" in stmt for stmt in stats.wykonania)
+
+    def test_create_and_update_record_invalidate(self):
+        artysta = create_record(Artysci, Nazwa="Przed")
+        assert [a["Nazwa"] for a in get_lookup("artysci")] == ["Przed"]
+
+        update_record(get_by_id(Artysci, artysta.IdArtysty), Nazwa="Po")
+        assert [a["Nazwa"] for a in get_lookup("artysci")] == ["Po"]
+
+        create_record(Artysci, Nazwa="Nowy")
+        assert [a["Nazwa"] for a in get_lookup("artysci")] == ["Nowy", "Po"]
+
+    def test_session_writes_invalidate_song_form_sessions(self):
+        artysta = create_record(Artysci, Nazwa="A")
+        inny = create_record(Artysci, Nazwa="B")
+        inzynier = create_record(Inzynierowie, Imie="I", Nazwisko="N")
+        sprzet = create_record(Sprzet, Producent="P", Model="M")
+        assert not get_lookup("sesje_utworow")
+
+        sesja = create_session_with_equipment(
+            SessionData(artysta.IdArtysty, inzynier.IdInzyniera, None, None, [])
+        )
+        assert [s["NazwaArtysty"] for s in get_lookup("sesje_utworow")] == ["A"]
+
+        update_session_with_equipment(sesja.IdSesji, SessionData(
+            inny.IdArtysty, inzynier.IdInzyniera, None, None, [sprzet.IdSprzetu]
+        ))
+        assert [s["NazwaArtysty"] for s in get_lookup("sesje_utworow")] == ["B"]
+        assert get_by_id(Sesje, sesja.IdSesji).IdArtysty == inny.IdArtysty
+
+    @pytest.mark.usefixtures("client", "restore_engine")
+    def test_write_in_other_process_invalidates(self, tmp_path):
+        uri = f"sqlite:///{tmp_path / 'wspolna.db'}"
+        database.configure_engine(uri, "test")
+        database.init_db()
+        create_record(Artysci, Nazwa="Stary")
+        assert [a["Nazwa"] for a in get_lookup("artysci")] == ["Stary"]
+
+        # Inny proces roboczy: własna pamięć procesu, wspólna tylko baza
+        subprocess.run([sys.executable, "-c", (
+            "import sys\n"
+            "from app import database\n"
+            "from app.models import Artysci\n"
+            "from app.services import create_record\n"
+            "database.configure_engine(sys.argv[1], 'test')\n"
+            "create_record(Artysci, Nazwa='Nowy')\n"
+        ), uri], cwd=Path(__file__).resolve().parent.parent, check=True)
+
+        assert [a["Nazwa"] for a in get_lookup("artysci")] == ["Nowy", "Stary"]
+
+    def test_failed_write_keeps_cache(self):
+        artysta = create_record(Artysci, Nazwa="Jedyny")
+        get_lookup("artysci")
+        chybienia = lookup_cache.misses
+
+        with pytest.raises(IntegrityError):
+            create_record(Artysci, IdArtysty=artysta.IdArtysty, Nazwa="Duplikat")
+
+        get_lookup("artysci")
+        assert lookup_cache.misses == chybienia
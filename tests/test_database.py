@@ -1,9 +1,17 @@
-from app import database
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, select
+
+from app import create_app, database
+from app.models import (Artysci, Inzynierowie, Sesje, Sprzet, SprzetySesje,
+                        Utwory)
 
 
 def test_init_db_creates_tables():
     database.init_db()
 
+@pytest.mark.usefixtures("restore_engine")
 def test_init_db_cli_command_calls_init_db_and_echoes_message(client, monkeypatch):
     app = client.application
 
@@ -22,3 +30,94 @@ def test_init_db_cli_command_calls_init_db_and_echoes_message(client, monkeypatc
     assert result.exit_code == 0
     assert called["n"] == 1
     assert "Initialized the database." in result.output
+
+def test_create_db_engine_prod_profile_applies_pragmas(tmp_path):
+    prod_engine = database.create_db_engine(f"sqlite:///{tmp_path / 'prod.db'}", "prod")
+    try:
+        with prod_engine.connect() as conn:
+            pragmas = {
+                name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+                for name in ("journal_mode", "synchronous", "foreign_keys", "busy_timeout")
+            }
+        assert prod_engine.echo is False
+        assert prod_engine.pool.size() == 10
+    finally:
+        prod_engine.dispose()
+
+    assert pragmas == {"journal_mode": "wal", "synchronous": 1,
+                       "foreign_keys": 1, "busy_timeout": 5000}
+
+def test_create_db_engine_rejects_unknown_profile():
+    with pytest.raises(ValueError, match="Nieznany profil"):
+        database.create_db_engine("sqlite:///:memory:", "staging")
+
+@pytest.mark.usefixtures("restore_engine")
+def test_create_app_configures_engine_from_flask_config(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'app.db'}"
+
+    create_app({"SQLALCHEMY_DATABASE_URI": uri, "DB_PROFILE": "prod"})
+    configured = database.engine
+
+    try:
+        assert str(configured.url) == uri
+        assert configured.echo is False
+        assert database.configure_engine(uri, "prod") is configured
+    finally:
+        configured.dispose()
+
+
+def _query_plan(stmt):
+    sql = str(stmt.compile(database.engine, compile_kwargs={"literal_binds": True}))
+    with database.engine.connect() as conn:
+        return " | ".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+@pytest.mark.parametrize("stmt, expected_index", [
+    (select(Utwory).where(Utwory.IdArtysty == 1), "ix_utwory_IdArtysty"),
+    (select(Utwory).where(Utwory.IdSesji == 1), "ix_utwory_IdSesji"),
+    (select(SprzetySesje).where(SprzetySesje.IdSesji == 1), "ix_sprzety_sesje_IdSesji"),
+    (select(Sesje).where(Sesje.IdInzyniera == 1), "ix_sesje_IdInzyniera_TerminStart"),
+    (select(Artysci).order_by(Artysci.Nazwa, Artysci.IdArtysty).limit(50), "ix_artysci_Nazwa"),
+    (select(Inzynierowie).order_by(Inzynierowie.Nazwisko).limit(50), "ix_inzynierowie_Nazwisko"),
+    (select(Sprzet).order_by(Sprzet.Kategoria).limit(50), "ix_sprzet_Kategoria"),
+    (select(Utwory).order_by(Utwory.Tytul).limit(50), "ix_utwory_Tytul"),
+    (select(Sesje).order_by(Sesje.TerminStart).limit(50), "ix_sesje_TerminStart"),
+])
+def test_query_plan_uses_index(stmt, expected_index):
+    assert expected_index in _query_plan(stmt)
+
+def test_query_plan_join_sort_is_driven_by_indexes():
+    with database.engine.begin() as conn:
+        conn.execute(insert(Artysci), [{"Nazwa": f"A{i}"} for i in range(500)])
+        conn.execute(insert(Inzynierowie), [{"Nazwisko": "N"}])
+        conn.execute(insert(Sesje), [
+            {"IdArtysty": i % 500 + 1, "IdInzyniera": 1, "TerminStart": datetime(2025, 1, 1)}
+            for i in range(5000)
+        ])
+        conn.exec_driver_sql("ANALYZE")
+
+    plan = _query_plan(
+        select(Sesje).join(Artysci).order_by(Artysci.Nazwa, Sesje.IdSesji).limit(50)
+    )
+
+    assert "ix_artysci_Nazwa" in plan
+    assert "ix_sesje_IdArtysty_TerminStart" in plan
+
+def test_migrate_indexes_adds_missing_indexes():
+    with database.engine.begin() as conn:
+        conn.exec_driver_sql('DROP INDEX "ix_utwory_IdArtysty"')
+        conn.exec_driver_sql('DROP INDEX "ix_sesje_TerminStart"')
+
+    created = database.migrate_indexes()
+
+    assert created == ["ix_sesje_TerminStart", "ix_utwory_IdArtysty"]
+    assert not database.migrate_indexes()
+
+def test_migrate_indexes_cli_reports_created_indexes(client):
+    with database.engine.begin() as conn:
+        conn.exec_driver_sql('DROP INDEX "ix_artysci_Nazwa"')
+
+    result = client.application.test_cli_runner().invoke(args=["migrate-indexes"])
+
+    assert result.exit_code == 0
+    assert "Utworzono indeks ix_artysci_Nazwa" in result.output
+    assert "Dodano indeksów: 1" in result.output
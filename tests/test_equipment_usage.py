@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+
+from app.models import Sprzet
+from app.services import (DateRange, create_record, get_equipment_timeline,
+                          get_equipment_usage, get_equipment_usage_all)
+
+
+@pytest.fixture(name="wyposazenie")
+def fixture_wyposazenie(studio, add_session):
+    """Mikrofon użyty w trzech sesjach (2, 1 i 3 godziny), drugi w jednej, kabel w żadnej."""
+    kabel = create_record(Sprzet, Producent="Klotz", Model="XLR", Kategoria="Kable")
+    for dzien, godziny, sprzet in ((1, 2, ["s1", "s2"]), (5, 1, ["s1"]), (9, 3, ["s1"])):
+        add_session(datetime(2025, 3, dzien, 10), godziny, [studio[s] for s in sprzet])
+    return {"mikrofon": studio["s1"], "drugi": studio["s2"], "kabel": kabel.IdSprzetu}
+
+
+class TestEquipmentUsage:
+    def test_summary_counts_hours_and_last_use(self, wyposazenie, assert_max_queries):
+        with assert_max_queries(1):
+            uzycie = get_equipment_usage(wyposazenie["mikrofon"])
+
+        assert (uzycie["sesje"], uzycie["godziny"]) == (3, 6.0)
+        assert uzycie["ostatnio"] == datetime(2025, 3, 9, 10)
+        kabel = get_equipment_usage(wyposazenie["kabel"])
+        assert (kabel["sesje"], kabel["godziny"], kabel["ostatnio"]) == (0, 0, None)
+        assert get_equipment_usage(9999) is None
+
+    def test_timeline_newest_first_with_cursor(self, wyposazenie):
+        pierwsza = get_equipment_timeline(wyposazenie["mikrofon"], per_page=2)
+        druga = get_equipment_timeline(wyposazenie["mikrofon"], pierwsza.next_cursor, per_page=2)
+
+        terminy = [row["TerminStart"].day for page in (pierwsza, druga) for row in page]
+        assert terminy == [9, 5, 1]
+        assert [row["godziny"] for row in pierwsza] == [3.0, 1.0]
+        assert pierwsza.items[0]["NazwaArtysty"] == "Dżem"
+        assert druga.next_cursor is None
+
+    def test_bulk_usage_is_one_grouped_query(self, wyposazenie, assert_max_queries):
+        termin = DateRange(datetime(2025, 3, 1), datetime(2025, 3, 6))
+        with assert_max_queries(1):
+            uzycie = get_equipment_usage_all(termin)
+
+        assert {row["IdSprzetu"]: (row["sesje"], row["godziny"]) for row in uzycie} == {
+            wyposazenie["mikrofon"]: (2, 3.0), wyposazenie["drugi"]: (1, 2.0),
+            wyposazenie["kabel"]: (0, 0),
+        }
+
+
+class TestEquipmentViews:
+    def test_details_page(self, client, wyposazenie):
+        resp = client.get(f"/sprzet/{wyposazenie['mikrofon']}")
+
+        assert resp.status_code == 200
+        tresc = resp.data.decode()
+        assert "Zarezerwowane godziny: 6.0" in tresc
+        assert "2025-03-09 10:00:00" in tresc
+        assert client.get("/sprzet/9999").status_code == 404
+
+    def test_json_timeline_and_bulk(self, client, wyposazenie):
+        resp = client.get(f"/api/v1/sprzet/{wyposazenie['mikrofon']}/historia?limit=2")
+
+        dane = resp.get_json()
+        assert dane["sprzet"]["sesje"] == 3
+        assert [row["IdSesji"] for row in dane["dane"]] == [3, 2]
+        nastepna = client.get(
+            f"/api/v1/sprzet/{wyposazenie['mikrofon']}/historia?limit=2&cursor={dane['nastepny']}"
+        ).get_json()
+        assert [row["IdSesji"] for row in nastepna["dane"]] == [1]
+        assert client.get("/api/v1/sprzet/9999/historia").status_code == 404
+
+        zakres = client.get("/api/v1/sprzet/uzycie",
+                            query_string={"od": "2025-03-08 00:00", "do": "2025-04-01 00:00"})
+        zakres = zakres.get_json()
+        assert [(row["IdSprzetu"], row["sesje"]) for row in zakres["dane"]] == [
+            (wyposazenie["mikrofon"], 1), (wyposazenie["drugi"], 0), (wyposazenie["kabel"], 0)]
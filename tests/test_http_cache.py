@@ -0,0 +1,118 @@
+from datetime import datetime
+
+import pytest
+from flask import template_rendered
+
+from app.importer import import_rows
+from app.models import Artysci
+from app.services import (SessionData, create_record,
+                          create_session_with_equipment, get_table_versions,
+                          update_session_with_equipment)
+
+
+@pytest.fixture(name="szablony")
+def fixture_szablony(client):
+    """Nazwy szablonów renderowanych w trakcie testu."""
+    renderowane = []
+
+    def _zapisz(_sender, template, **_extra):
+        renderowane.append(template.name)
+
+    template_rendered.connect(_zapisz, client.application)
+    yield renderowane
+    template_rendered.disconnect(_zapisz, client.application)
+
+
+@pytest.fixture(name="sesja")
+def fixture_sesja(studio):
+    """Sesja z jednym mikrofonem i drugi mikrofon do podmiany."""
+    dane = SessionData(studio["a"], studio["e"], datetime(2025, 6, 2, 10),
+                       datetime(2025, 6, 2, 12), [studio["s1"]])
+    return create_session_with_equipment(dane).IdSesji, dane, studio["s2"]
+
+
+class TestConditionalGet:
+    def test_matching_etag_skips_view_and_template(self, client, szablony, assert_max_queries):
+        create_record(Artysci, Nazwa="Echoes")
+        resp = client.get("/artysci/")
+        etag = resp.headers["ETag"]
+
+        assert etag.startswith('W/"')
+        assert resp.headers["Cache-Control"] == "private, no-cache"
+        assert resp.last_modified is not None
+
+        szablony.clear()
+        with assert_max_queries(1) as stats:
+            resp = client.get("/artysci/", headers={"If-None-Match": etag})
+
+        assert resp.status_code == 304
+        assert resp.get_data() == b""
+        assert resp.headers["ETag"] == etag
+        assert szablony == []
+        assert "wersje_tabel" in next(iter(stats.wykonania))
+
+    def test_write_through_service_changes_etag(self, client):
+        create_record(Artysci, Nazwa="Echoes")
+        etag = client.get("/artysci/").headers["ETag"]
+
+        client.post("/artysci/dodaj", data={"nazwa": "Aurora"})
+        resp = client.get("/artysci/", headers={"If-None-Match": etag})
+
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+        assert "Aurora" in resp.get_data(as_text=True)
+
+    def test_etag_depends_on_query_string(self, client):
+        etag = client.get("/artysci/").headers["ETag"]
+        resp = client.get("/artysci/?sort=Nazwa", headers={"If-None-Match": etag})
+
+        assert resp.status_code == 200
+
+    def test_session_modal_follows_equipment_links(self, client, sesja):
+        idsesji, dane, drugi = sesja
+        etag = client.get(f"/sesje/{idsesji}").headers["ETag"]
+        assert client.get(f"/sesje/{idsesji}", headers={"If-None-Match": etag}).status_code == 304
+
+        dane.sprzet_ids = [drugi]
+        update_session_with_equipment(idsesji, dane)
+        resp = client.get(f"/sesje/{idsesji}", headers={"If-None-Match": etag})
+
+        assert resp.status_code == 200
+        assert "SM7B" in resp.get_data(as_text=True)
+
+    def test_if_modified_since(self, client):
+        create_record(Artysci, Nazwa="Echoes")
+        last_modified = client.get("/artysci/").headers["Last-Modified"]
+
+        resp = client.get("/artysci/", headers={"If-Modified-Since": last_modified})
+
+        assert resp.status_code == 304
+        # Tabela bez zapisów nie ma daty zmiany, więc odpowiedź ma tylko ETag
+        assert "Last-Modified" not in client.get("/artysci/utwory/1").headers
+
+    def test_import_bumps_version(self):
+        import_rows("artysci", iter([{"Nazwa": "Import"}]))
+        import_rows("artysci", iter([{"Nazwa": "Import 2"}]))
+
+        assert get_table_versions(["artysci"])["artysci"][0] == 2
+
+
+class TestCachePolicy:
+    def test_per_blueprint_policy(self, client):
+        client.application.config["CACHE_CONTROL"] = {"sprzet": "private, max-age=60"}
+
+        assert client.get("/sprzet/").headers["Cache-Control"] == "private, max-age=60"
+        assert client.get("/export/artysci.csv").headers.get("Cache-Control") is None
+
+    def test_disabled(self, client):
+        client.application.config["HTTP_CACHE"] = False
+        resp = client.get("/artysci/")
+
+        assert "ETag" not in resp.headers
+        assert "Cache-Control" not in resp.headers
+
+    def test_pending_flash_is_not_cached(self, client):
+        with client.session_transaction() as session:
+            session["_flashes"] = [("error", "Komunikat")]
+
+        assert "ETag" not in client.get("/sesje/").headers
@@ -0,0 +1,191 @@
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import func, inspect, select
+
+from app import create_app, database
+from app.importer import (DataImportError, detect_format, import_rows,
+                          read_rows)
+from app.models import Artysci, Importy, Inzynierowie, Sesje
+from app.services import create_record
+
+
+def _csv(text):
+    return read_rows(io.StringIO(text), "csv")
+
+
+def _ndjson(rows):
+    return read_rows(io.StringIO("".join(json.dumps(row) + "\n" for row in rows)), "ndjson")
+
+
+def _count(model):
+    with database.engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).select_from(model)  # pylint: disable=not-callable
+        ).scalar()
+
+
+@pytest.fixture(name="wykonawcy")
+def fixture_wykonawcy():
+    """Artysta i inżynier, do których odwołują się importowane sesje."""
+    artysta = create_record(Artysci, Nazwa="Import")
+    inzynier = create_record(Inzynierowie, Imie="Imp", Nazwisko="Ort")
+    return artysta.IdArtysty, inzynier.IdInzyniera
+
+
+class TestImportRows:
+    def test_imports_csv_in_chunks(self):
+        calls = []
+        stats = import_rows(
+            "artysci",
+            _csv("IdArtysty,Nazwa,Imie,Nazwisko\n1,Alfa,Jan,\n2,Beta,,Nowak\n3,Gamma,,\n"),
+            chunk_size=2,
+            progress=lambda s: calls.append(s.zaimportowane),
+        )
+
+        assert (stats.wczytane, stats.zaimportowane, stats.bledne) == (3, 3, 0)
+        assert calls == [2, 3]
+        with database.engine.connect() as conn:
+            rows = conn.execute(select(Artysci.IdArtysty, Artysci.Nazwa, Artysci.Imie,
+                                       Artysci.Nazwisko).order_by(Artysci.IdArtysty)).all()
+        assert rows == [(1, "Alfa", "Jan", None), (2, "Beta", None, "Nowak"),
+                        (3, "Gamma", None, None)]
+
+    def test_reports_invalid_rows_and_missing_foreign_keys(self, wykonawcy):
+        idartysty, idinzyniera = wykonawcy
+        dobra = {"IdArtysty": idartysty, "IdInzyniera": idinzyniera,
+                 "TerminStart": "2025/03/01 10:00", "TerminStop": "2025-03-01T12:00"}
+
+        stats = import_rows("sesje", _ndjson([
+            dobra,
+            {**dobra, "IdArtysty": 999},
+            {**dobra, "TerminStart": "jutro"},
+            {**dobra, "TerminStop": "2025-03-01 09:00"},
+            {**dobra, "IdInzyniera": None},
+        ]))
+
+        assert stats.zaimportowane == 1
+        assert [nr for nr, _ in stats.bledy] == [3, 4, 5, 2]
+        assert "IdArtysty=999" in stats.bledy[-1][1]
+        assert "Brak wartości w kolumnie IdInzyniera" in stats.bledy[2][1]
+        with database.engine.connect() as conn:
+            raw = conn.exec_driver_sql('SELECT "TerminStart", "TerminStop" FROM sesje').one()
+        assert tuple(raw) == ("2025-03-01 10:00:00", "2025-03-01 12:00:00")
+
+    def test_rejects_termin_with_utc_offset(self, wykonawcy):
+        idartysty, idinzyniera = wykonawcy
+        dobra = {"IdArtysty": idartysty, "IdInzyniera": idinzyniera,
+                 "TerminStart": "2025-01-01T10:00:00.250", "TerminStop": None}
+
+        stats = import_rows("sesje", _ndjson([
+            dobra, {**dobra, "TerminStart": "2025-01-01T10:00:00+02:00"},
+        ]))
+
+        assert stats.zaimportowane == 1
+        assert [nr for nr, _ in stats.bledy] == [2]
+        assert "strefy czasowej" in stats.bledy[0][1]
+        with database.engine.connect() as conn:
+            raw = conn.exec_driver_sql('SELECT "TerminStart" FROM sesje').scalar()
+        assert raw == "2025-01-01 10:00:00"
+
+    def test_resumes_from_checkpoint_after_interruption(self):
+        tekst = "Nazwa\n" + "".join(f"Zespol {i}\n" for i in range(5))
+
+        def przerwany():
+            for i, row in enumerate(_csv(tekst)):
+                if i == 3:
+                    raise RuntimeError("przerwane połączenie")
+                yield row
+
+        with pytest.raises(RuntimeError):
+            import_rows("artysci", przerwany(), chunk_size=2, checkpoint="plik.csv")
+        assert _count(Artysci) == 2
+
+        stats = import_rows("artysci", _csv(tekst), chunk_size=2, checkpoint="plik.csv")
+
+        assert (stats.pominiete, stats.zaimportowane) == (2, 3)
+        assert _count(Artysci) == 5
+        with database.engine.connect() as conn:
+            assert conn.execute(select(Importy.Wiersze)).scalar() == 5
+
+    def test_duplicate_primary_key_aborts_chunk(self):
+        create_record(Artysci, IdArtysty=1, Nazwa="Istniejacy")
+
+        with pytest.raises(DataImportError, match="Wiersze 1-2"):
+            import_rows("artysci", _csv("IdArtysty,Nazwa\n2,Nowy\n1,Duplikat\n"))
+
+        assert _count(Artysci) == 1
+
+    def test_deferred_indexes_are_rebuilt(self, wykonawcy):
+        idartysty, idinzyniera = wykonawcy
+
+        import_rows("sesje", _csv(
+            "IdArtysty,IdInzyniera,TerminStart\n"
+            f"{idartysty},{idinzyniera},2025-01-01 10:00\n"
+        ), defer_indexes=True)
+
+        indexes = {ix["name"] for ix in inspect(database.engine).get_indexes("sesje")}
+        assert {ix.name for ix in Sesje.__table__.indexes} <= indexes
+        assert _count(Sesje) == 1
+
+    def test_non_object_ndjson_line_is_rejected(self):
+        with pytest.raises(DataImportError, match="Linia 2: oczekiwano obiektu JSON"):
+            import_rows("artysci", read_rows(io.StringIO('{"Nazwa": "A"}\n[1, 2]\n'), "ndjson"))
+        assert _count(Artysci) == 0
+
+    def test_unknown_entity_and_format(self):
+        with pytest.raises(DataImportError, match="Nieznana encja"):
+            import_rows("hasla", iter([]))
+        with pytest.raises(DataImportError, match="Nieobsługiwany format"):
+            detect_format("dane.xlsx")
+
+
+class TestImportEntryPoints:
+    def test_cli_imports_file(self, tmp_path):
+        plik = tmp_path / "artysci.ndjson"
+        plik.write_text('{"Nazwa": "Z pliku"}\n{"Nazwa": ""}\n', encoding="utf-8")
+
+        result = CliRunner().invoke(create_app().cli, ["import", "artysci", str(plik)])
+
+        assert result.exit_code == 0
+        assert "Wczytano 2, zaimportowano 1, błędnych 1" in result.stdout
+        assert "Wiersz 2: Brak wartości w kolumnie Nazwa" in result.stdout
+        assert "Zaimportowano 1 wierszy do artysci." in result.stdout
+
+        again = CliRunner().invoke(create_app().cli, ["import", "artysci", str(plik)])
+        assert "Pominięto 2 wierszy zaimportowanych wcześniej." in again.stdout
+        assert _count(Artysci) == 1
+
+    def test_upload_endpoint_returns_stats(self, client):
+        resp = client.post(
+            "/import/artysci",
+            data={"plik": (io.BytesIO("Nazwa,Imie\nŁąka,Józef\n".encode()), "artysci.csv")},
+            content_type="multipart/form-data",
+        )
+
+        assert resp.status_code == 200
+        assert resp.get_json()["zaimportowane"] == 1
+        assert _count(Artysci) == 1
+
+    def test_upload_endpoint_rejects_unknown_format(self, client):
+        resp = client.post(
+            "/import/artysci",
+            data={"plik": (io.BytesIO(b"x"), "artysci.xlsx")},
+            content_type="multipart/form-data",
+        )
+
+        assert resp.status_code == 400
+        assert "Nieobsługiwany format" in resp.get_json()["blad"]
+
+    def test_upload_endpoint_rejects_non_utf8_file(self, client):
+        resp = client.post(
+            "/import/artysci",
+            data={"plik": (io.BytesIO("Nazwa\nŁąka\n".encode("cp1250")), "artysci.csv")},
+            content_type="multipart/form-data",
+        )
+
+        assert resp.status_code == 400
+        assert "UTF-8" in resp.get_json()["blad"]
+        assert _count(Artysci) == 0
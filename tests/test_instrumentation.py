@@ -0,0 +1,94 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import database
+from app.instrumentation import QueryStats, capture_queries
+from app.models import Artysci, Inzynierowie
+from app.services import (SessionData, create_record,
+                          create_session_with_equipment, get_all_sorted)
+
+
+@pytest.fixture(name="sesje")
+def fixture_sesje(create_song):
+    """Pięć sesji różnych artystów i inżynierów, każda z jednym utworem."""
+    start = datetime(2025, 1, 1, 10, 0)
+    for i in range(5):
+        artysta = create_record(Artysci, Nazwa=f"Artysta {i}")
+        inzynier = create_record(Inzynierowie, Imie="Inż", Nazwisko=f"N{i}")
+        sesja = create_session_with_equipment(SessionData(
+            artysta.IdArtysty, inzynier.IdInzyniera,
+            start + timedelta(days=i), start + timedelta(days=i, hours=2), [],
+        ))
+        create_song(artysta, sesja, tytul=f"Utwor {i}")
+
+
+class TestQueryStats:
+    def test_records_count_time_slowest_and_duplicates(self):
+        stats = QueryStats()
+        for i in range(7):
+            stats.record("SELECT 1" if i % 2 else f"SELECT {i}", i / 1000)
+
+        assert stats.count == 7
+        assert stats.czas == pytest.approx(0.021)
+        assert [czas for czas, _ in stats.najwolniejsze] == [0.006, 0.005, 0.004, 0.003, 0.002]
+        assert stats.duplikaty == {"SELECT 1": 3}
+
+    def test_capture_queries_counts_service_calls(self):
+        with capture_queries() as stats:
+            get_all_sorted(Artysci)
+            get_all_sorted(Artysci)
+
+        assert stats.count == 2
+        assert list(stats.duplikaty.values()) == [2]
+
+    def test_failed_statement_leaves_no_start_time(self):
+        with capture_queries() as stats, database.engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql("SELECT * FROM nie_ma_takiej_tabeli")
+            time.sleep(0.05)
+            start = time.perf_counter()
+            conn.exec_driver_sql("SELECT 1")
+            elapsed = time.perf_counter() - start
+
+        # Start nieudanego zapytania nie może zostać doliczony do następnego
+        assert list(stats.wykonania) == ["SELECT 1"]
+        assert stats.czas <= elapsed
+
+
+class TestRequestInstrumentation:
+    def test_server_timing_header(self, client):
+        resp = client.get("/artysci/")
+
+        assert resp.headers["Server-Timing"].startswith("db;dur=")
+        # Lista artystów i odczyt wersji tabel dla ETag
+        assert 'desc="SQL: 2 zapytan"' in resp.headers["Server-Timing"]
+
+    def test_server_timing_covers_request_commit(self, client):
+        resp = client.post("/artysci/dodaj", data={"nazwa": "Nowy"})
+
+        # INSERT artysty, podbicie wersje_tabel przy zatwierdzeniu i sam COMMIT
+        assert resp.status_code == 302
+        assert 'desc="SQL: 3 zapytan"' in resp.headers["Server-Timing"]
+
+    def test_debug_panel_only_when_enabled(self, client):
+        assert 'id="panel-sql"' not in client.get("/artysci/").get_data(as_text=True)
+
+        client.application.config["SQL_DEBUG_PANEL"] = True
+        html = client.get("/artysci/").get_data(as_text=True)
+
+        assert 'id="panel-sql"' in html
+        assert html.index('id="panel-sql"') < html.index("</body>")
+        assert "SELECT" in html
+
+    @pytest.mark.parametrize("url", ["/sesje/", "/sesje/?sort=NazwaArtysty", "/utwory/",
+                                     "/utwory/?sort=Nazwisko"])
+    def test_list_views_have_no_n_plus_one(self, client, sesje, assert_max_queries, url):
+        # pylint: disable=unused-argument
+        # Jedno zapytanie listy plus odczyt wersji tabel dla ETag
+        with assert_max_queries(2):
+            resp = client.get(url)
+
+        assert resp.status_code == 200
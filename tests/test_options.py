@@ -0,0 +1,92 @@
+import re
+from datetime import datetime
+
+from app.models import Artysci, Inzynierowie
+from app.options import form_options, get_options
+from app.services import SessionData, create_record, create_session_with_equipment
+
+
+def _artysci(n):
+    return [create_record(Artysci, Nazwa=f"Artysta {i:03d}", Imie="Jan").IdArtysty
+            for i in range(n)]
+
+
+class TestOptions:
+    def test_pages_follow_cursor_in_name_order(self):
+        _artysci(45)
+
+        pierwsza = get_options("artysci", per_page=20)
+        druga = get_options("artysci", cursor=pierwsza.next_cursor, per_page=20)
+        trzecia = get_options("artysci", cursor=druga.next_cursor, per_page=20)
+
+        etykiety = [row["etykieta"] for page in (pierwsza, druga, trzecia) for row in page]
+        assert etykiety == [f"Artysta {i:03d} - Jan" for i in range(45)]
+        assert trzecia.next_cursor is None
+
+    def test_prefix_uses_search_index(self):
+        create_record(Artysci, Nazwa="Łzy")
+        create_record(Artysci, Nazwa="Lady Pank")
+        create_record(Artysci, Nazwa="Kult")
+
+        assert [row["Nazwa"] for row in get_options("artysci", "l")] == ["Lady Pank", "Łzy"]
+        assert [row["Nazwa"] for row in get_options("artysci", "lzy")] == ["Łzy"]
+
+    def test_sessions_filtered_by_artist_newest_first(self):
+        a, b = _artysci(2)
+        inzynier = create_record(Inzynierowie, Imie="I", Nazwisko="N").IdInzyniera
+        for idartysty, dzien in ((a, 1), (b, 2), (a, 3)):
+            start = datetime(2025, 1, dzien, 10)
+            create_session_with_equipment(SessionData(idartysty, inzynier, start, start, []))
+
+        sesje = get_options("sesje", idartysty=a)
+
+        assert [row["TerminStart"].day for row in sesje] == [3, 1]
+        assert sesje.items[0]["etykieta"].endswith("Artysta 000 (2025-01-03 10:00)")
+
+    def test_form_options_put_selected_first(self):
+        ids = _artysci(30)
+
+        opcje = form_options("artysci", [ids[-1]])
+
+        assert opcje["wybrane"] == {ids[-1]}
+        assert opcje["opcje"][0]["id"] == ids[-1]
+        assert len(opcje["opcje"]) == 21 and opcje["next_cursor"]
+
+
+class TestOptionEndpoints:
+    def test_form_html_does_not_grow_with_catalogue(self, client, assert_max_queries):
+        _artysci(25)
+        client.get("/sesje/dodaj")
+        maly = len(client.get("/sesje/dodaj").data)
+        _artysci(500)
+        client.get("/sesje/dodaj")
+
+        # Tylko odczyt wersji tabel list
+        with assert_max_queries(1):
+            resp = client.get("/sesje/dodaj")
+
+        assert len(resp.data) == maly
+        assert 'data-lista-wiecej="artysta"' in resp.get_data(as_text=True)
+
+    def test_json_type_ahead_and_unknown_entity(self, client):
+        _artysci(3)
+        create_record(Artysci, Nazwa="Zenek")
+
+        resp = client.get("/szukaj/opcje/artysci?q=zen")
+        assert resp.get_json() == {"opcje": [{"id": 4, "etykieta": "Zenek"}],
+                                   "next_cursor": None}
+        strona = client.get("/szukaj/opcje/artysci?limit=2").get_json()
+        assert len(strona["opcje"]) == 2 and strona["next_cursor"]
+        assert client.get("/szukaj/opcje/utwory").status_code == 404
+
+    def test_edit_form_preselects_session_values(self, client):
+        ids = _artysci(30)
+        inzynier = create_record(Inzynierowie, Imie="Ola", Nazwisko="Nowak").IdInzyniera
+        start = datetime(2025, 1, 1, 10)
+        sesja = create_session_with_equipment(SessionData(ids[-1], inzynier, start, start, []))
+
+        html = client.get(f"/sesje/edytuj/{sesja.IdSesji}").get_data(as_text=True)
+
+        assert "selected" in re.search(rf'<option value="{ids[-1]}"[^>]*>', html).group(0)
+        inzynierowie = html.split('name="inzynier"')[1]
+        assert "selected" in re.search(rf'<option value="{inzynier}"[^>]*>', inzynierowie).group(0)
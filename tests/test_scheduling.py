@@ -0,0 +1,208 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import database
+from app.models import Artysci, Inzynierowie, Sesje, Sprzet
+from app.scheduling import (MAX_SESSION_DURATION, SchedulingError,
+                            SessionConflictError, SlotQuery, find_conflicts,
+                            merge_intervals)
+from app.services import (SessionData, create_record,
+                          create_session_with_equipment, get_db_session,
+                          get_free_slots, update_session_with_equipment)
+
+
+@pytest.fixture(name="zasoby")
+def fixture_zasoby():
+    """Dwóch artystów, dwóch inżynierów i dwa mikrofony."""
+    return {
+        "a1": create_record(Artysci, Nazwa="A1").IdArtysty,
+        "a2": create_record(Artysci, Nazwa="A2").IdArtysty,
+        "e1": create_record(Inzynierowie, Imie="E", Nazwisko="1").IdInzyniera,
+        "e2": create_record(Inzynierowie, Imie="E", Nazwisko="2").IdInzyniera,
+        "s1": create_record(Sprzet, Producent="Neumann", Model="U87").IdSprzetu,
+        "s2": create_record(Sprzet, Producent="Shure", Model="SM7B").IdSprzetu,
+    }
+
+
+def _dane(idartysty, idinzyniera, start_h, stop_h, sprzet_ids=()):
+    day = datetime(2026, 3, 2)
+    return SessionData(
+        idartysty=idartysty,
+        idinzyniera=idinzyniera,
+        terminstart=day + timedelta(hours=start_h),
+        terminstop=day + timedelta(hours=stop_h),
+        sprzet_ids=list(sprzet_ids),
+    )
+
+
+class TestConflictDetection:
+    def test_rejects_double_booked_engineer(self, zasoby):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 14))
+
+        with pytest.raises(SessionConflictError) as exc:
+            create_session_with_equipment(_dane(zasoby["a2"], zasoby["e1"], 13, 16))
+
+        assert [c.zasob for c in exc.value.conflicts] == ["Inżynier"]
+
+    def test_rejects_double_booked_artist(self, zasoby):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 14))
+
+        with pytest.raises(SessionConflictError) as exc:
+            create_session_with_equipment(_dane(zasoby["a1"], zasoby["e2"], 9, 11))
+
+        assert [c.zasob for c in exc.value.conflicts] == ["Artysta"]
+
+    def test_rejects_double_booked_equipment(self, zasoby):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 14, [zasoby["s1"]]))
+
+        with pytest.raises(SessionConflictError) as exc:
+            create_session_with_equipment(
+                _dane(zasoby["a2"], zasoby["e2"], 11, 12, [zasoby["s2"], zasoby["s1"]])
+            )
+
+        assert [(c.zasob, c.id_zasobu) for c in exc.value.conflicts] == [("Sprzęt", zasoby["s1"])]
+
+    def test_rejected_booking_is_rolled_back(self, zasoby, db_session):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 14))
+
+        with pytest.raises(SessionConflictError):
+            create_session_with_equipment(_dane(zasoby["a2"], zasoby["e1"], 12, 13))
+
+        assert db_session.query(Sesje).count() == 1
+
+    def test_adjacent_sessions_do_not_conflict(self, zasoby):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 14, [zasoby["s1"]]))
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 14, 18, [zasoby["s1"]]))
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 6, 10, [zasoby["s1"]]))
+
+    def test_update_ignores_own_booking_but_detects_others(self, zasoby):
+        own = create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 14))
+        create_session_with_equipment(_dane(zasoby["a2"], zasoby["e2"], 16, 18, [zasoby["s1"]]))
+
+        update_session_with_equipment(own.IdSesji, _dane(zasoby["a1"], zasoby["e1"], 11, 15))
+
+        with pytest.raises(SessionConflictError):
+            update_session_with_equipment(
+                own.IdSesji, _dane(zasoby["a1"], zasoby["e1"], 11, 17, [zasoby["s1"]])
+            )
+
+    def test_rejects_stop_before_start_and_too_long_sessions(self, zasoby):
+        with pytest.raises(SchedulingError, match="wcześniejszy"):
+            create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 9))
+
+        too_long = MAX_SESSION_DURATION.total_seconds() / 3600 + 1
+        with pytest.raises(SchedulingError, match="dłużej"):
+            create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 0, too_long))
+
+    def test_long_session_started_earlier_is_still_detected(self, zasoby):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], -24 * 10, 24))
+
+        with get_db_session() as session:
+            conflicts = find_conflicts(session, _dane(zasoby["a2"], zasoby["e1"], 2, 3))
+
+        assert len(conflicts) == 1
+
+    def test_engineer_check_uses_range_index(self):
+        probe = (
+            "EXPLAIN QUERY PLAN SELECT IdSesji FROM sesje WHERE IdInzyniera = 1 "
+            "AND TerminStart > '2026-01-01' AND TerminStart < '2026-01-02' "
+            "AND TerminStop > '2026-01-01'"
+        )
+        with database.engine.connect() as conn:
+            plan = " ".join(row[3] for row in conn.exec_driver_sql(probe))
+
+        assert ("ix_sesje_IdInzyniera_TerminStart "
+                "(IdInzyniera=? AND TerminStart>? AND TerminStart<?)") in plan
+
+
+class TestConflictEndpoints:
+    def test_dodaj_sesje_conflict_flashes_message(self, zasoby, client):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 14))
+
+        resp = client.post("/sesje/dodaj", data={
+            "artysta": str(zasoby["a2"]),
+            "inzynier": str(zasoby["e1"]),
+            "termin_start": "2026-03-02 12:00",
+            "termin_stop": "2026-03-02 13:00",
+        })
+
+        assert resp.status_code == 200
+        assert "Konflikt terminów" in resp.get_data(as_text=True)
+
+
+class TestFreeSlots:
+    @staticmethod
+    def _query(godziny, **kwargs):
+        return SlotQuery(
+            duration=timedelta(hours=godziny),
+            window_start=datetime(2026, 3, 2, 8),
+            window_end=datetime(2026, 3, 2, 20),
+            **kwargs,
+        )
+
+    def test_merge_intervals_joins_overlapping_and_touching(self):
+        day = datetime(2026, 1, 1)
+        h = [day.replace(hour=hour) for hour in range(24)]
+
+        merged = merge_intervals([(h[12], h[14]), (h[9], h[10]), (h[10], h[11]), (h[13], h[15])])
+
+        assert merged == [(h[9], h[11]), (h[12], h[15])]
+
+    def test_sweeps_gaps_between_engineer_and_equipment_bookings(self, zasoby):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 12))
+        create_session_with_equipment(_dane(zasoby["a2"], zasoby["e2"], 13, 15, [zasoby["s1"]]))
+        create_session_with_equipment(_dane(zasoby["a2"], zasoby["e2"], 16, 17, [zasoby["s2"]]))
+
+        slots = get_free_slots(self._query(
+            1, idinzyniera=zasoby["e1"], sprzet_ids=[zasoby["s1"]]
+        ))
+
+        day = datetime(2026, 3, 2)
+        assert slots == [
+            (day.replace(hour=8), day.replace(hour=10)),
+            (day.replace(hour=12), day.replace(hour=13)),
+            (day.replace(hour=15), day.replace(hour=20)),
+        ]
+
+    def test_skips_gaps_shorter_than_duration(self, zasoby):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 9, 12))
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 14, 19))
+
+        slots = get_free_slots(self._query(3, idartysty=zasoby["a1"]))
+
+        assert not slots
+
+    def test_rejects_invalid_window(self):
+        query = self._query(1)
+        query.window_end = query.window_start
+
+        with pytest.raises(SchedulingError):
+            get_free_slots(query)
+
+    def test_endpoint_returns_json_slots(self, zasoby, client):
+        create_session_with_equipment(_dane(zasoby["a1"], zasoby["e1"], 10, 18))
+
+        resp = client.get("/sesje/wolne-terminy", query_string={
+            "inzynier": zasoby["e1"], "godziny": 2,
+            "od": "2026-03-02 08:00", "do": "2026-03-02 22:00",
+        })
+
+        assert resp.status_code == 200
+        assert resp.get_json() == {"wolne_terminy": [
+            {"od": "2026-03-02 08:00:00", "do": "2026-03-02 10:00:00"},
+            {"od": "2026-03-02 18:00:00", "do": "2026-03-02 22:00:00"},
+        ]}
+
+    def test_endpoint_rejects_missing_duration(self, client):
+        resp = client.get("/sesje/wolne-terminy?od=2026-03-02 08:00&do=2026-03-03 08:00")
+
+        assert resp.status_code == 400
+        assert "godziny" in resp.get_json()["blad"]
+
+    @pytest.mark.parametrize("godziny", ["inf", "nan", "0", "-1", "337", "1e308"])
+    def test_endpoint_rejects_out_of_range_duration(self, client, godziny):
+        resp = client.get("/sesje/wolne-terminy", query_string={"godziny": godziny})
+
+        assert resp.status_code == 400
+        assert "godzin" in resp.get_json()["blad"]
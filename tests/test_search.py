@@ -0,0 +1,84 @@
+import pytest
+from click.testing import CliRunner
+
+from app import create_app, database
+from app.models import Artysci, Sprzet
+from app.search import build_match_query, search, search_all
+from app.services import create_record, get_by_id, get_db_session, update_record
+
+
+@pytest.fixture(name="katalog")
+def fixture_katalog():
+    """Artyści z polskimi znakami i sprzęt o podobnych nazwach."""
+    return {
+        "lzy": create_record(Artysci, Nazwa="Łzy", Imie="Józef", Nazwisko="Żółć").IdArtysty,
+        "lady": create_record(Artysci, Nazwa="Lady Pank").IdArtysty,
+        "mic": create_record(Sprzet, Producent="Shure", Model="SM58",
+                             Kategoria="Mikrofony").IdSprzetu,
+        "shure": create_record(Sprzet, Producent="Shure", Model="Shure Beta",
+                               Kategoria="Mikrofony").IdSprzetu,
+    }
+
+
+def _ids(results):
+    return [result["id"] for result in results]
+
+
+class TestSearch:
+    @pytest.mark.parametrize("query", ["lzy", "ŁZY", "jozef", "zolc", "Żółć józ"])
+    def test_matches_without_polish_diacritics(self, katalog, query):
+        assert _ids(search("artysci", query)) == [katalog["lzy"]]
+
+    def test_prefix_query_and_ranking(self, katalog):
+        assert _ids(search("artysci", "la")) == [katalog["lady"]]
+        # Dwa trafienia słowa "shure" w jednym rekordzie dają wyższą pozycję
+        assert _ids(search("sprzet", "shu")) == [katalog["shure"], katalog["mic"]]
+
+    def test_best_match_beyond_candidate_limit(self, monkeypatch):
+        monkeypatch.setattr("app.search.MAX_CANDIDATES", 3)
+        for i in range(5):
+            create_record(Sprzet, Producent="Shure", Model=f"M{i}")
+        najlepszy = create_record(Sprzet, Producent="Shure", Model="Shure Shure").IdSprzetu
+
+        assert _ids(search("sprzet", "shure", limit=1)) == [najlepszy]
+
+    def test_index_follows_updates_and_deletes(self, katalog):
+        update_record(get_by_id(Artysci, katalog["lady"]), Nazwa="Wilki")
+        assert search("artysci", "lady") == []
+        assert _ids(search("artysci", "wilk")) == [katalog["lady"]]
+
+        with get_db_session() as session:
+            session.delete(session.get(Artysci, katalog["lady"]))
+        assert search("artysci", "wilk") == []
+
+    def test_fts_operators_are_treated_as_text(self, katalog):
+        assert build_match_query('Lady" OR NEAR(x*') == '"Lady"* "OR"* "NEAR"* "x"*'
+        assert search("artysci", "lady OR") == []
+        assert search("artysci", "  ***  ") == []
+        assert _ids(search_all("lady")) == [katalog["lady"]]
+
+    def test_rebuild_restores_index(self, katalog):
+        with database.engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM szukaj_sprzet")
+
+        result = CliRunner().invoke(create_app().cli, ["rebuild-search"])
+
+        assert "Indeks wyszukiwania sprzet: 2 rekordów" in result.stdout
+        assert _ids(search("sprzet", "sm58")) == [katalog["mic"]]
+
+
+class TestSearchEndpoints:
+    def test_search_page_groups_results(self, client, katalog):  # pylint: disable=W0613
+        resp = client.get("/szukaj/?q=shure")
+
+        html = resp.get_data(as_text=True)
+        assert resp.status_code == 200
+        assert "Sprzęt" in html and "Shure SM58" in html
+        assert "Brak wyników" in client.get("/szukaj/?q=xyz").get_data(as_text=True)
+
+    def test_autocomplete_returns_json(self, client, katalog):
+        resp = client.get("/szukaj/podpowiedzi?q=łz&limit=5")
+
+        assert resp.get_json() == [{"encja": "artysci", "id": katalog["lzy"],
+                                    "etykieta": "Łzy Józef Żółć",
+                                    "ranking": resp.get_json()[0]["ranking"]}]
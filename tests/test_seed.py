@@ -19,3 +19,17 @@ def test_seed_cli_calls_database(mock_db_seed):
 
     assert result.exit_code == 0
     assert 'Baza zaseedowana!' in result.stdout
+
+def test_normalize_dates_cli_reports_progress(monkeypatch):
+    app = create_app()
+    monkeypatch.setattr(
+        "app.normalize_session_dates",
+        lambda batch_size, progress: progress({"sprawdzone": batch_size, "poprawione": 1})
+        or {"bledne": [7]},
+    )
+
+    result = CliRunner().invoke(app.cli, ["normalize-dates", "--batch-size", "10"])
+
+    assert result.exit_code == 0
+    assert "Sprawdzono 10, poprawiono 1" in result.stdout
+    assert "Nie rozpoznano dat w sesjach: [7]" in result.stdout
@@ -1,14 +1,25 @@
-from datetime import datetime
+import sqlite3
+from datetime import datetime, timedelta
 
 import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.models import (Artysci, Inzynierowie, Sesje, Sprzet, SprzetySesje,
                         Utwory)
-from app.services import (SessionData, create_record,
-                          create_session_with_equipment, get_all_sorted,
-                          get_by_id, get_session_details, get_sessions_sorted,
+from app import database
+from app.database import base
+from app.instrumentation import capture_queries
+from app.services import (DateRange, SessionData, create_record,
+                          create_session_with_equipment, decode_cursor,
+                          encode_cursor,
+                          get_all_sorted, get_by_id, get_selected_sprzet_ids,
+                          get_session_details, get_sessions_details,
+                          get_sessions_sorted,
                           get_utwory_by_artist, get_utwory_sorted,
-                          update_record)
+                          normalize_session_dates, update_record,
+                          update_session_with_equipment)
 
 
 class TestServices:
@@ -86,7 +97,7 @@ class TestServices:
             Sesje,
             IdArtysty=a1.IdArtysty,
             IdInzyniera=eng.IdInzyniera,
-            TerminStart="2025-01-01",
+            TerminStart=datetime(2025, 1, 1),
             TerminStop=None,
         )
 
@@ -105,7 +116,7 @@ class TestServices:
             Sesje,
             IdArtysty=a1.IdArtysty,
             IdInzyniera=eng.IdInzyniera,
-            TerminStart="2025-01-01",
+            TerminStart=datetime(2025, 1, 1),
             TerminStop=None,
         )
 
@@ -122,7 +133,7 @@ class TestServices:
             Sesje,
             IdArtysty=a.IdArtysty,
             IdInzyniera=eng.IdInzyniera,
-            TerminStart="2025-01-01",
+            TerminStart=datetime(2025, 1, 1),
             TerminStop=None,
         )
 
@@ -141,14 +152,14 @@ class TestServices:
             Sesje,
             IdArtysty=a1.IdArtysty,
             IdInzyniera=eng.IdInzyniera,
-            TerminStart="2025-01-01",
+            TerminStart=datetime(2025, 1, 1),
             TerminStop=None
         )
         create_record(
             Sesje,
             IdArtysty=a2.IdArtysty,
             IdInzyniera=eng.IdInzyniera,
-            TerminStart="2025-01-02",
+            TerminStart=datetime(2025, 1, 2),
             TerminStop=None
         )
 
@@ -165,14 +176,14 @@ class TestServices:
             Sesje,
             IdArtysty=artist.IdArtysty,
             IdInzyniera=e1.IdInzyniera,
-            TerminStart="2025-01-01",
+            TerminStart=datetime(2025, 1, 1),
             TerminStop=None
         )
         create_record(
             Sesje,
             IdArtysty=artist.IdArtysty,
             IdInzyniera=e2.IdInzyniera,
-            TerminStart="2025-01-02",
+            TerminStart=datetime(2025, 1, 2),
             TerminStop=None
         )
 
@@ -186,7 +197,7 @@ class TestServices:
             Sesje,
             IdArtysty=artist.IdArtysty,
             IdInzyniera=eng.IdInzyniera,
-            TerminStart="2025-01-01",
+            TerminStart=datetime(2025, 1, 1),
             TerminStop=None,
         )
 
@@ -221,3 +232,376 @@ class TestServices:
 
         assert nowa.IdSesji is not None
         assert db_session.query(SprzetySesje).filter_by(IdSesji=nowa.IdSesji).count() == 2
+
+
+class _LiczacyKursor(sqlite3.Cursor):
+    wiersze = 0
+
+    def fetchone(self):
+        row = super().fetchone()
+        _LiczacyKursor.wiersze += row is not None
+        return row
+
+    def fetchmany(self, *args):
+        rows = super().fetchmany(*args)
+        _LiczacyKursor.wiersze += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        _LiczacyKursor.wiersze += len(rows)
+        return rows
+
+
+class _LiczacePolaczenie(sqlite3.Connection):
+    def cursor(self, factory=None):
+        return super().cursor(factory or _LiczacyKursor)
+
+
+class TestSessionDetailsBatch:
+    UTWORY = 4
+    SPRZET = 3
+
+    @pytest.fixture(name="licznik_wierszy")
+    def fixture_licznik_wierszy(self, monkeypatch):
+        """Baza w pamięci, której kursory liczą wiersze pobrane z SQLite."""
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={
+            "factory": _LiczacePolaczenie, "check_same_thread": False})
+        base.metadata.create_all(engine)
+        monkeypatch.setattr(database, "engine", engine)
+        monkeypatch.setattr(database, "session", sessionmaker(bind=engine, expire_on_commit=False))
+        yield _LiczacyKursor
+        engine.dispose()
+
+    def _sesje(self, n):
+        artysta = create_record(Artysci, Nazwa="Batch").IdArtysty
+        inzynier = create_record(Inzynierowie, Imie="I", Nazwisko="N").IdInzyniera
+        sprzet = [create_record(Sprzet, Model=f"M{i}").IdSprzetu for i in range(self.SPRZET)]
+        ids = []
+        for i in range(n):
+            start = datetime(2025, 1, 1, 10) + timedelta(days=i)
+            sesja = create_session_with_equipment(
+                SessionData(artysta, inzynier, start, start + timedelta(hours=1), sprzet))
+            for j in range(self.UTWORY):
+                create_record(Utwory, IdArtysty=artysta, IdSesji=sesja.IdSesji, Tytul=f"{i}.{j}")
+            ids.append(sesja.IdSesji)
+        return ids
+
+    def test_rows_fetched_grow_linearly(self, licznik_wierszy):
+        ids = self._sesje(20)
+
+        wiersze = {}
+        for n in (5, 10, 20):
+            licznik_wierszy.wiersze = 0
+            with capture_queries() as stats:
+                sesje = get_sessions_details(ids[:n])
+            wiersze[n] = licznik_wierszy.wiersze
+            assert stats.count == 3
+            assert [s.IdSesji for s in sesje] == ids[:n]
+            assert all(len(s.utwory) == self.UTWORY and len(s.sprzety_sesje) == self.SPRZET
+                       for s in sesje)
+
+        # Sesja, jej utwory i powiązania ze sprzętem - bez iloczynu utwory x sprzęt
+        assert wiersze == {n: n * (1 + self.UTWORY + self.SPRZET) for n in (5, 10, 20)}
+
+    def test_keeps_requested_order_and_skips_missing(self):
+        artysta = create_record(Artysci, Nazwa="A").IdArtysty
+        ids = [create_session_with_equipment(SessionData(
+            artysta, None, datetime(2025, 1, d), None, [])).IdSesji for d in (1, 2)]
+
+        assert [s.IdSesji for s in get_sessions_details([ids[1], 999, ids[0]])] == ids[::-1]
+
+    def test_endpoint_renders_each_session(self, client):
+        artysta = create_record(Artysci, Nazwa="BatchArtist").IdArtysty
+        ids = [create_session_with_equipment(SessionData(
+            artysta, None, datetime(2025, 1, d), None, [])).IdSesji for d in (1, 2)]
+
+        resp = client.get(f"/sesje/detale?ids={ids[1]},{ids[0]}")
+        html = resp.get_data(as_text=True)
+
+        assert resp.status_code == 200
+        assert html.count("<template") == 2
+        assert html.index(f'data-session-id="{ids[1]}"') < html.index(
+            f'data-session-id="{ids[0]}"')
+        assert "BatchArtist" in html
+        assert client.get("/sesje/detale?ids=1,x").status_code == 400
+        assert client.get("/sesje/detale").status_code == 400
+
+
+class TestKeysetPagination:
+    """Stronicowanie kursorem (keyset) w serwisach list."""
+
+    def test_get_all_sorted_pages_forward_with_pk_tiebreak(self):
+        for nazwa in ["B", "A", "B", "C", "A"]:
+            create_record(Artysci, Nazwa=nazwa)
+
+        first = get_all_sorted(Artysci, "Nazwa", "asc", per_page=2)
+        second = get_all_sorted(Artysci, "Nazwa", "asc", first.next_cursor, 2)
+        third = get_all_sorted(Artysci, "Nazwa", "asc", second.next_cursor, 2)
+
+        assert [(a.Nazwa, a.IdArtysty) for a in first] == [("A", 2), ("A", 5)]
+        assert [(a.Nazwa, a.IdArtysty) for a in second] == [("B", 1), ("B", 3)]
+        assert [(a.Nazwa, a.IdArtysty) for a in third] == [("C", 4)]
+        assert first.prev_cursor is None
+        assert third.next_cursor is None
+
+    def test_get_all_sorted_prev_cursor_returns_previous_page(self):
+        for nazwa in ["E", "D", "C", "B", "A"]:
+            create_record(Artysci, Nazwa=nazwa)
+
+        first = get_all_sorted(Artysci, "Nazwa", "desc", per_page=2)
+        second = get_all_sorted(Artysci, "Nazwa", "desc", first.next_cursor, 2)
+        back = get_all_sorted(Artysci, "Nazwa", "desc", second.prev_cursor, 2)
+
+        assert [a.Nazwa for a in second] == ["C", "B"]
+        assert [a.Nazwa for a in back] == ["E", "D"]
+        assert back.prev_cursor is None
+        assert back.next_cursor is not None
+
+    def test_pagination_handles_null_sort_keys(self):
+        create_record(Artysci, Nazwa="X", Imie=None)
+        create_record(Artysci, Nazwa="Y", Imie="Adam")
+        create_record(Artysci, Nazwa="Z", Imie=None)
+
+        for order in ("asc", "desc"):
+            seen, cursor = [], None
+            while True:
+                page = get_all_sorted(Artysci, "Imie", order, cursor, 1)
+                seen.extend(a.Nazwa for a in page)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+            assert sorted(seen) == ["X", "Y", "Z"]
+
+    def test_get_sessions_sorted_pages_by_joined_column(self):
+        eng = create_record(Inzynierowie, Imie="E", Nazwisko="X")
+        for nazwa in ["Zenek", "Adam", "Marek"]:
+            artist = create_record(Artysci, Nazwa=nazwa)
+            create_record(Sesje, IdArtysty=artist.IdArtysty, IdInzyniera=eng.IdInzyniera,
+                          TerminStart=datetime(2025, 1, 1), TerminStop=None)
+
+        first = get_sessions_sorted(sortby="NazwaArtysty", order="asc", per_page=2)
+        second = get_sessions_sorted(sortby="NazwaArtysty", order="asc",
+                                     cursor=first.next_cursor, per_page=2)
+
+        assert [s.artysci.Nazwa for s in first] == ["Adam", "Marek"]
+        assert [s.artysci.Nazwa for s in second] == ["Zenek"]
+
+    def test_get_utwory_sorted_pages(self):
+        artist = create_record(Artysci, Nazwa="Band")
+        eng = create_record(Inzynierowie, Imie="E", Nazwisko="X")
+        sesja = create_record(Sesje, IdArtysty=artist.IdArtysty, IdInzyniera=eng.IdInzyniera,
+                              TerminStart=datetime(2025, 1, 1), TerminStop=None)
+        for tytul in ["C", "A", "B"]:
+            create_record(Utwory, IdArtysty=artist.IdArtysty, IdSesji=sesja.IdSesji, Tytul=tytul)
+
+        first = get_utwory_sorted(sortby="Tytul", order="asc", per_page=2)
+        second = get_utwory_sorted(sortby="Tytul", order="asc",
+                                   cursor=first.next_cursor, per_page=2)
+
+        assert [u.Tytul for u in first] == ["A", "B"]
+        assert [u.Tytul for u in second] == ["C"]
+
+    def test_cursor_for_other_sort_is_ignored(self):
+        for nazwa in ("C", "A", "B"):
+            create_record(Artysci, Nazwa=nazwa)
+
+        by_name = get_all_sorted(Artysci, sort_by="Nazwa", per_page=2)
+        by_id_desc = get_all_sorted(Artysci, order="desc", cursor=by_name.next_cursor,
+                                    per_page=2)
+
+        assert [a.Nazwa for a in by_id_desc] == ["B", "A"]
+
+    def test_cursor_with_wrong_key_type_restarts_listing(self):
+        self._sesje_na_kursor()
+
+        cursor = encode_cursor("abc", 1, sort=("Sesje.TerminStart", "asc"))
+        page = get_sessions_sorted(sortby="TerminStart", per_page=2, cursor=cursor)
+
+        assert [s.TerminStart.month for s in page] == [1, 2]
+
+    @staticmethod
+    def _sesje_na_kursor():
+        artist = create_record(Artysci, Nazwa="Band")
+        eng = create_record(Inzynierowie, Imie="E", Nazwisko="X")
+        for month in (1, 2, 3):
+            create_record(Sesje, IdArtysty=artist.IdArtysty, IdInzyniera=eng.IdInzyniera,
+                          TerminStart=datetime(2025, month, 1))
+
+    def test_decode_cursor_rejects_garbage(self):
+        assert decode_cursor("nie-kursor!!") is None
+        assert decode_cursor(None) is None
+
+
+class TestSessionDates:
+    """Terminy sesji jako DATETIME: filtry zakresu i migracja danych."""
+
+    @staticmethod
+    def _sesje(*starts):
+        artist = create_record(Artysci, Nazwa="Band")
+        eng = create_record(Inzynierowie, Imie="E", Nazwisko="X")
+        return [
+            create_record(Sesje, IdArtysty=artist.IdArtysty, IdInzyniera=eng.IdInzyniera,
+                          TerminStart=start, TerminStop=None)
+            for start in starts
+        ]
+
+    def test_get_sessions_sorted_filters_by_date_range(self):
+        self._sesje(datetime(2025, 1, 1, 9), datetime(2025, 1, 5, 9), datetime(2025, 2, 1, 9))
+
+        result = get_sessions_sorted(
+            sortby="TerminStart",
+            termin=DateRange(od=datetime(2025, 1, 2), do=datetime(2025, 2, 1, 9)),
+        )
+
+        assert [s.TerminStart for s in result] == [datetime(2025, 1, 5, 9)]
+
+    def test_get_sessions_sorted_paginates_by_datetime_cursor(self):
+        self._sesje(datetime(2025, 3, 1), datetime(2025, 1, 1), datetime(2025, 2, 1))
+
+        first = get_sessions_sorted(sortby="TerminStart", order="desc", per_page=2)
+        second = get_sessions_sorted(sortby="TerminStart", order="desc",
+                                     cursor=first.next_cursor, per_page=2)
+
+        assert [s.TerminStart.month for s in first] == [3, 2]
+        assert [s.TerminStart.month for s in second] == [1]
+
+    def test_terminy_are_stored_in_canonical_format(self):
+        self._sesje(datetime(2025, 1, 1, 9, 30))
+
+        with database.engine.connect() as conn:
+            raw = conn.exec_driver_sql("SELECT TerminStart FROM sesje").scalar()
+
+        assert raw == "2025-01-01 09:30:00"
+
+    def test_normalize_session_dates_rewrites_legacy_formats(self):
+        with database.engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO sesje (IdSesji, TerminStart, TerminStop) VALUES "
+                "(1, '2025-01-01T10:00:00', '2025-01-01 12:00'), "
+                "(2, '2025-01-02', NULL), "
+                "(3, '2025-01-03 08:00:00', '2025-01-03 09:00:00'), "
+                "(4, 'wczoraj', NULL)"
+            )
+
+        stats = normalize_session_dates(batch_size=2)
+
+        with database.engine.connect() as conn:
+            raw = conn.exec_driver_sql(
+                "SELECT TerminStart, TerminStop FROM sesje ORDER BY IdSesji"
+            ).all()
+        assert stats == {"sprawdzone": 4, "poprawione": 2, "bledne": [4]}
+        assert raw[:3] == [
+            ("2025-01-01 10:00:00", "2025-01-01 12:00:00"),
+            ("2025-01-02 00:00:00", None),
+            ("2025-01-03 08:00:00", "2025-01-03 09:00:00"),
+        ]
+
+
+class TestRequestSession:
+    """Jedna sesja (jednostka pracy) na żądanie HTTP."""
+
+    @pytest.fixture(name="checkouts")
+    def fixture_checkouts(self):
+        """Licznik pobrań połączenia z puli silnika testowego."""
+        licznik = []
+        listener = lambda *_: licznik.append(1)  # pylint: disable=unnecessary-lambda-assignment
+        event.listen(database.engine, "checkout", listener)
+        yield licznik
+        event.remove(database.engine, "checkout", listener)
+
+    def test_edit_form_uses_single_connection(self, client, checkouts):
+        artysta = create_record(Artysci, Nazwa="Jeden")
+        inzynier = create_record(Inzynierowie, Imie="I", Nazwisko="N")
+        sesja = create_session_with_equipment(SessionData(
+            artysta.IdArtysty, inzynier.IdInzyniera, datetime(2025, 1, 1, 10), None, []
+        ))
+        checkouts.clear()
+
+        resp = client.get(f"/sesje/edytuj/{sesja.IdSesji}")
+
+        assert resp.status_code == 200
+        assert len(checkouts) == 1
+
+    def test_update_in_request_skips_merge_select(self, client, assert_max_queries):
+        artysta = create_record(Artysci, Nazwa="Stara")
+
+        with assert_max_queries(4) as stats:
+            resp = client.post(f"/artysci/edytuj/{artysta.IdArtysty}", data={"nazwa": "Nowa"})
+
+        assert resp.status_code == 302
+        # INSERT podbija wersję tabeli artysci (ETag list), COMMIT mierzy timed_commit
+        assert [s.split()[0] for s, _ in stats.wykonania.items()] == [
+            "SELECT", "UPDATE", "INSERT", "COMMIT"]
+        assert get_by_id(Artysci, artysta.IdArtysty).Nazwa == "Nowa"
+
+    def test_failed_request_rolls_back(self, client, monkeypatch):
+        def przerwij(*_args, **_kwargs):
+            raise RuntimeError("błąd po zapisie")
+
+        monkeypatch.setattr("app.views.artysci.redirect", przerwij)
+
+        with pytest.raises(RuntimeError):
+            client.post("/artysci/dodaj", data={"nazwa": "Niezapisany"})
+
+        assert get_all_sorted(Artysci) == []
+
+    def test_outside_request_commits_per_call(self):
+        create_record(Artysci, Nazwa="Poza żądaniem")
+
+        with database.engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT Nazwa FROM artysci").scalar() == "Poza żądaniem"
+
+
+class TestEquipmentLinks:
+    """Edycja sprzętu sesji jako różnica zbiorów powiązań."""
+
+    @pytest.fixture(name="sesja_ze_sprzetem")
+    def fixture_sesja_ze_sprzetem(self):
+        """Sesja z dwoma z trzech mikrofonów."""
+        artysta = create_record(Artysci, Nazwa="Linki").IdArtysty
+        inzynier = create_record(Inzynierowie, Imie="L", Nazwisko="S").IdInzyniera
+        sprzet = [create_record(Sprzet, Producent="P", Model=f"M{i}").IdSprzetu
+                  for i in range(3)]
+        dane = SessionData(artysta, inzynier, datetime(2025, 5, 1, 10),
+                           datetime(2025, 5, 1, 12), sprzet[:2])
+        return create_session_with_equipment(dane).IdSesji, dane, sprzet
+
+    @staticmethod
+    def _link_writes(stats):
+        return [s.split()[0] for s in stats.wykonania
+                if "sprzety_sesje" in s and not s.startswith("SELECT")]
+
+    def test_time_change_leaves_links_untouched(self, sesja_ze_sprzetem):
+        idsesji, dane, sprzet = sesja_ze_sprzetem
+        dane.terminstop = datetime(2025, 5, 1, 13)
+
+        with capture_queries() as stats:
+            update_session_with_equipment(idsesji, dane)
+
+        assert self._link_writes(stats) == []
+        assert sorted(get_selected_sprzet_ids(idsesji)) == sprzet[:2]
+
+    def test_changed_set_uses_one_delete_and_one_insert(self, sesja_ze_sprzetem):
+        idsesji, dane, sprzet = sesja_ze_sprzetem
+        dane.sprzet_ids = [str(sprzet[1]), str(sprzet[2])]
+
+        with capture_queries() as stats:
+            update_session_with_equipment(idsesji, dane)
+
+        assert self._link_writes(stats) == ["DELETE", "INSERT"]
+        assert sorted(get_selected_sprzet_ids(idsesji)) == sprzet[1:]
+
+    def test_edit_form_without_equipment_change(self, client, sesja_ze_sprzetem):
+        idsesji, dane, sprzet = sesja_ze_sprzetem
+
+        with capture_queries() as stats:
+            resp = client.post(f"/sesje/edytuj/{idsesji}", data={
+                "artysta": str(dane.idartysty), "inzynier": str(dane.idinzyniera),
+                "sprzet": [str(i) for i in sprzet[:2]],
+                "termin_start": "2025-05-01 11:00", "termin_stop": "2025-05-01 12:00",
+            })
+
+        assert resp.status_code == 302
+        assert self._link_writes(stats) == []
+        assert get_by_id(Sesje, idsesji).TerminStart == datetime(2025, 5, 1, 11)
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import database
+from app.instrumentation import capture_queries
+from app.serving import shutdown, warmup
+from app.services import get_lookup, lookup_cache
+
+
+def test_warmup_compiles_templates_and_loads_lookups(client):
+    app = client.application
+
+    wynik = warmup(app)
+
+    assert wynik["szablony"] >= 10
+    assert wynik["listy"] == len(lookup_cache._lookups)  # pylint: disable=protected-access
+    assert len(app.jinja_env.cache) >= wynik["szablony"]
+    with app.app_context(), capture_queries() as stats:
+        get_lookup("artysci")
+    # Lista z cache; odczytywane są tylko wersje tabel
+    assert stats.count == 1 and "FROM wersje_tabel" in next(iter(stats.wykonania))
+
+
+def test_reset_pool_after_fork_leaves_parent_connections_open(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fork.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    conn = engine.connect()
+
+    database._reset_pool_after_fork()  # pylint: disable=protected-access
+
+    assert engine.pool.checkedout() == 0
+    assert conn.execute(text("SELECT 1")).scalar() == 1
+    conn.close()
+    engine.dispose()
+
+
+def test_reset_pool_after_fork_drops_async_engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fork.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "_async_session", None)
+    monkeypatch.setattr(database, "async_engine", database.create_async_db_engine(
+        f"sqlite:///{tmp_path / 'fork.db'}", "test"))
+
+    database._reset_pool_after_fork()  # pylint: disable=protected-access
+
+    # Połączenia aiosqlite rodzica działają w wątkach, których potomek nie ma
+    assert database.async_engine is None
+    engine.dispose()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Wymaga os.fork")
+def test_register_at_fork_resets_pool_in_child(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fork.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert engine.pool.checkedin() == 1
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if engine.pool.checkedin() == 0 else 1)  # pylint: disable=protected-access
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    engine.dispose()
+
+
+def test_shutdown_disposes_engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stop.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    shutdown()
+
+    assert engine.pool.checkedin() == 0
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app import database
+from app.models import Artysci, Sesje, Sprzet, Utwory
+from app.purge import purge_deleted
+from app.search import search
+from app.services import (create_record, get_all_sorted, get_by_id,
+                          get_equipment_usage, get_session_details,
+                          get_utwory_sorted, soft_delete)
+from app.stats import rebuild_stats
+
+
+def _count(model, include_deleted=False):
+    with database.engine.connect() as conn:
+        stmt = select(model)
+        if not include_deleted:
+            stmt = stmt.where(model.Usunieto.is_(None))
+        return len(conn.execute(stmt).all())
+
+
+@pytest.fixture(name="nagrania")
+def fixture_nagrania(studio, add_session):
+    """Dwóch artystów po trzy sesje z mikrofonem i utworem na każdej sesji."""
+    ids = {"Dżem": studio["a"], "Budka": create_record(Artysci, Nazwa="Budka").IdArtysty,
+           "mikrofon": studio["s1"]}
+    for godzina, nazwa in ((10, "Dżem"), (15, "Budka")):
+        for dzien in (1, 2, 3):
+            sesja = add_session(datetime(2025, 3, dzien, godzina), 2, [ids["mikrofon"]],
+                                ids[nazwa])
+            create_record(Utwory, IdArtysty=ids[nazwa], IdSesji=sesja.IdSesji,
+                          Tytul=f"{nazwa} {dzien}")
+    rebuild_stats()
+    return ids
+
+
+class TestSoftDelete:
+    def test_artist_and_dependents_are_hidden(self, nagrania):
+        assert soft_delete(Artysci, nagrania["Dżem"])
+
+        assert get_by_id(Artysci, nagrania["Dżem"]) is None
+        assert [a.Nazwa for a in get_all_sorted(Artysci, "IdArtysty")] == ["Budka"]
+        assert {u.Tytul for u in get_utwory_sorted()} == {"Budka 1", "Budka 2", "Budka 3"}
+        assert get_session_details(1) is None
+        assert get_equipment_usage(nagrania["mikrofon"])["sesje"] == 3
+        assert search("artysci", "Dżem") == []
+        # Wiersze zostają w bazie do czasu flask purge
+        assert (_count(Sesje), _count(Sesje, include_deleted=True)) == (3, 6)
+        assert not soft_delete(Artysci, nagrania["Dżem"])
+
+    def test_stats_match_rebuild_after_soft_delete(self, nagrania, stat_snapshot):
+        soft_delete(Artysci, nagrania["Dżem"])
+        soft_delete(Sesje, 4)
+        przyrostowe = stat_snapshot()
+
+        rebuild_stats()
+
+        assert stat_snapshot() == przyrostowe
+        assert dict(przyrostowe["stat_liczniki"]) == {"sesje": 2, "utwory": 2}
+
+    def test_delete_routes(self, client, nagrania):
+        resp = client.post(f"/artysci/usun/{nagrania['Dżem']}")
+
+        assert resp.status_code == 302
+        assert client.get(f"/artysci/edytuj/{nagrania['Dżem']}").status_code == 404
+        assert client.post(f"/artysci/usun/{nagrania['Dżem']}").status_code == 404
+        assert client.post("/sprzet/usun/9999").status_code == 404
+        assert client.post(f"/sprzet/usun/{nagrania['mikrofon']}").status_code == 302
+        # Sesje bez usuniętego sprzętu nadal dają się wyświetlić
+        assert client.get("/sesje/4").status_code == 200
+
+
+class TestPurge:
+    def test_purge_removes_deleted_rows_in_chunks(self, nagrania, stat_snapshot):
+        soft_delete(Artysci, nagrania["Dżem"])
+        przed = stat_snapshot()
+
+        stats = purge_deleted(chunk_size=2)
+
+        assert stats.usuniete == {"artysci": 1, "sesje": 3, "utwory": 3, "sprzety_sesje": 3}
+        assert stats.transakcje > 4
+        assert [_count(m, include_deleted=True) for m in (Artysci, Sesje, Utwory)] == [1, 3, 3]
+        assert stat_snapshot() == przed
+
+    def test_purge_keeps_recently_deleted(self, nagrania):  # pylint: disable=W0613
+        soft_delete(Sesje, 1)
+
+        stats = purge_deleted(older_than=datetime(2000, 1, 1))
+
+        assert not stats.usuniete
+        assert _count(Sesje, include_deleted=True) == 6
+
+
+def test_migrate_columns_adds_missing_nullable_column():
+    with database.engine.begin() as conn:
+        conn.exec_driver_sql("ALTER TABLE sprzet DROP COLUMN Usunieto")
+
+    assert database.migrate_columns() == ["sprzet.Usunieto"]
+    assert not database.migrate_columns()
+    assert create_record(Sprzet, Producent="AKG", Model="K240").Usunieto is None
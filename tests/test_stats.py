@@ -0,0 +1,114 @@
+from datetime import datetime
+
+import pytest
+from click.testing import CliRunner
+
+from app import create_app, database
+from app.models import Utwory
+from app.services import (SessionData, create_record,
+                          create_session_with_equipment,
+                          update_session_with_equipment)
+from app.stats import STAT_TABLES, rebuild_stats
+
+
+def _sesja(studio, dzien, godziny, sprzet):
+    return SessionData(studio["a"], studio["e"], datetime(2025, 6, dzien, 10),
+                       datetime(2025, 6, dzien, 10 + godziny), list(sprzet))
+
+
+class TestIncrementalStats:
+    def test_create_and_update_move_buckets(self, studio, stat_snapshot):
+        dane = _sesja(studio, 2, 2, [studio["s1"], studio["s2"]])
+        idsesji = create_session_with_equipment(dane).IdSesji
+
+        assert stat_snapshot() == {
+            "stat_inzynierowie_dzien": [("2025-06-02", studio["e"], 1, 120)],
+            "stat_sprzet_dzien": [("2025-06-02", studio["s1"], 1, 120),
+                                  ("2025-06-02", studio["s2"], 1, 120)],
+            "stat_artysci": [(studio["a"], 1, 0)],
+            "stat_liczniki": [("sesje", 1)],
+        }
+
+        update_session_with_equipment(idsesji, _sesja(studio, 3, 3, [studio["s2"]]))
+
+        assert stat_snapshot()["stat_inzynierowie_dzien"] == [("2025-06-03", studio["e"], 1, 180)]
+        assert stat_snapshot()["stat_sprzet_dzien"] == [("2025-06-03", studio["s2"], 1, 180)]
+
+    def test_songs_and_deletes_are_counted(self, studio, stat_snapshot):
+        idsesji = create_session_with_equipment(_sesja(studio, 2, 1, [studio["s1"]])).IdSesji
+        create_record(Utwory, IdArtysty=studio["a"], IdSesji=idsesji, Tytul="Raz")
+        create_record(Utwory, IdArtysty=studio["a"], IdSesji=idsesji, Tytul="Dwa")
+        assert stat_snapshot()["stat_artysci"] == [(studio["a"], 1, 2)]
+
+        with database.engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM utwory WHERE IdSesji = ?", (idsesji,))
+            conn.exec_driver_sql("DELETE FROM sesje WHERE IdSesji = ?", (idsesji,))
+        assert stat_snapshot() == {table: [] for table in STAT_TABLES}
+
+        # Powiązania usuwane po sesji (jak kaskada klucza obcego) nie odejmują drugi raz
+        with database.engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM sprzety_sesje WHERE IdSesji = ?", (idsesji,))
+        assert stat_snapshot() == {table: [] for table in STAT_TABLES}
+
+    def test_rebuild_matches_incremental_totals(self, studio, stat_snapshot):
+        for dzien in (2, 3, 9):
+            create_session_with_equipment(_sesja(studio, dzien, 2, [studio["s1"]]))
+        create_session_with_equipment(SessionData(
+            studio["a"], studio["e"], datetime(2025, 6, 2, 14), datetime(2025, 6, 2, 15, 30),
+            [studio["s2"]],
+        ))
+        przyrostowe = stat_snapshot()
+
+        result = CliRunner().invoke(create_app().cli, ["rebuild-stats"])
+
+        assert "Statystyki stat_sprzet_dzien: 4 wierszy" in result.stdout
+        assert stat_snapshot() == przyrostowe
+        assert przyrostowe["stat_inzynierowie_dzien"][0] == ("2025-06-02", studio["e"], 2, 210)
+
+    def test_rebuild_creates_missing_tables(self, studio, stat_snapshot):
+        create_session_with_equipment(_sesja(studio, 2, 1, []))
+        with database.engine.begin() as conn:
+            for table in STAT_TABLES:
+                conn.exec_driver_sql(f"DROP TABLE {table}")
+
+        assert rebuild_stats()["stat_inzynierowie_dzien"] == 1
+        create_session_with_equipment(_sesja(studio, 3, 1, []))
+        assert len(stat_snapshot()["stat_inzynierowie_dzien"]) == 2
+
+
+class TestStatsEndpoints:
+    @pytest.fixture(name="historia")
+    def fixture_historia(self, studio):
+        """Trzy sesje w dwóch tygodniach czerwca 2025 i jeden utwór."""
+        for dzien, sprzet in ((2, ["s1", "s2"]), (4, ["s1"]), (10, ["s1"])):
+            sesja = create_session_with_equipment(
+                _sesja(studio, dzien, 2, [studio[s] for s in sprzet]))
+        create_record(Utwory, IdArtysty=studio["a"], IdSesji=sesja.IdSesji, Tytul="Hit")
+        return studio
+
+    def test_json_endpoints(self, client, historia, assert_max_queries):
+        zakres = "od=2025-06-01&do=2025-07-01"
+
+        with assert_max_queries(1):
+            inzynierowie = client.get(f"/statystyki/inzynierowie.json?{zakres}").get_json()
+        sprzet = client.get(f"/statystyki/sprzet.json?{zakres}").get_json()
+        artysci = client.get("/statystyki/artysci.json").get_json()
+
+        assert [(w["tydzien"], w["sesje"], w["godziny"]) for w in inzynierowie] == [
+            ("2025-06-02", 2, 4.0), ("2025-06-09", 1, 2.0)]
+        assert [(w["IdSprzetu"], w["uzycia"]) for w in sprzet] == [
+            (historia["s1"], 3), (historia["s2"], 1)]
+        assert (artysci["sesje"], artysci["utwory"], artysci["utwory_na_sesje"]) == (3, 1, 0.33)
+
+    def test_dashboard_renders_range(self, client, historia):  # pylint: disable=W0613
+        resp = client.get("/statystyki/?od=2025-06-09&do=2025-06-16")
+
+        html = resp.get_data(as_text=True)
+        assert resp.status_code == 200
+        assert "2025-06-09" in html and "2025-06-02" not in html
+        assert "Neumann U87" in html
+
+    def test_invalid_date(self, client):
+        assert client.get("/statystyki/sprzet.json?od=czerwiec").status_code == 400
+        resp = client.get("/statystyki/?do=czerwiec")
+        assert "Nieprawidłowy format daty" in resp.get_data(as_text=True)
@@ -67,15 +67,17 @@ class TestServices:
 
     @patch('app.services.get_db_session')
     def test_update_record(self, mock_get_db_session, mock_session):
-        instance = Artysci(Nazwa='Old')
+        instance = Artysci(Nazwa='Old', Wersja=3)
 
         ctx_mock = MagicMock()
         ctx_mock.__enter__.return_value = mock_session
         mock_get_db_session.return_value = ctx_mock
+        mock_session.merge.return_value = instance
 
         update_record(instance, Nazwa='Updated')
         mock_session.merge.assert_called_once_with(instance)
         assert instance.Nazwa == 'Updated'
+        assert instance.Wersja == 4
 
 class TestModels:
     def test_artysci_tablename(self):
@@ -0,0 +1,104 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app import database
+from app.instrumentation import capture_queries
+from app.models import Artysci, Inzynierowie, Sesje
+from app.services import (EditConflictError, SessionData, create_record,
+                          get_by_id, get_selected_sprzet_ids, update_record,
+                          update_session_with_equipment)
+
+
+def _wersja(model, id_value):
+    with database.engine.connect() as conn:
+        pk = list(model.__table__.primary_key.columns)[0]
+        return conn.execute(select(model.Wersja).where(pk == id_value)).scalar_one()
+
+
+@pytest.fixture(name="sesja")
+def fixture_sesja(studio, add_session):
+    """Sesja z jednym mikrofonem; w bazie są dwa."""
+    return add_session(datetime(2025, 3, 1, 10), 2, [studio["s1"]]).IdSesji
+
+
+def _form(idsesji, wersja, sprzet=("1",), godzina=10):
+    sesja = get_by_id(Sesje, idsesji)
+    return {"wersja": wersja, "artysta": sesja.IdArtysty, "inzynier": sesja.IdInzyniera,
+            "termin_start": f"2025-03-01 {godzina}:00", "termin_stop": "2025-03-01 18:00",
+            "sprzet": list(sprzet)}
+
+
+class TestVersionedUpdates:
+    def test_stale_version_is_rejected_by_one_update(self, client):
+        artysta = create_record(Artysci, Nazwa="Stara")
+        assert artysta.Wersja == 1
+        update_record(get_by_id(Artysci, artysta.IdArtysty), wersja=1, Nazwa="Pierwsza")
+
+        with client.application.test_request_context():
+            nieaktualny = get_by_id(Artysci, artysta.IdArtysty)
+            with capture_queries() as stats, pytest.raises(EditConflictError):
+                update_record(nieaktualny, wersja=1, Nazwa="Druga")
+
+        assert list(stats.wykonania) == [
+            'UPDATE artysci SET "Nazwa"=?, "Wersja"=? WHERE artysci."IdArtysty" = ? '
+            'AND artysci."Wersja" = ?']
+        assert get_by_id(Artysci, artysta.IdArtysty).Nazwa == "Pierwsza"
+        assert _wersja(Artysci, artysta.IdArtysty) == 2
+
+    def test_equipment_only_change_bumps_session_version(self, sesja):
+        dane = SessionData(1, 1, datetime(2025, 3, 1, 10), datetime(2025, 3, 1, 12), [1, 2])
+
+        update_session_with_equipment(sesja, dane, wersja=1)
+
+        assert _wersja(Sesje, sesja) == 2
+        with pytest.raises(EditConflictError):
+            update_session_with_equipment(sesja, SessionData(
+                1, 1, dane.terminstart, dane.terminstop, [2]), wersja=1)
+        assert get_selected_sprzet_ids(sesja) == [1, 2]
+
+    def test_migrate_columns_adds_version_with_default(self):
+        create_record(Inzynierowie, Imie="Jan", Nazwisko="Stary")
+        with database.engine.begin() as conn:
+            conn.exec_driver_sql("ALTER TABLE inzynierowie DROP COLUMN Wersja")
+
+        assert database.migrate_columns() == ["inzynierowie.Wersja"]
+        assert _wersja(Inzynierowie, 1) == 1
+
+
+class TestEditConflictViews:
+    def test_second_artist_editor_gets_conflict(self, client):
+        create_record(Artysci, Nazwa="Stara")
+        assert 'name="wersja" value="1"' in client.get("/artysci/edytuj/1").get_data(as_text=True)
+
+        pierwszy = client.post("/artysci/edytuj/1", data={"wersja": 1, "nazwa": "Pierwsza"})
+        drugi = client.post("/artysci/edytuj/1", data={"wersja": 1, "nazwa": "Druga"})
+
+        assert pierwszy.status_code == 302
+        assert drugi.status_code == 409
+        html = drugi.get_data(as_text=True)
+        assert "zmieniony przez kogoś innego" in html
+        assert 'value="Pierwsza"' in html and 'name="wersja" value="2"' in html
+        assert client.post("/artysci/edytuj/1", data={"wersja": 2, "nazwa": "Druga"}
+                           ).status_code == 302
+
+    def test_second_engineer_editor_gets_conflict(self, client):
+        create_record(Inzynierowie, Imie="Jan", Nazwisko="Stary")
+
+        client.post("/inzynierowie/edytuj/1", data={"wersja": 1, "imie": "Jan", "nazwisko": "A"})
+        drugi = client.post("/inzynierowie/edytuj/1",
+                            data={"wersja": 1, "imie": "Jan", "nazwisko": "B"})
+
+        assert drugi.status_code == 409
+        assert get_by_id(Inzynierowie, 1).Nazwisko == "A"
+
+    def test_second_session_editor_gets_conflict(self, client, sesja):
+        pierwszy = client.post(f"/sesje/edytuj/{sesja}", data=_form(sesja, 1, ("1", "2")))
+        drugi = client.post(f"/sesje/edytuj/{sesja}", data=_form(sesja, 1, ("2",), godzina=11))
+
+        assert pierwszy.status_code == 302
+        assert drugi.status_code == 409
+        assert 'name="wersja" value="2"' in drugi.get_data(as_text=True)
+        assert get_selected_sprzet_ids(sesja) == [1, 2]
+        assert get_by_id(Sesje, sesja).TerminStart == datetime(2025, 3, 1, 10)